@@ -0,0 +1,206 @@
+"""Tick latency, call rate, CPU and peak RSS of the demo agents against the in-process stub host.
+
+    python benchmarks/bench_agents.py --symbols 100 --ticks 20 --latency 0.002 --out agents.json
+    python benchmarks/bench_agents.py --symbols 100 --ticks 20 --compare agents.json
+
+Each agent runs in a fresh process, so its peak RSS and the process-wide
+caches are its own. The stub host shares the agent's event loop, and the CPU
+time includes the stub. The universe agents (signal, trend) tick over all
+``--symbols``. The single-symbol agents run ``--symbols`` instances side by
+side in one ``AgentRuntime``. Every tick starts cold by default: the OHLCV
+cache and the indicator streams are cleared, so each tick refetches and
+recomputes its whole window. ``--warm`` keeps them, which measures the
+incremental steady state. ``--compare`` exits non-zero when p99 tick
+latency, calls/s or peak RSS is worse than the saved run by more than
+``--tolerance``.
+"""
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+
+REPO = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path[:0] = sorted(glob.glob(os.path.join(REPO, "services", "agents", "*", "src")))
+
+AGENTS = {
+    "signal": "signal_agent.main:SignalAgent",
+    "trend": "trend_agent.main:TrendAgent",
+    "strategy-builder": "strategy_builder.main:build_agent",
+    "execution": "execution_agent.main:build_agent",
+    "risk": "risk_agent.main:build_agent",
+}
+
+
+def _build(name: str, symbols: List[str]) -> List[Any]:
+    from swarm_agent_sdk import get_host_base
+    from swarm_agent_sdk.client import HttpMCPClient
+    from swarm_agent_sdk.runtime import resolve_factory
+    from swarm_agent_sdk.universe import UniverseConfig
+
+    factory = resolve_factory(AGENTS[name])
+    if name in ("signal", "trend"):
+        cfg = UniverseConfig(name=f"{name}-agent", heartbeat_seconds=5, symbols=symbols)
+        return [factory(cfg, HttpMCPClient(get_host_base(), "noop"))]
+    return [factory() for _ in symbols]
+
+
+def _peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+async def _run_case(name: str, opts: Dict[str, Any]) -> Dict[str, Any]:
+    from swarm_agent_sdk.cache import get_ohlcv_cache
+    from swarm_agent_sdk.metrics import CALL_ERRORS, CALL_SECONDS
+    from swarm_agent_sdk.runtime import AgentRuntime
+    from swarm_agent_sdk.transport import close_transports
+    from stub_host import StubHost, fake_tools
+
+    symbols = [f"S{i:04d}" for i in range(opts["symbols"])]
+    host = StubHost(fake_tools(opts["bars_per_step"], opts["pad_bytes"]), latency=opts["latency"], latencies=opts["latencies"])
+    await host.start()
+    os.environ["HOST_URL"] = host.base_url
+    agents = _build(name, symbols)
+    AgentRuntime(agents)  # teardown leaves the shared connections to us
+    cache = get_ohlcv_cache(host.base_url)
+    durations: List[float] = []
+    tick_errors = 0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for agent in agents:
+            await agent.setup()
+        warm = 0
+        calls0, requests0, cpu0 = sum(CALL_SECONDS.series().values()), host.requests, time.process_time()
+        t_start = time.perf_counter()
+        for i in range(opts["warmup"] + opts["ticks"]):
+            if i == opts["warmup"]:
+                warm = i
+                calls0, requests0, cpu0, t_start = sum(CALL_SECONDS.series().values()), host.requests, time.process_time(), time.perf_counter()
+            if not opts["warm"]:
+                cache.clear()
+                for agent in agents:
+                    agent.streams.clear()
+            t0 = time.perf_counter()
+            results = await asyncio.gather(*(a.tick() for a in agents), return_exceptions=True)
+            durations.append(time.perf_counter() - t0)
+            tick_errors += sum(isinstance(r, BaseException) for r in results)
+        wall = time.perf_counter() - t_start
+        cpu = time.process_time() - cpu0
+        calls = sum(CALL_SECONDS.series().values()) - calls0
+        requests = host.requests - requests0
+        for agent in agents:
+            await agent.teardown()
+    await close_transports()
+    await host.stop()
+    measured = np.array(durations[warm:]) * 1000
+    by_tool: Dict[str, int] = {}
+    for (_, tool, _), n in CALL_SECONDS.series().items():
+        by_tool[tool] = by_tool.get(tool, 0) + n
+    return {
+        "agent": name,
+        "instances": len(agents),
+        "symbols": len(symbols),
+        "ticks": opts["ticks"],
+        "first_tick_ms": round(durations[0] * 1000, 3),
+        "tick_p50_ms": round(float(np.percentile(measured, 50)), 3),
+        "tick_p99_ms": round(float(np.percentile(measured, 99)), 3),
+        "tick_mean_ms": round(float(measured.mean()), 3),
+        "calls": calls,
+        "calls_per_sec": round(calls / wall, 1) if wall else 0.0,
+        "requests": requests,
+        "requests_per_sec": round(requests / wall, 1) if wall else 0.0,
+        "cpu_seconds": round(cpu, 4),
+        "cpu_util": round(cpu / wall, 3) if wall else 0.0,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "tick_errors": tick_errors,
+        "call_errors": int(sum(CALL_ERRORS.series().values())),
+        "calls_by_tool": by_tool,
+    }
+
+
+def run_case(name: str, opts: Dict[str, Any]) -> Dict[str, Any]:
+    return asyncio.run(_run_case(name, opts))
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO, stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    regressions = []
+    for name, r in results.items():
+        b = baseline.get(name)
+        if b is None:
+            continue
+        for key, worse in (("tick_p99_ms", 1), ("peak_rss_mb", 1), ("calls_per_sec", -1)):
+            old, new = b.get(key), r.get(key)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change * worse > tolerance:
+                regressions.append(f"{name}: {key} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--agents", nargs="+", default=list(AGENTS), choices=list(AGENTS))
+    ap.add_argument("--symbols", type=int, default=50)
+    ap.add_argument("--ticks", type=int, default=20)
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--warm", action="store_true", help="keep caches and streams between ticks")
+    ap.add_argument("--latency", type=float, default=0.002, help="stub latency per call, seconds")
+    ap.add_argument("--service-latency", action="append", default=[], metavar="SERVICE=SECONDS")
+    ap.add_argument("--bars-per-step", type=int, default=1, help="bars per OHLCV interval (response size)")
+    ap.add_argument("--pad-bytes", type=int, default=0, help="filler bytes in write/publish acks")
+    ap.add_argument("--out", help="write results as JSON")
+    ap.add_argument("--compare", help="JSON from a previous run to check for regressions")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    args = ap.parse_args()
+    opts = {
+        "symbols": args.symbols, "ticks": args.ticks, "warmup": args.warmup, "warm": args.warm, "latency": args.latency,
+        "latencies": {k: float(v) for k, v in (s.split("=", 1) for s in args.service_latency)},
+        "bars_per_step": args.bars_per_step, "pad_bytes": args.pad_bytes,
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'agent':>17} {'inst':>5} {'p50 ms':>9} {'p99 ms':>9} {'calls/s':>9} {'req/s':>9} {'cpu':>6} {'rss MB':>7} {'errors':>6}")
+    for name in args.agents:
+        with ProcessPoolExecutor(1, mp_context=ctx) as pool:
+            r = pool.submit(run_case, name, opts).result()
+        results[name] = r
+        print(f"{name:>17} {r['instances']:>5} {r['tick_p50_ms']:>9.2f} {r['tick_p99_ms']:>9.2f} {r['calls_per_sec']:>9.0f} "
+              f"{r['requests_per_sec']:>9.0f} {r['cpu_util']:>6.2f} {r['peak_rss_mb']:>7.1f} {r['tick_errors'] + r['call_errors']:>6}")
+    report = {
+        "meta": {"git": _git_rev(), "python": platform.python_version(), "platform": platform.platform(),
+                 "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "options": opts},
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
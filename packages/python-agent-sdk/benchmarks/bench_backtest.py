@@ -0,0 +1,75 @@
+"""Threshold sweep throughput, with a parity check against backtester.run.
+
+    python benchmarks/bench_backtest.py --symbols 100 --bars 500 --candidates 1000
+    python benchmarks/bench_backtest.py --host http://localhost:8080   # also compare with the live service
+
+Parity is checked against ``run_threshold`` (a line-for-line port of the
+service loop) and, with ``--host``, against the service itself. Both must be
+bit-identical.
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from swarm_agent_sdk.backtest import run_threshold, sweep, sweep_symbols
+from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.transport import close_transports
+
+
+def _rows(prices: np.ndarray):
+    return [{"ts": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}Z", "price": p} for i, p in enumerate(prices.tolist())]
+
+
+async def _service_pnl(host: str, prices: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    client = HttpMCPClient(host, "backtester")
+    rows = _rows(prices)
+    res = await client.call_many([("backtester.run", {"prices": rows, "threshold": t}) for t in thresholds.tolist()], batch=False)
+    await close_transports()
+    return np.array([r.unwrap()["pnl"] for r in res])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", type=int, default=100)
+    ap.add_argument("--bars", type=int, default=500)
+    ap.add_argument("--candidates", type=int, default=1000)
+    ap.add_argument("--processes", type=int, default=4)
+    ap.add_argument("--host", default=None, help="MCP host base for a live parity check")
+    args = ap.parse_args()
+    rng = np.random.default_rng(0)
+    closes = np.round(100 + np.cumsum(rng.normal(0, 1, (args.symbols, args.bars)), axis=1), 2)
+    thresholds = np.linspace(-0.5, 3.0, args.candidates)
+
+    check = thresholds[:: max(1, args.candidates // 25)]
+    for row in closes[:3]:
+        ref = np.array([run_threshold(_rows(row), t)["pnl"] for t in check.tolist()])
+        assert np.array_equal(sweep(row, check), ref), "sweep differs from the service loop"
+        if args.host:
+            live = asyncio.run(_service_pnl(args.host, row, check))
+            assert np.array_equal(sweep(row, check), live), "sweep differs from backtester.run"
+    print(f"parity ok ({'service + ' if args.host else ''}reference loop)")
+
+    t0 = time.perf_counter()
+    for row in closes[:5]:
+        for t in thresholds[:50].tolist():
+            run_threshold(_rows(row), t)
+    loop_rate = 5 * 50 / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    sweep(closes, thresholds)
+    vec = time.perf_counter() - t0
+    series = {f"S{i}": row for i, row in enumerate(closes)}
+    t0 = time.perf_counter()
+    sweep_symbols(series, thresholds, processes=args.processes)
+    pooled = time.perf_counter() - t0
+    total = args.symbols * args.candidates
+    print(f"{args.symbols} symbols x {args.candidates} candidates x {args.bars} bars")
+    print(f"   scalar loop: {loop_rate:12.0f} runs/s")
+    print(f"    vectorized: {total / vec:12.0f} runs/s  ({vec * 1000:.1f} ms)")
+    print(f"  {args.processes} processes: {total / pooled:12.0f} runs/s  ({pooled * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
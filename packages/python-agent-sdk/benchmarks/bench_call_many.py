@@ -0,0 +1,41 @@
+"""Tick latency for N independent calls: sequential vs call_many (batched and concurrent).
+
+    python benchmarks/bench_call_many.py --calls 16 --latency 0.02
+"""
+import argparse
+import asyncio
+import time
+
+from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.transport import close_transports
+
+from stub_host import StubHost
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=16)
+    ap.add_argument("--latency", type=float, default=0.02)
+    args = ap.parse_args()
+    calls = [("bench.echo", {"i": i}) for i in range(args.calls)]
+    async with StubHost(latency=args.latency) as host:
+        client = HttpMCPClient(host.base_url, "bench")
+        t0 = time.perf_counter()
+        for tool, payload in calls:
+            await client.call(tool, payload)
+        seq = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        res = await client.call_many(calls, concurrency=None, batch=False)
+        conc = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        res_b = await client.call_many(calls, concurrency=None)
+        batched = time.perf_counter() - t0
+        assert all(r.ok for r in res + res_b)
+        await close_transports()
+    print(f"sequential: {seq * 1000:8.1f} ms")
+    print(f"concurrent: {conc * 1000:8.1f} ms")
+    print(f"   batched: {batched * 1000:8.1f} ms  (single call ~{args.latency * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""Messages/sec and bytes allocated per message: per-model model_dump + json vs codec.encode_many.
+
+    python benchmarks/bench_codec.py --messages 100000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from swarm_agent_sdk.codec import SignalScoreRecord, encode_many
+from swarm_agent_sdk.schemas import SignalScore
+
+
+def measure(name: str, fn, n: int) -> None:
+    t0 = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t0
+    # separate run: tracemalloc slows allocation-heavy code considerably
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>30}: {n / dt:12.0f} msg/s  {peak / n:8.0f} B/msg peak")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=100_000)
+    args = ap.parse_args()
+    n = args.messages
+    dicts = [
+        {"symbol": f"S{i % 500}", "ts": "2024-01-15T00:00:00.000Z", "strategy": "rsi_sma_combo", "score": (i % 200) / 100 - 1,
+         "features": {"rsi5": 50.0 + i % 50, "sma5": 100.0, "sma10": 99.5}}
+        for i in range(n)
+    ]
+    records = [SignalScoreRecord(**d) for d in dicts]
+    baseline = json.dumps([SignalScore(**d).model_dump() for d in dicts]).encode()
+    assert json.loads(encode_many(SignalScore, dicts)) == json.loads(baseline)
+    assert json.loads(encode_many(SignalScore, records)) == json.loads(baseline)
+
+    measure("model + model_dump + json", lambda: json.dumps([SignalScore(**d).model_dump() for d in dicts]).encode(), n)
+    measure("encode_many(dicts)", lambda: encode_many(SignalScore, dicts), n)
+    measure("encode_many(records)", lambda: encode_many(SignalScore, records), n)
+    measure("encode_many(validate=False)", lambda: encode_many(SignalScore, dicts, validate=False), n)
+
+
+if __name__ == "__main__":
+    main()
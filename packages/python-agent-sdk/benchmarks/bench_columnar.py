@@ -0,0 +1,54 @@
+"""Decode time and peak memory: JSON rows vs the columnar encoding.
+
+    python benchmarks/bench_columnar.py --rows 1000000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+
+from swarm_agent_sdk.columnar import ColumnBatch, decode_columnar, encode_columnar
+
+
+def measure(name: str, fn) -> None:
+    t0 = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t0
+    # separate run: tracemalloc slows allocation-heavy code considerably
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>28}: {dt * 1000:9.1f} ms  peak {peak / 2**20:8.1f} MiB")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args()
+    n = args.rows
+    rng = np.random.default_rng(0)
+    ts = np.int64(1704067200000) + np.arange(n, dtype=np.int64) * 60_000
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    batch = ColumnBatch(n, {"ts": ts, "open": close, "high": close + 0.5, "low": close - 0.5, "close": close, "volume": rng.integers(1000, 6000, n).astype(np.float64)})
+    json_body = json.dumps({"rows": batch.to_rows()}).encode()
+    col_body = encode_columnar(batch)
+    print(f"{n} OHLCV rows: json {len(json_body) / 2**20:.1f} MiB, columnar {len(col_body) / 2**20:.1f} MiB")
+
+    def json_decode() -> None:
+        rows = json.loads(json_body)["rows"]
+        closes = [r["close"] for r in rows]
+        assert len(closes) == n
+
+    def columnar_decode() -> None:
+        closes = decode_columnar(col_body)["close"]
+        assert len(closes) == n
+
+    measure("json -> close list", json_decode)
+    measure("columnar -> close array", columnar_decode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Per-call overhead and throughput of the sync tool execution modes (inline, thread, process).
+
+    python benchmarks/bench_executors.py --calls 2000 --cpu-calls 16 --workers 4
+"""
+import argparse
+import asyncio
+import time
+
+from swarm_agent_sdk.client import MCPClient, gather_calls
+from swarm_agent_sdk.executors import configure_tool_pool, shutdown_tool_pools
+
+
+def trivial(payload):
+    return payload
+
+
+def cpu_bound(payload):
+    return sum(i * i for i in range(payload["n"]))
+
+
+def blocking_io(payload):
+    time.sleep(payload["sleep"])
+    return payload
+
+
+async def timed(client: MCPClient, tool: str, payload, calls: int, concurrency: int) -> float:
+    t0 = time.perf_counter()
+    res = await gather_calls([(client, tool, payload)] * calls, concurrency=concurrency)
+    assert all(r.ok for r in res), [r.error for r in res if not r.ok][:1]
+    return time.perf_counter() - t0
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=2000)
+    ap.add_argument("--cpu-calls", type=int, default=16)
+    ap.add_argument("--cpu-n", type=int, default=300_000)
+    ap.add_argument("--io-calls", type=int, default=200)
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+    configure_tool_pool("io", "thread", max_workers=args.workers * 4)
+    configure_tool_pool("cpu", "process", max_workers=args.workers)
+    client = MCPClient()
+    for mode in ("inline", "thread", "process"):
+        client.register_tool(f"trivial.{mode}", trivial, mode=mode)
+        client.register_tool(f"cpu.{mode}", cpu_bound, mode=mode)
+    client.register_tool("io.inline", blocking_io, mode="inline")
+    client.register_tool("io.thread", blocking_io, mode="thread")
+    await client.call("trivial.process", {})  # start the worker processes before timing
+
+    print("trivial tool, per-call overhead:")
+    for mode in ("inline", "thread", "process"):
+        dt = await timed(client, f"trivial.{mode}", {"x": 1}, args.calls, 64)
+        print(f"  {mode:>8}: {dt / args.calls * 1e6:9.1f} us/call  {args.calls / dt:10.0f} calls/s")
+    print(f"cpu-bound tool (sum of squares to {args.cpu_n}), {args.cpu_calls} calls:")
+    for mode in ("inline", "thread", "process"):
+        dt = await timed(client, f"cpu.{mode}", {"n": args.cpu_n}, args.cpu_calls, args.cpu_calls)
+        print(f"  {mode:>8}: {dt * 1000:9.1f} ms  {args.cpu_calls / dt:10.1f} calls/s")
+    print(f"blocking 5 ms tool, {args.io_calls} calls:")
+    for mode in ("inline", "thread"):
+        dt = await timed(client, f"io.{mode}", {"sleep": 0.005}, args.io_calls, args.io_calls)
+        print(f"  {mode:>8}: {dt * 1000:9.1f} ms  {args.io_calls / dt:10.1f} calls/s")
+    shutdown_tool_pools()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
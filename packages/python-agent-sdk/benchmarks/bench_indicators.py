@@ -0,0 +1,38 @@
+"""Indicator throughput over a symbols x time close matrix.
+
+    python benchmarks/bench_indicators.py --symbols 1000 10000 --bars 250
+"""
+import argparse
+import time
+
+import numpy as np
+
+from swarm_agent_sdk import indicators as ind
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--bars", type=int, default=250)
+    args = ap.parse_args()
+    rng = np.random.default_rng(0)
+    cases = {
+        "rsi(5)": lambda x: ind.rsi(x, 5),
+        "rsi_wilder(14)": lambda x: ind.rsi_wilder(x, 14),
+        "sma(10)": lambda x: ind.sma(x, 10),
+        "macd": ind.macd,
+        "momentum(3)": lambda x: ind.momentum(x, 3),
+        "regime(5)": lambda x: ind.regime(x, 5),
+    }
+    for n in args.symbols:
+        closes = 100 + np.cumsum(rng.normal(0, 1, (n, args.bars)), axis=1)
+        print(f"{n} symbols x {args.bars} bars")
+        for name, fn in cases.items():
+            t0 = time.perf_counter()
+            fn(closes)
+            dt = time.perf_counter() - t0
+            print(f"  {name:>15}: {dt * 1000:8.1f} ms  {n / dt:12.0f} symbols/s")
+
+
+if __name__ == "__main__":
+    main()
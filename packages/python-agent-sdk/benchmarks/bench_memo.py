@@ -0,0 +1,60 @@
+"""Fleet of agents ticking in sync: plain config.get calls vs one shared MemoClient.
+
+    python benchmarks/bench_memo.py --agents 200 --ticks 10 --latency 0.02 --ttl 0.05
+
+Every tick, each agent calls ``config.get("strategy.candidates")`` at the
+same moment. The tick period is ``--period`` seconds, so with ``--ttl``
+below it the memoized run exercises misses, stale hits and refreshes.
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.memo import MemoClient, MemoPolicy
+from swarm_agent_sdk.transport import close_transports
+
+from stub_host import StubHost, fake_tools
+
+
+async def fleet(client, agents: int, ticks: int, period: float):
+    latencies = []
+
+    async def one() -> None:
+        t0 = time.perf_counter()
+        await client.call("config.get", {"key": "strategy.candidates"})
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(agents)))
+        await asyncio.sleep(max(0.0, period - (time.perf_counter() - started)))
+    return time.perf_counter() - t0, np.array(latencies) * 1000
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--agents", type=int, default=200)
+    ap.add_argument("--ticks", type=int, default=10)
+    ap.add_argument("--period", type=float, default=0.1)
+    ap.add_argument("--latency", type=float, default=0.02)
+    ap.add_argument("--ttl", type=float, default=0.05)
+    ap.add_argument("--stale-ttl", type=float, default=1.0)
+    args = ap.parse_args()
+    async with StubHost(fake_tools(), latency=args.latency) as host:
+        plain = HttpMCPClient(host.base_url, "config")
+        memo = MemoClient(plain, {"config.get": MemoPolicy(ttl=args.ttl, stale_ttl=args.stale_ttl, topics=("config",))})
+        for name, client in (("plain", plain), ("memo", memo)):
+            requests = host.requests
+            dt, lat = await fleet(client, args.agents, args.ticks, args.period)
+            print(f"  {name:>6}: {dt * 1000:8.1f} ms  {host.requests - requests:6d} requests"
+                  f"  p50 {np.percentile(lat, 50):8.3f} ms  p99 {np.percentile(lat, 99):8.3f} ms")
+        print(f"  {memo.stats.as_dict()}")
+        await close_transports()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
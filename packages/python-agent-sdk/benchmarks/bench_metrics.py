@@ -0,0 +1,45 @@
+"""Cost of the always-on instrumentation: per recorded call, per trace header set, per scrape.
+
+    python benchmarks/bench_metrics.py --ops 1000000
+"""
+import argparse
+import time
+
+from swarm_agent_sdk.metrics import MetricsRegistry, REGISTRY, record_call, start_span, trace_headers
+
+
+def per_op(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e9
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ops", type=int, default=1_000_000)
+    ap.add_argument("--series", type=int, default=200)
+    args = ap.parse_args()
+    n = args.ops
+    base = per_op(lambda: None, n)
+    print(f"      record_call: {per_op(lambda: record_call('market-data', 'get_ohlcv', 0.0123, 120, 48000), n) - base:8.0f} ns/op")
+    with start_span():
+        print(f"    trace_headers: {per_op(trace_headers, n) - base:8.0f} ns/op")
+
+    def span() -> None:
+        with start_span():
+            pass
+    print(f"       start_span: {per_op(span, n) - base:8.0f} ns/op")
+
+    reg = MetricsRegistry()
+    h = reg.histogram("bench_seconds", "bench", ("service", "tool"))
+    for i in range(args.series):
+        h.observe(0.01, f"svc{i % 10}", f"tool{i}")
+    t0 = time.perf_counter()
+    body = reg.render()
+    print(f"  render {args.series} series: {(time.perf_counter() - t0) * 1000:6.2f} ms  {len(body)} bytes")
+    assert REGISTRY.render()
+
+
+if __name__ == "__main__":
+    main()
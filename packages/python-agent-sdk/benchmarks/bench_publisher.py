@@ -0,0 +1,49 @@
+"""Publishing N bus messages: one bus.publish per message vs BusPublisher batches.
+
+    python benchmarks/bench_publisher.py --messages 5000 --latency 0.002
+"""
+import argparse
+import asyncio
+import time
+
+from swarm_agent_sdk.client import HttpMCPClient, gather_calls
+from swarm_agent_sdk.publisher import BusPublisher
+from swarm_agent_sdk.transport import close_transports
+
+from stub_host import StubHost
+
+
+def _ack(payload):
+    return {"topic": payload["topic"], "count": len(payload.get("messages", [0])), "partitions": []}
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--messages", type=int, default=5000)
+    ap.add_argument("--latency", type=float, default=0.002)
+    ap.add_argument("--max-batch", type=int, default=500)
+    args = ap.parse_args()
+    msgs = [{"symbol": f"S{i}", "score": i / args.messages} for i in range(args.messages)]
+    async with StubHost({"bus.publish": _ack, "bus.publish_batch": _ack}, latency=args.latency) as host:
+        bus = HttpMCPClient(host.base_url, "bus")
+        t0 = time.perf_counter()
+        res = await gather_calls([(bus, "bus.publish", {"topic": "bench", "payload": m}) for m in msgs], concurrency=32)
+        single = time.perf_counter() - t0
+        assert all(r.ok for r in res)
+        requests = host.requests
+
+        pub = BusPublisher(bus, max_batch=args.max_batch)
+        t0 = time.perf_counter()
+        futures = [await pub.publish("bench", m) for m in msgs]
+        await pub.flush()
+        batched = time.perf_counter() - t0
+        assert all(f.result().ok for f in futures)
+        stats = pub.stats.as_dict()
+        await close_transports()
+    print(f"  per-message: {single * 1000:8.1f} ms  {args.messages / single:10.0f} msg/s  {requests} requests")
+    print(f"      batched: {batched * 1000:8.1f} ms  {args.messages / batched:10.0f} msg/s  {stats['batches']} requests")
+    print(f"  ack latency: avg {stats['latency_avg'] * 1000:.1f} ms  max {stats['latency_max'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""Tail latency of one idempotent tool under different CallPolicy settings.
+
+    python benchmarks/bench_resilience.py --calls 400 --slow-rate 0.03 --slow 0.3 --error-rate 0.02
+
+The stub tool answers in ``--fast`` seconds, or ``--slow`` seconds with
+probability ``--slow-rate``, and fails with a 500 with probability
+``--error-rate``. Each policy runs the same calls with ``--concurrency``
+callers. The last row sends calls to a service that is down, with and
+without a circuit breaker.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+
+from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.resilience import CallPolicy, configure_breaker, deadline
+from swarm_agent_sdk.transport import close_transports
+
+from stub_host import StubHost
+
+
+async def run(client: HttpMCPClient, tool: str, calls: int, concurrency: int, budget=None):
+    sem = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one() -> None:
+        nonlocal errors
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                with deadline(budget):
+                    await client.call(tool, {})
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return np.array(latencies) * 1000, errors
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=400)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--fast", type=float, default=0.005)
+    ap.add_argument("--slow", type=float, default=0.3)
+    ap.add_argument("--slow-rate", type=float, default=0.03)
+    ap.add_argument("--error-rate", type=float, default=0.02)
+    ap.add_argument("--budget", type=float, default=0.1, help="deadline for the deadline row, seconds")
+    args = ap.parse_args()
+    rng = random.Random(7)
+
+    async def backtest(payload):
+        if rng.random() < args.error_rate:
+            raise RuntimeError("injected failure")
+        await asyncio.sleep(args.slow if rng.random() < args.slow_rate else args.fast)
+        return {"ok": True}
+
+    async def down(payload):
+        await asyncio.sleep(args.fast)
+        raise RuntimeError("service down")
+
+    cases = [
+        ("plain", CallPolicy(), None),
+        ("retries=2", CallPolicy(retries=2, backoff=0.005), None),
+        ("hedge p95", CallPolicy(hedge=True), None),
+        ("retries+hedge", CallPolicy(retries=2, backoff=0.005, hedge=True), None),
+        (f"deadline {args.budget}s", CallPolicy(retries=2, backoff=0.005, hedge=True), args.budget),
+    ]
+    async with StubHost({"backtester.run": backtest, "market-data.get_ohlcv": down}) as host:
+        configure_breaker("backtester", enabled=False)  # injected errors should not trip it here
+        print(f"{'policy':>16} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7} {'requests':>9}")
+        for name, policy, budget in cases:
+            client = HttpMCPClient(host.base_url, "backtester", policy=policy)
+            await run(client, "backtester.run", 40, args.concurrency)  # latency history for the hedge delay
+            requests = host.requests
+            lat, errors = await run(client, "backtester.run", args.calls, args.concurrency, budget)
+            print(f"{name:>16} {np.percentile(lat, 50):8.2f} {np.percentile(lat, 99):8.2f} {lat.max():8.2f} {errors:7d} {host.requests - requests:9d}")
+        for name, enabled in (("down, no breaker", False), ("down, breaker", True)):
+            configure_breaker("market-data", enabled=enabled, reset_seconds=60)
+            client = HttpMCPClient(host.base_url, "market-data", policy=CallPolicy(retries=2, backoff=0.005))
+            requests = host.requests
+            lat, errors = await run(client, "market-data.get_ohlcv", args.calls, args.concurrency)
+            print(f"{name:>16} {np.percentile(lat, 50):8.2f} {np.percentile(lat, 99):8.2f} {lat.max():8.2f} {errors:7d} {host.requests - requests:9d}")
+        await close_transports()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""Pre-trade checks for one batch of proposals: one call each vs the local prescreen.
+
+    python benchmarks/bench_risk.py --proposals 1000 --latency 0.002
+
+The book holds ``--positions`` symbols, loaded as fills through the stub
+broker. Proposal notionals are spread around the limits, so some fall in the
+borderline band, and together they exceed ``maxGross`` so later proposals are
+rejected once earlier approvals use it up. The per-proposal baseline must run
+in order, adding each approval to ``current``. Every mode must return the
+same statuses.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.risk import ExposureIndex, pretrade_check_batch
+from swarm_agent_sdk.transport import close_transports
+
+from stub_host import StubHost, fake_tools
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--proposals", type=int, default=1000)
+    ap.add_argument("--positions", type=int, default=200)
+    ap.add_argument("--latency", type=float, default=0.002)
+    ap.add_argument("--band", type=float, default=0.05)
+    args = ap.parse_args()
+    rng = random.Random(7)
+    limits = {"maxGross": 1_500_000.0, "maxSingle": 10_000.0}
+    async with StubHost(fake_tools(), latency=args.latency) as host:
+        risk = HttpMCPClient(host.base_url, "risk-engine")
+        broker = HttpMCPClient(host.base_url, "broker-gateway")
+        for i in range(args.positions):
+            await broker.call("broker-gateway.submit_order", {"symbol": f"S{i:04d}", "side": rng.choice(("BUY", "SELL")), "qty": rng.randint(1, 100), "price": rng.uniform(10, 100)})
+        index = ExposureIndex()
+        t0 = time.perf_counter()
+        await index.sync(broker)
+        sync_ms = (time.perf_counter() - t0) * 1000
+        proposals = [{"symbol": f"S{rng.randrange(args.positions):04d}", "side": "BUY", "qty": rng.randint(1, 200),
+                      "price": rng.uniform(10, 100), "limits": limits} for _ in range(args.proposals)]
+        print(f"  book: {index.summary()['symbols']} symbols, gross {index.gross:,.0f}, synced in {sync_ms:.1f} ms")
+
+        current = index.positions()
+        requests = host.requests
+        t0 = time.perf_counter()
+        serial = []
+        for p in proposals:
+            serial.append(await risk.call("risk-engine.pretrade_check", {**p, "current": current}))
+            if serial[-1]["status"] == "APPROVED":
+                current.append({"symbol": p["symbol"], "qty": p["qty"], "price": p["price"]})
+        dt = time.perf_counter() - t0
+        print(f"  {'per-proposal':>14}: {dt * 1000:8.1f} ms  {host.requests - requests:5d} requests  {len(proposals) / dt:10.0f} proposals/s")
+
+        # a huge band leaves every proposal borderline: one batched engine call
+        for name, band in (("engine batch", 1e9), ("prescreen", args.band)):
+            requests = host.requests
+            t0 = time.perf_counter()
+            decisions = await pretrade_check_batch(risk, index, proposals, band=band)
+            dt = time.perf_counter() - t0
+            assert [d["status"] for d in decisions] == [s["status"] for s in serial], name
+            print(f"  {name:>14}: {dt * 1000:8.1f} ms  {host.requests - requests:5d} requests  {len(proposals) / dt:10.0f} proposals/s")
+        print(f"  {index.stats.as_dict()}")
+        await close_transports()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
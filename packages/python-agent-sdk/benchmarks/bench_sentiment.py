@@ -0,0 +1,75 @@
+"""Headline scoring throughput: one request per headline vs SentimentPipeline batch sizes.
+
+    python benchmarks/bench_sentiment.py --headlines 20000 --duplicates 0.6 --latency 0.01 --per-text 0.0001
+
+The stub scorer costs ``latency`` per request plus ``per-text`` per headline.
+``--duplicates`` is the share of headlines that are syndicated copies.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from swarm_agent_sdk.client import HttpMCPClient, gather_calls
+from swarm_agent_sdk.sentiment import SentimentPipeline
+from swarm_agent_sdk.transport import close_transports
+
+from stub_host import StubHost, fake_tools
+
+
+def headlines(n: int, duplicates: float, symbols: int = 200):
+    rng = random.Random(7)
+    originals = []
+    out = []
+    for i in range(n):
+        if originals and rng.random() < duplicates:
+            text, symbol = rng.choice(originals)
+            text = text.upper() if rng.random() < 0.3 else text  # syndication often changes case
+        else:
+            symbol = f"S{rng.randrange(symbols)}"
+            text = f"{symbol} {rng.choice(['beats', 'misses', 'raises', 'cuts'])} guidance, story {i}"
+            originals.append((text, symbol))
+        out.append({"id": str(i), "symbol": symbol, "ts": f"2024-01-15T{(i // 3600) % 24:02d}:{(i // 60) % 60:02d}:{i % 60:02d}Z", "text": text})
+    return out
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--headlines", type=int, default=20_000)
+    ap.add_argument("--duplicates", type=float, default=0.6)
+    ap.add_argument("--latency", type=float, default=0.01)
+    ap.add_argument("--per-text", type=float, default=0.0001)
+    ap.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 256, 1024])
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--skip-naive", action="store_true")
+    args = ap.parse_args()
+    items = headlines(args.headlines, args.duplicates)
+    score_texts = fake_tools()["nlp-sentiment.score_texts"]
+
+    async def scorer(payload):
+        await asyncio.sleep(args.per_text * len(payload["items"]))
+        return score_texts(payload)
+
+    async with StubHost({"nlp-sentiment.score_texts": scorer}, latency=args.latency) as host:
+        nlp = HttpMCPClient(host.base_url, "nlp-sentiment")
+        if not args.skip_naive:
+            t0 = time.perf_counter()
+            res = await gather_calls([(nlp, "nlp-sentiment.score_texts", {"items": [i]}) for i in items], concurrency=args.concurrency)
+            dt = time.perf_counter() - t0
+            assert all(r.ok for r in res)
+            print(f"  per headline: {dt * 1000:9.1f} ms  {len(items) / dt:9.0f} texts/s  {len(items)} requests")
+        for size in args.batch_sizes:
+            pipeline = SentimentPipeline(nlp, batch_size=size, concurrency=args.concurrency)
+            requests = host.requests
+            t0 = time.perf_counter()
+            for i in range(0, len(items), 1000):  # arrives in chunks, as ticks would see it
+                await pipeline.ingest(items[i:i + 1000])
+            dt = time.perf_counter() - t0
+            stats = pipeline.stats.as_dict()
+            print(f"  batch {size:>5}: {dt * 1000:9.1f} ms  {len(items) / dt:9.0f} texts/s  {host.requests - requests} requests"
+                  f"  hit rate {stats['cache_hit_rate']:.0%}  syndicated {stats['syndicated']}")
+        await close_transports()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""Calls/sec through HttpMCPClient: per-call AsyncClient vs the shared pool.
+
+    python benchmarks/bench_transport.py --calls 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.transport import close_transports
+
+from stub_host import StubHost
+
+
+async def per_call_client(base: str, n: int, concurrency: int) -> None:
+    """The pre-pool behaviour: a fresh AsyncClient for every request."""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                resp = await client.post(f"{base}/call/bench", json={"tool": "bench.echo", "input": {}})
+                resp.raise_for_status()
+
+    await asyncio.gather(*(one() for _ in range(n)))
+
+
+async def pooled_client(base: str, n: int, concurrency: int) -> None:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            # constructed per call on purpose: agents build clients per tick
+            await HttpMCPClient(base, "bench").call("bench.echo", {})
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    await close_transports()
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=2000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    args = ap.parse_args()
+    for name, fn in (("per-call client", per_call_client), ("pooled", pooled_client)):
+        async with StubHost() as host:
+            t0 = time.perf_counter()
+            await fn(host.base_url, args.calls, args.concurrency)
+            dt = time.perf_counter() - t0
+            print(f"{name:>16}: {args.calls / dt:9.0f} calls/s  connections={host.connections}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
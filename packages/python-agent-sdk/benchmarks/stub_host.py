@@ -0,0 +1,234 @@
+"""Minimal in-process stand-in for the MCP host used by the SDK benchmarks.
+
+Speaks just enough HTTP/1.1 (keep-alive, content-length bodies) to serve
+``POST /call/{service}`` with ``{"tool": ..., "input": ...}`` payloads.
+``fake_tools`` provides stand-ins for the tools the demo agents call, with
+response shapes matching the real services.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+from datetime import datetime, timedelta, timezone
+import asyncio
+import json
+import random
+import zlib
+
+from swarm_agent_sdk.columnar import COLUMNAR_CONTENT_TYPE, ColumnBatch, encode_columnar
+
+Handler = Callable[[Dict[str, Any]], Union[Any, Awaitable[Any]]]
+
+
+class StubHost:
+    """``latency`` applies to every call; ``latencies`` overrides it per service (``"market-data"``)."""
+
+    def __init__(
+        self,
+        tools: Optional[Dict[str, Handler]] = None,
+        latency: float = 0.0,
+        columnar: bool = True,
+        latencies: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.tools: Dict[str, Handler] = tools or {}
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.columnar = columnar
+        self.requests = 0
+        self.connections = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "StubHost not started"
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubHost":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    async def _dispatch(self, path: str, body: bytes, accept: str) -> Any:
+        if not path.startswith("/call/"):
+            return 404, {"error": "not_found"}
+        req = json.loads(body or b"{}")
+        if isinstance(req.get("calls"), list):
+            results = await asyncio.gather(*(self._invoke(c) for c in req["calls"]), return_exceptions=True)
+            return 200, {"results": [
+                {"ok": False, "error": "upstream_error", "message": str(r)} if isinstance(r, Exception) else {"ok": True, "output": r}
+                for r in results
+            ]}
+        out = await self._invoke(req)
+        if self.columnar and COLUMNAR_CONTENT_TYPE in accept and isinstance(out, dict) and isinstance(out.get("rows"), list):
+            return 200, encode_columnar(ColumnBatch.from_rows(out["rows"]))
+        return 200, out
+
+    async def _invoke(self, req: Dict[str, Any]) -> Any:
+        name = req.get("tool", "")
+        tool = self.tools.get(name)
+        latency = self.latencies.get(name.split(".", 1)[0], self.latency)
+        if latency:
+            await asyncio.sleep(latency)
+        if tool is None:
+            return {"ok": True}
+        out = tool(req.get("input") or {})
+        if asyncio.iscoroutine(out):
+            out = await out
+        return out
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                _, path, _ = line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, v = h.decode("latin-1").split(":", 1)
+                    headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.requests += 1
+                try:
+                    status, out = await self._dispatch(path, body, headers.get("accept", ""))
+                except Exception as err:  # surface tool errors as 500s like the real host
+                    status, out = 500, {"error": "internal_error", "message": str(err)}
+                if isinstance(out, bytes):
+                    data, ctype = out, COLUMNAR_CONTENT_TYPE
+                else:
+                    data, ctype = json.dumps(out).encode(), "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'ERR'}\r\n"
+                    f"content-type: {ctype}\r\ncontent-length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+_STEPS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "1d": 86400}
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value[:19]).replace(tzinfo=timezone.utc)
+
+
+def fake_tools(bars_per_step: int = 1, pad_bytes: int = 0) -> Dict[str, Handler]:
+    """Handlers for market-data, feature-store, bus, backtester, risk-engine, nlp-sentiment,
+    broker-gateway, config and analytics.
+
+    Bars are a deterministic random walk per symbol and start bar. ``bars_per_step`` splits each interval
+    into that many bars, and ``pad_bytes`` adds a filler field to every ack; both scale
+    payload sizes without changing the request windows.
+    """
+    pad = {"pad": "x" * pad_bytes} if pad_bytes else {}
+
+    def get_ohlcv(p: Dict[str, Any]) -> Dict[str, Any]:
+        start, end = _parse_ts(p["start"]), _parse_ts(p["end"])
+        step = timedelta(seconds=_STEPS.get(p.get("interval", "1d"), 86400) / bars_per_step)
+        origin = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        t = origin + step * max(0, -(-(start - origin) // step))
+        rng = random.Random(zlib.crc32(p["symbol"].encode()))
+        price = 100.0 + rng.uniform(-20, 20)
+        walk = random.Random(zlib.crc32(p["symbol"].encode()) ^ int((t - origin) // step))
+        rows: List[Dict[str, Any]] = []
+        while t <= end:
+            open_ = price
+            price = max(1.0, open_ + walk.uniform(-0.25, 0.25))
+            rows.append({
+                "ts": t.strftime("%Y-%m-%dT%H:%M:%S.000Z"), "open": open_, "close": price,
+                "high": max(open_, price) + walk.random(), "low": min(open_, price) - walk.random(),
+                "volume": float(walk.randint(1000, 6000)),
+            })
+            t += step
+        return {"rows": rows}
+
+    def columnar_rows(p: Dict[str, Any]) -> Dict[str, Any]:
+        return {"wrote": p.get("nrows", 0), **pad}
+
+    def publish_batch(p: Dict[str, Any]) -> Dict[str, Any]:
+        return {"topic": p["topic"], "count": len(p.get("messages", [])), "partitions": [{"partition": 0, "offset": "0"}], **pad}
+
+    def backtest(p: Dict[str, Any]) -> Dict[str, Any]:
+        prices, threshold = p["prices"], p["threshold"]
+        trades, inv, last = [], 0.0, prices[0]["price"] if prices else 0.0
+        for row in prices:
+            delta = row["price"] - last
+            if delta > threshold:
+                trades.append({"ts": row["ts"], "side": "BUY", "price": row["price"]})
+                inv -= row["price"]
+            if delta < -threshold:
+                trades.append({"ts": row["ts"], "side": "SELL", "price": row["price"]})
+                inv += row["price"]
+            last = row["price"]
+        return {"trades": trades, "pnl": inv + (prices[-1]["price"] if trades else 0.0)}
+
+    def check(p: Dict[str, Any], current_gross: float) -> Dict[str, Any]:
+        exposure = abs(p["qty"] * p["price"])
+        gross = current_gross + exposure
+        breaches = [b for b, hit in (("max_gross", gross > p["limits"]["maxGross"]), ("max_single", exposure > p["limits"]["maxSingle"])) if hit]
+        return {"status": "REJECTED" if breaches else "APPROVED", "breaches": breaches}
+
+    def gross_of(current: List[Dict[str, Any]]) -> float:
+        return sum(abs(c["qty"] * c["price"]) for c in current)
+
+    def pretrade_check_batch(p: Dict[str, Any]) -> Dict[str, Any]:
+        gross, results = gross_of(p.get("current", [])), []
+        for q in p["proposals"]:
+            results.append(check(q, gross))
+            if results[-1]["status"] == "APPROVED":
+                gross += abs(q["qty"] * q["price"])
+        return {"results": results}
+
+    fills: List[Dict[str, Any]] = []
+
+    def submit_order(p: Dict[str, Any]) -> Dict[str, Any]:
+        n = len(fills)
+        fills.append({"ts": "2024-01-01T00:00:00Z", "cl_ord_id": f"clo_{n}", "exec_id": f"exe_{n}", "symbol": p["symbol"],
+                      "side": p["side"].upper(), "price": p.get("price") or 100.0, "qty": p["qty"], "venue": "SIM"})
+        return {"cl_ord_id": f"clo_{n}", "status": "FILLED"}
+
+    def get_fills(p: Dict[str, Any]) -> Dict[str, Any]:
+        return {"fills": fills[int(p.get("offset", 0)):], "next_offset": len(fills)}
+
+    def score_texts(p: Dict[str, Any]) -> Dict[str, Any]:
+        scores = []
+        for item in p["items"]:
+            score = (sum(map(ord, item["text"])) % 200 - 100) / 100
+            scores.append({"id": item.get("id", ""), "score": score, "magnitude": min(1.0, abs(score))})
+        return {"scores": scores}
+
+    return {
+        "market-data.get_ohlcv": get_ohlcv,
+        "feature-store.write_features": lambda p: {"wrote": len(p.get("rows", [])), **pad},
+        "feature-store.write_features_columnar": columnar_rows,
+        "bus.publish": lambda p: {"topic": p["topic"], "partition": 0, "offset": "0", **pad},
+        "bus.publish_batch": publish_batch,
+        "backtester.run": backtest,
+        "risk-engine.pretrade_check": lambda p: check(p, gross_of(p.get("current", []))),
+        "risk-engine.pretrade_check_batch": pretrade_check_batch,
+        "nlp-sentiment.score_texts": score_texts,
+        "broker-gateway.submit_order": submit_order,
+        "broker-gateway.get_positions": lambda p: {"positions": [{"symbol": "AAPL", "qty": 1, "price": 100.0}]},
+        "broker-gateway.get_fills": get_fills,
+        "config.get": lambda p: {"key": p["key"], "value": [0.2, 0.5, 1.0] if p["key"] == "strategy.candidates" else None},
+        "analytics.write_exec_stat": lambda p: {"ok": True, **pad},
+    }
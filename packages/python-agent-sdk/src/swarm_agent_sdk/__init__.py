@@ -1,15 +1,134 @@
-from .client import MCPClient, get_host_base
+from .client import MCPClient, CallResult, ToolCallError, gather_calls, get_host_base, tool_unsupported
+from .transport import PoolConfig, TransportPool, get_transport_pool, close_transports
 from .agent import BaseAgent, AgentConfig
+from .scheduler import TickScheduler, SchedulerStats
+from .runtime import AgentRuntime, run_agents
+from .publisher import BusPublisher, Delivery, PublisherStats, PublishQueueFull
+from .features import FeatureWriter, FeatureWriterStats, get_feature_writer
+from .streaming import RingBuffer, RollingSum, StreamSet, StreamingSMA, StreamingEMA, StreamingRSI, StreamingMomentum, StreamingRegime
+from .frames import OhlcvFrame
+from .cache import OhlcvCache, CacheStats, get_ohlcv_cache
+from .columnar import ColumnBatch, DictColumn, encode_columnar, decode_columnar
+from .universe import UniverseAgent, UniverseConfig, UniverseRunner, CycleReport, shard_symbols, run_sharded
+from .backtest import run_threshold, sweep, sweep_symbols, best_threshold
+from .execution import OrderArrays, SimResult, simulate, simulate_orders, tune_thresholds
+from .codec import (
+    list_adapter, record_type, validate_many, dump_many, encode_many,
+    MessageRecord, SignalScoreRecord, SentimentIndexRecord, TrendStateRecord, TradePlanRecord, ApprovedTradeRecord,
+)
+from .metrics import MetricsRegistry, REGISTRY, SpanContext, start_span, current_trace_id, trace_headers, start_metrics_server
+from .executors import ToolPool, ToolQueueFull, configure_tool_pool, get_tool_pool
+from .sentiment import SentimentPipeline, SentimentStats
+from .subscribe import Bar, BarFeed, BarSubscription, LocalBarFeed, PollingBarFeed, WebSocketBarFeed, SubscriptionStats, subscribe_bars
+from .memo import MemoClient, MemoPolicy, MemoStats, get_memo_client
+from .resilience import CallPolicy, CircuitBreaker, CircuitOpen, DeadlineExceeded, configure_breaker, deadline
+from .risk import ExposureIndex, ExposureStats, prescreen, pretrade_check_batch
 from .schemas import Message, SignalScore, SentimentIndex, TrendState, TradePlan, ApprovedTrade
 __all__ = [
     "MCPClient",
     "BaseAgent",
     "AgentConfig",
+    "CallResult",
+    "ToolCallError",
+    "gather_calls",
     "get_host_base",
+    "tool_unsupported",
+    "PoolConfig",
+    "TransportPool",
+    "get_transport_pool",
+    "close_transports",
+    "TickScheduler",
+    "SchedulerStats",
+    "AgentRuntime",
+    "run_agents",
+    "BusPublisher",
+    "Delivery",
+    "PublisherStats",
+    "PublishQueueFull",
+    "FeatureWriter",
+    "FeatureWriterStats",
+    "get_feature_writer",
+    "RingBuffer",
+    "RollingSum",
+    "StreamSet",
+    "StreamingSMA",
+    "StreamingEMA",
+    "StreamingRSI",
+    "StreamingMomentum",
+    "StreamingRegime",
+    "OhlcvFrame",
+    "OhlcvCache",
+    "CacheStats",
+    "get_ohlcv_cache",
+    "ColumnBatch",
+    "DictColumn",
+    "encode_columnar",
+    "decode_columnar",
+    "UniverseAgent",
+    "UniverseConfig",
+    "UniverseRunner",
+    "CycleReport",
+    "shard_symbols",
+    "run_sharded",
+    "run_threshold",
+    "sweep",
+    "sweep_symbols",
+    "best_threshold",
+    "OrderArrays",
+    "SimResult",
+    "simulate",
+    "simulate_orders",
+    "tune_thresholds",
     "Message",
     "SignalScore",
     "SentimentIndex",
     "TrendState",
     "TradePlan",
     "ApprovedTrade",
+    "list_adapter",
+    "record_type",
+    "validate_many",
+    "dump_many",
+    "encode_many",
+    "MessageRecord",
+    "SignalScoreRecord",
+    "SentimentIndexRecord",
+    "TrendStateRecord",
+    "TradePlanRecord",
+    "ApprovedTradeRecord",
+    "MetricsRegistry",
+    "REGISTRY",
+    "SpanContext",
+    "start_span",
+    "current_trace_id",
+    "trace_headers",
+    "start_metrics_server",
+    "ToolPool",
+    "ToolQueueFull",
+    "configure_tool_pool",
+    "get_tool_pool",
+    "SentimentPipeline",
+    "SentimentStats",
+    "Bar",
+    "BarFeed",
+    "BarSubscription",
+    "LocalBarFeed",
+    "PollingBarFeed",
+    "WebSocketBarFeed",
+    "SubscriptionStats",
+    "subscribe_bars",
+    "MemoClient",
+    "MemoPolicy",
+    "MemoStats",
+    "get_memo_client",
+    "CallPolicy",
+    "CircuitBreaker",
+    "CircuitOpen",
+    "DeadlineExceeded",
+    "configure_breaker",
+    "deadline",
+    "ExposureIndex",
+    "ExposureStats",
+    "prescreen",
+    "pretrade_check_batch",
 ]
@@ -1,19 +1,48 @@
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 import asyncio
+import json
+import os
 from .client import MCPClient
+from .executors import shutdown_tool_pools
+from .metrics import ensure_metrics_server, start_span, stop_metrics_server, track_scheduler
+from .resilience import deadline
+from .scheduler import TickScheduler
+from .streaming import StreamingIndicator, StreamSet
+from .transport import close_transports
+
+if TYPE_CHECKING:
+    from .runtime import AgentRuntime
 
 class AgentConfig(BaseModel):
     name: str
     version: str = "0.1.0"
     description: Optional[str] = None
     heartbeat_seconds: int = Field(default=30, ge=5, le=600)
+    state_dir: Optional[str] = Field(default_factory=lambda: os.environ.get("AGENT_STATE_DIR"))
+    # ticks (or bar batches) between state snapshots; the last one is always saved on shutdown
+    state_save_every: int = Field(default_factory=lambda: int(os.environ.get("AGENT_STATE_SAVE_EVERY", 10)), ge=1)
+    tick_policy: Literal["skip", "catch_up"] = "skip"
+    jitter_seconds: float = Field(default=0.0, ge=0)
+    tick_timeout_seconds: Optional[float] = Field(default=None, gt=0)
 
 class BaseAgent:
     def __init__(self, config: AgentConfig, client: MCPClient) -> None:
         self.config = config
         self.client = client
         self._stop_event = asyncio.Event()
+        self.streams: Dict[str, StreamSet] = {}
+        self._saved_streams: Dict[str, Any] = {}
+        self._unsaved_ticks = 0
+        self.scheduler = TickScheduler(
+            config.heartbeat_seconds,
+            policy=config.tick_policy,
+            jitter=config.jitter_seconds,
+            timeout=config.tick_timeout_seconds,
+        )
+        track_scheduler(config.name, self.scheduler)
+        self.runtime: Optional["AgentRuntime"] = None
+        self._closers: List[Callable[[], Awaitable[None]]] = []
 
     async def setup(self) -> None:
         """Override to prepare resources."""
@@ -23,14 +52,87 @@ class BaseAgent:
         """Override with agent unit of work; called in a loop."""
         raise NotImplementedError
 
+    def stream(self, key: str, factory: Callable[[], Dict[str, StreamingIndicator]]) -> StreamSet:
+        """Get or create the streaming indicator set for ``key`` (e.g. a symbol).
+
+        Sets persisted by a previous run are restored instead of calling ``factory``.
+        """
+        s = self.streams.get(key)
+        if s is None:
+            saved = self._saved_streams.pop(key, None)
+            s = StreamSet.restore(saved) if saved else StreamSet(factory())
+            self.streams[key] = s
+        return s
+
+    def on_teardown(self, closer: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function to await on teardown (e.g. a publisher's ``aclose``)."""
+        self._closers.append(closer)
+
+    @property
+    def state_path(self) -> Optional[str]:
+        if not self.config.state_dir:
+            return None
+        return os.path.join(self.config.state_dir, f"{self.config.name}.json")
+
+    def load_state(self) -> None:
+        path = self.state_path
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self._saved_streams = json.load(f).get("streams", {})
+
+    def save_state(self) -> None:
+        path = self.state_path
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        streams = dict(self._saved_streams)
+        streams.update({k: s.snapshot() for k, s in self.streams.items()})
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"streams": streams}, f)
+        os.replace(tmp, path)
+        self._unsaved_ticks = 0
+
+    def _count_tick(self) -> None:
+        """Save state after every ``state_save_every`` ticks or bar batches."""
+        self._unsaved_ticks += 1
+        if self._unsaved_ticks >= self.config.state_save_every:
+            self.save_state()
+
     async def run(self) -> None:
+        self.load_state()
+        await ensure_metrics_server()
         await self.setup()
         try:
-            while not self._stop_event.is_set():
-                await self.tick()
-                await asyncio.sleep(self.config.heartbeat_seconds)
+            await self._serve()
         except asyncio.CancelledError:
             pass
+        finally:
+            if self._unsaved_ticks:
+                self.save_state()
+            await self.teardown()
+
+    async def _serve(self) -> None:
+        await self.scheduler.run(self._tick_and_save, self._stop_event)
+
+    async def _tick_and_save(self) -> None:
+        # the tick timeout doubles as the deadline budget passed down to every call
+        with start_span(), deadline(self.config.tick_timeout_seconds):
+            await self.tick()
+        self._count_tick()
+
+    async def teardown(self) -> None:
+        """Run ``on_teardown`` closers and release pooled host connections.
+
+        Agents hosted by an ``AgentRuntime`` share connections, which the
+        runtime closes once all of them are done.
+        """
+        for closer in reversed(self._closers):
+            await closer()
+        if self.runtime is None:
+            await close_transports()
+            await stop_metrics_server()
+            shutdown_tool_pools()
 
     def stop(self) -> None:
         self._stop_event.set()
@@ -0,0 +1,85 @@
+"""In-process threshold backtester matching the ``backtester.run`` service.
+
+Semantics (see ``services/backtester``): walking the prices, a move above
+``threshold`` since the previous bar buys one unit (``inv -= price``), a move
+below ``-threshold`` sells one (``inv += price``), and
+``pnl = inv + last_price`` if any trade happened, else ``inv``.
+
+``sweep`` scores a whole grid of thresholds in one vectorized pass. The
+running inventory is built with ``cumsum``, which accumulates in time order
+like the service, so results match it exactly rather than approximately.
+"""
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# cap on candidates x steps held at once by one sweep chunk
+_CHUNK_ELEMENTS = 1 << 22
+
+
+def run_threshold(prices: Sequence[Dict[str, Any]], threshold: float = 0.0) -> Dict[str, Any]:
+    """Single-threshold run over ``{"ts", "price"}`` rows, returning trades like the service."""
+    trades: List[Dict[str, Any]] = []
+    last = prices[0]["price"] if prices else 0
+    inv = 0.0
+    for p in prices:
+        delta = p["price"] - last
+        if delta > threshold:
+            trades.append({"ts": p["ts"], "side": "BUY", "price": p["price"]})
+            inv -= p["price"]
+        if delta < -threshold:
+            trades.append({"ts": p["ts"], "side": "SELL", "price": p["price"]})
+            inv += p["price"]
+        last = p["price"]
+    pnl = inv + (prices[-1]["price"] if trades else 0)
+    return {"trades": trades, "pnl": pnl}
+
+
+def sweep(prices, thresholds) -> np.ndarray:
+    """P&L for every threshold: shape ``(K,)`` for 1-D prices, ``(S, K)`` for 2-D."""
+    x = np.asarray(prices, dtype=np.float64)
+    thr = np.asarray(thresholds, dtype=np.float64).ravel()
+    if x.ndim == 1:
+        return sweep(x[None, :], thr)[0]
+    n_sym, n = x.shape
+    out = np.zeros((n_sym, len(thr)))
+    if n == 0 or len(thr) == 0:
+        return out
+    delta = np.diff(x, axis=1, prepend=x[:, :1])
+    chunk = max(1, _CHUNK_ELEMENTS // (2 * n))
+    for s in range(n_sym):
+        for lo in range(0, len(thr), chunk):
+            t = thr[lo:lo + chunk, None]
+            buy = delta[s] > t
+            sell = delta[s] < -t
+            # interleave buy/sell legs per bar so the running sum follows the service order
+            steps = np.empty((len(t), 2 * n))
+            steps[:, 0::2] = np.where(buy, -x[s], 0.0)
+            steps[:, 1::2] = np.where(sell, x[s], 0.0)
+            inv = np.cumsum(steps, axis=1)[:, -1]
+            traded = buy.any(axis=1) | sell.any(axis=1)
+            out[s, lo:lo + chunk] = inv + np.where(traded, x[s, -1], 0.0)
+    return out
+
+
+def _sweep_one(args: Any) -> np.ndarray:
+    prices, thresholds = args
+    return sweep(prices, thresholds)
+
+
+def sweep_symbols(series: Mapping[str, Sequence[float]], thresholds, processes: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """``sweep`` per symbol (series may differ in length), optionally on a process pool."""
+    symbols = list(series)
+    jobs = [(np.asarray(series[s], dtype=np.float64), thresholds) for s in symbols]
+    if processes and processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_sweep_one, jobs))
+    else:
+        results = [_sweep_one(j) for j in jobs]
+    return dict(zip(symbols, results))
+
+
+def best_threshold(pnl: np.ndarray, thresholds) -> Dict[str, float]:
+    """Highest-P&L candidate; ties go to the earliest, like ``max`` over a list."""
+    i = int(np.argmax(pnl))
+    return {"threshold": float(np.asarray(thresholds).ravel()[i]), "pnl": float(pnl[i])}
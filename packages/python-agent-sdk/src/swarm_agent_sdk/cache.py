@@ -0,0 +1,257 @@
+"""Range-aware OHLCV cache in front of ``market-data.get_ohlcv``.
+
+Bars are kept per (symbol, interval) together with the date ranges already
+fetched. A request only fetches the gaps it does not cover. Coverage stops
+at the last closed bar, so a bar still forming (or not yet published) is
+fetched again on the next request rather than cached as final. Hot series sit in
+an LRU bounded by a byte budget. With a ``cache_dir`` every series is also
+persisted as one ``.npy`` file per column and reopened memory-mapped, so
+restarts and sibling agent processes start warm. Writers hold an exclusive
+``flock`` on ``<series>.lock`` for the whole write (columns, then coverage),
+and readers a shared one, so a reader never mixes two writers' columns.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import asyncio
+import json
+import os
+import re
+import time
+try:
+    import fcntl
+except ImportError:  # not on Windows: series directories are not locked there
+    fcntl = None  # type: ignore[assignment]
+import numpy as np
+
+from .client import HttpMCPClient, MCPClient
+from .frames import INTERVAL_MS, OHLCV_FIELDS, OhlcvFrame, format_ts, parse_ts
+from .subscribe import BarFeed, BarSubscription, subscribe_bars
+
+OHLCV_TOOL = "market-data.get_ohlcv"
+Range = Tuple[int, int]  # inclusive epoch-ms bounds
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    partial_hits: int = 0
+    misses: int = 0
+    gap_fetches: int = 0
+    rows_fetched: int = 0
+    bytes_fetched: int = 0
+    bytes_resident: int = 0
+    evictions: int = 0
+    disk_loads: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _Series:
+    frame: OhlcvFrame
+    covered: List[Range] = field(default_factory=list)
+    mtime: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+@contextmanager
+def _series_lock(base: str, exclusive: bool) -> Iterator[None]:
+    """``flock`` on ``<base>.lock`` for the duration of a read or write of the series directory."""
+    with open(f"{base}.lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield  # closing the file releases the lock
+
+
+def _add_range(ranges: List[Range], new: Range) -> List[Range]:
+    out: List[Range] = []
+    for lo, hi in sorted(ranges + [new]):
+        if out and lo <= out[-1][1] + 1:
+            out[-1] = (out[-1][0], max(out[-1][1], hi))
+        else:
+            out.append((lo, hi))
+    return out
+
+
+def _gaps(ranges: List[Range], want: Range) -> List[Range]:
+    gaps: List[Range] = []
+    cur = want[0]
+    for lo, hi in ranges:
+        if hi < cur:
+            continue
+        if lo > want[1]:
+            break
+        if lo > cur:
+            gaps.append((cur, lo - 1))
+        cur = max(cur, hi + 1)
+    if cur <= want[1]:
+        gaps.append((cur, want[1]))
+    return gaps
+
+
+class OhlcvCache(MCPClient):
+    """Drop-in wrapper for a market-data client that caches ``get_ohlcv``.
+
+    Other tools pass straight through to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        client: MCPClient,
+        cache_dir: Optional[str] = None,
+        memory_budget: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__()
+        self._client = client
+        self._clock = clock
+        self._dir = cache_dir
+        self._budget = memory_budget
+        self._series: "OrderedDict[Tuple[str, str], _Series]" = OrderedDict()
+        self.stats = CacheStats()
+
+    async def call(self, tool_name: str, payload: Dict[str, Any]) -> Any:
+        if tool_name != OHLCV_TOOL:
+            return await self._client.call(tool_name, payload)
+        frame = await self.get_frame(payload["symbol"], payload["start"], payload["end"], payload["interval"])
+        return {"rows": frame.to_rows()}
+
+    async def get_frame(self, symbol: str, start: str, end: str, interval: str) -> OhlcvFrame:
+        want = (parse_ts(start), parse_ts(end))
+        series = self._get(symbol, interval)
+        async with series.lock:
+            gaps = _gaps(series.covered, want)
+            if gaps and self._dir and self._reload(symbol, interval, series):
+                gaps = _gaps(series.covered, want)  # a sibling process may have filled them
+            if not gaps:
+                self.stats.hits += 1
+            elif gaps == [want]:
+                self.stats.misses += 1
+            else:
+                self.stats.partial_hits += 1
+            if gaps:
+                await self._fill(symbol, interval, series, gaps)
+                settled = min(want[1], self._closed_until(interval))
+                if settled >= want[0]:
+                    series.covered = _add_range(series.covered, (want[0], settled))
+                self._persist(symbol, interval, series)
+            self._evict()
+            return series.frame.between(*want)
+
+    def subscribe_bars(self, symbols: Sequence[str], interval: str, feed: Optional[BarFeed] = None, **kwargs: Any) -> BarSubscription:
+        """Push subscription whose gap backfills go through this cache (see ``subscribe``)."""
+        return subscribe_bars(self, symbols, interval, feed, **kwargs)
+
+    def clear(self) -> None:
+        """Forget every in-memory series; a ``cache_dir`` is left as is."""
+        self._series.clear()
+
+    def _closed_until(self, interval: str) -> int:
+        """Last epoch ms before the bar now forming; later bars may still change or appear."""
+        step = INTERVAL_MS[interval]
+        return int(self._clock() * 1000) // step * step - 1
+
+    def _get(self, symbol: str, interval: str) -> _Series:
+        key = (symbol, interval)
+        series = self._series.get(key)
+        if series is None:
+            series = _Series(OhlcvFrame.empty())
+            if self._dir:
+                self._reload(symbol, interval, series)
+            self._series[key] = series
+        self._series.move_to_end(key)
+        return series
+
+    async def _fill(self, symbol: str, interval: str, series: _Series, gaps: List[Range]) -> None:
+        step = INTERVAL_MS[interval]
+        for lo, hi in gaps:
+            # align to the interval grid so gap fetches line up with cached bars
+            lo = -(-lo // step) * step
+            hi = hi // step * step
+            if lo > hi:
+                continue
+            payload = {"symbol": symbol, "start": format_ts(lo), "end": format_ts(hi), "interval": interval}
+            if isinstance(self._client, HttpMCPClient):
+                fetched = OhlcvFrame.from_columns(await self._client.call_columns(OHLCV_TOOL, payload))
+            else:
+                fetched = OhlcvFrame.from_rows((await self._client.call(OHLCV_TOOL, payload)).get("rows", []))
+            self.stats.gap_fetches += 1
+            self.stats.rows_fetched += len(fetched)
+            self.stats.bytes_fetched += fetched.nbytes
+            series.frame = fetched.merge(series.frame)  # refetched bars replace stale copies
+
+    def _evict(self) -> None:
+        total = sum(s.frame.nbytes for s in self._series.values())
+        while total > self._budget and len(self._series) > 1:
+            _, old = self._series.popitem(last=False)
+            total -= old.frame.nbytes
+            self.stats.evictions += 1
+        self.stats.bytes_resident = total
+
+    def _path(self, symbol: str, interval: str) -> str:
+        assert self._dir is not None
+        return os.path.join(self._dir, interval, re.sub(r"[^A-Za-z0-9_.-]", "_", symbol))
+
+    def _reload(self, symbol: str, interval: str, series: _Series) -> bool:
+        """Load the on-disk copy if it is newer than what ``series`` holds."""
+        base = self._path(symbol, interval)
+        meta = os.path.join(base, "coverage.json")
+        try:
+            if os.stat(meta).st_mtime <= series.mtime:
+                return False
+            with _series_lock(base, exclusive=False):
+                mtime = os.stat(meta).st_mtime
+                with open(meta) as f:
+                    covered = [tuple(r) for r in json.load(f)["covered"]]
+                cols = [np.load(os.path.join(base, f"{name}.npy"), mmap_mode="r") for name in ("ts",) + OHLCV_FIELDS]
+        except (OSError, ValueError, KeyError):
+            return False
+        if len({len(c) for c in cols}) != 1:
+            print({"ohlcv_cache": "torn_series", "symbol": symbol, "interval": interval})
+            return False
+        series.frame = series.frame.merge(OhlcvFrame(*cols)) if len(series.frame) else OhlcvFrame(*cols)
+        for r in covered:
+            series.covered = _add_range(series.covered, (int(r[0]), int(r[1])))
+        series.mtime = mtime
+        self.stats.disk_loads += 1
+        return True
+
+    def _persist(self, symbol: str, interval: str, series: _Series) -> None:
+        if not self._dir:
+            return
+        base = self._path(symbol, interval)
+        os.makedirs(base, exist_ok=True)
+        with _series_lock(base, exclusive=True):
+            for name, col in zip(("ts",) + OHLCV_FIELDS, series.frame.columns()):
+                tmp = os.path.join(base, f".{name}.{os.getpid()}.npy")
+                np.save(tmp, np.ascontiguousarray(col))
+                os.replace(tmp, os.path.join(base, f"{name}.npy"))
+            # coverage is written last: readers only trust columns it vouches for
+            meta = os.path.join(base, "coverage.json")
+            tmp = f"{meta}.{os.getpid()}"
+            with open(tmp, "w") as f:
+                json.dump({"covered": series.covered}, f)
+            os.replace(tmp, meta)
+            series.mtime = os.stat(meta).st_mtime
+
+
+_CACHES: Dict[str, OhlcvCache] = {}
+
+
+def get_ohlcv_cache(host_base: str, cache_dir: Optional[str] = None, memory_budget: Optional[int] = None) -> OhlcvCache:
+    """Process-wide cache per host, so sibling agents share hot series.
+
+    Defaults come from ``OHLCV_CACHE_DIR`` and ``OHLCV_CACHE_BYTES``.
+    """
+    cache = _CACHES.get(host_base)
+    if cache is None:
+        cache = OhlcvCache(
+            HttpMCPClient(host_base, "market-data"),
+            cache_dir=cache_dir or os.environ.get("OHLCV_CACHE_DIR"),
+            memory_budget=memory_budget or int(os.environ.get("OHLCV_CACHE_BYTES", 64 * 1024 * 1024)),
+        )
+        _CACHES[host_base] = cache
+    return cache
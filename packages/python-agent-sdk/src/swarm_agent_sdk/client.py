@@ -1,13 +1,68 @@
-from typing import Any, Dict, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Sequence, Tuple
 import asyncio
 from dataclasses import dataclass
 import json
 import os
+import time
+from .columnar import COLUMNAR_CONTENT_TYPE, ColumnBatch, decode_response
+from .executors import DEFAULT_POOLS, EXECUTION_MODES, get_tool_pool
+from .metrics import record_call, trace_headers
+from .resilience import CallPolicy, DeadlineExceeded, call_with_policy, remaining
+from .transport import TransportPool, get_transport_pool
 
 @dataclass
 class Tool:
     name: str
     call: Callable[[Dict[str, Any]], Any]
+    mode: str = "thread"  # for sync tools: inline | thread | process, see ``executors``
+    pool: Optional[str] = None
+
+@dataclass
+class CallResult:
+    """Outcome of one invocation in a batch; failures are captured, not raised."""
+    tool: str
+    ok: bool
+    value: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+    def unwrap(self) -> Any:
+        if not self.ok:
+            assert self.error is not None
+            raise self.error
+        return self.value
+
+class ToolCallError(RuntimeError):
+    """A tool invocation that failed on the host side of a batched request."""
+    def __init__(self, tool: str, code: str, message: Optional[str] = None) -> None:
+        super().__init__(f"{tool}: {code}" + (f" ({message})" if message else ""))
+        self.tool = tool
+        self.code = code
+
+ToolCall = Tuple["MCPClient", str, Dict[str, Any]]
+
+async def gather_calls(calls: Sequence[ToolCall], concurrency: Optional[int] = None, timeout: Optional[float] = None) -> List[CallResult]:
+    """Run independent (client, tool, payload) calls concurrently.
+
+    Results keep the input order. ``concurrency`` bounds in-flight calls and
+    ``timeout`` is a per-call deadline in seconds; a timed-out call yields a
+    failed result carrying ``asyncio.TimeoutError``.
+    """
+    sem = asyncio.Semaphore(concurrency) if concurrency else None
+
+    async def run(client: "MCPClient", tool: str, payload: Dict[str, Any]) -> CallResult:
+        t0 = time.perf_counter()
+        try:
+            if sem is not None:
+                async with sem:
+                    value = await asyncio.wait_for(client.call(tool, payload), timeout)
+            else:
+                value = await asyncio.wait_for(client.call(tool, payload), timeout)
+            return CallResult(tool, True, value, elapsed=time.perf_counter() - t0)
+        except Exception as err:
+            return CallResult(tool, False, error=err, elapsed=time.perf_counter() - t0)
+
+    return list(await asyncio.gather(*(run(c, t, p) for c, t, p in calls)))
 
 class MCPClient:
     """Lightweight placeholder MCP client facade.
@@ -18,49 +73,173 @@ class MCPClient:
     def __init__(self, tool_registry: Optional[Dict[str, Tool]] = None) -> None:
         self._tools: Dict[str, Tool] = tool_registry or {}
 
-    def register_tool(self, name: str, func: Callable[[Dict[str, Any]], Any]) -> None:
-        self._tools[name] = Tool(name=name, call=func)
+    def register_tool(self, name: str, func: Callable[[Dict[str, Any]], Any], mode: str = "thread", pool: Optional[str] = None) -> None:
+        """Register a tool; ``mode`` and ``pool`` pick where a sync ``func`` runs (see ``executors``)."""
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"unknown execution mode {mode!r}")
+        if pool is not None and mode != "inline":
+            get_tool_pool(pool, mode)  # fail on a kind mismatch now rather than on first call
+        self._tools[name] = Tool(name=name, call=func, mode=mode, pool=pool)
 
     async def call(self, tool_name: str, payload: Dict[str, Any]) -> Any:
         if tool_name not in self._tools:
             raise KeyError(f"Tool not found: {tool_name}")
-        func = self._tools[tool_name].call
-        if asyncio.iscoroutinefunction(func):
-            return await func(payload)
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: func(payload))
+        tool = self._tools[tool_name]
+        t0 = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(tool.call):
+                value = await tool.call(payload)
+            elif tool.mode == "inline":
+                value = tool.call(payload)
+            else:
+                value = await get_tool_pool(tool.pool or DEFAULT_POOLS[tool.mode], tool.mode).run(tool.call, payload)
+        except BaseException as err:
+            record_call("local", tool_name, time.perf_counter() - t0, error=err)
+            raise
+        record_call("local", tool_name, time.perf_counter() - t0)
+        return value
+
+    async def call_many(self, calls: Sequence[Tuple[str, Dict[str, Any]]], concurrency: Optional[int] = 8, timeout: Optional[float] = None) -> List[CallResult]:
+        """Invoke several tools concurrently; see ``gather_calls``."""
+        return await gather_calls([(self, t, p) for t, p in calls], concurrency=concurrency, timeout=timeout)
+
 class HttpMCPClient(MCPClient):
     """HTTP client that talks to the MCP host router.
 
     host_base: e.g., http://localhost:4000
     service: e.g., "market-data" or "feature-store"
+
+    Connections come from the process-wide transport pool, so constructing a
+    client per tick is cheap and reuses keep-alive connections to the host.
+    Every request is timed into ``metrics`` and carries the current trace.
+    Requests honour the current ``resilience.deadline`` and go through the
+    service's circuit breaker; ``policy`` (or ``set_policy`` per tool) adds
+    retries and hedging for idempotent tools.
     """
-    def __init__(self, host_base: str, service: str) -> None:
+    def __init__(self, host_base: str, service: str, pool: Optional[TransportPool] = None, policy: Optional[CallPolicy] = None) -> None:
         super().__init__()
         self._host_base = host_base.rstrip('/')
         self._service = service
+        self._pool = pool or get_transport_pool()
+        self._path = f"/call/{service}"
+        self._batch_supported = True
+        self.policy = policy or CallPolicy.from_env()
+        self._tool_policies: Dict[str, CallPolicy] = {}
 
-    async def call(self, tool_name: str, payload: Dict[str, Any]) -> Any:
+    def set_policy(self, tool_name: str, policy: CallPolicy) -> None:
+        self._tool_policies[tool_name] = policy
+
+    async def _post(self, tool_name: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> Any:
+        policy = self._tool_policies.get(tool_name, self.policy)
+        return await call_with_policy(self._service, tool_name, lambda: self._attempt(tool_name, headers, **kwargs), policy)
+
+    async def _attempt(self, tool_name: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> Any:
         import httpx
-        headers = {}
-        # Optional agent metadata
-        agent_id = os.environ.get("AGENT_ID")
-        agent_role = os.environ.get("AGENT_ROLE")
-        api_key = os.environ.get("API_KEY")
-        trace_id = os.environ.get("TRACE_ID")
-        if agent_id:
-            headers["x-agent-id"] = agent_id
-        if agent_role:
-            headers["x-agent-role"] = agent_role
-        if api_key:
-            headers["authorization"] = f"Bearer {api_key}"
-        if trace_id:
-            headers["x-correlation-id"] = trace_id
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{self._host_base}/call/{self._service}"
-            resp = await client.post(url, headers=headers, json={"tool": tool_name, "input": payload})
+        client = self._pool.get(self._host_base)
+        headers = {**trace_headers(), **headers} if headers else trace_headers()
+        left = remaining()
+        capped = False
+        if left is not None and left < self._pool.config.timeout:
+            capped = True
+            kwargs["timeout"] = max(left, 0.001)
+        t0 = time.perf_counter()
+        try:
+            try:
+                resp = await client.post(self._path, headers=headers, **kwargs)
+            except httpx.TimeoutException as err:
+                if capped:
+                    raise DeadlineExceeded(f"{tool_name}: deadline exceeded") from err
+                raise
             resp.raise_for_status()
-            return resp.json()
+        except asyncio.CancelledError:
+            raise  # e.g. the losing copy of a hedged call: not an error of the service
+        except BaseException as err:
+            record_call(self._service, tool_name, time.perf_counter() - t0, error=err)
+            raise
+        record_call(self._service, tool_name, time.perf_counter() - t0, len(resp.request.content), len(resp.content))
+        return resp
+
+    async def call(self, tool_name: str, payload: Dict[str, Any]) -> Any:
+        resp = await self._post(tool_name, json={"tool": tool_name, "input": payload})
+        return resp.json()
+
+    async def call_encoded(self, tool_name: str, payload_json: bytes) -> Any:
+        """``call`` with an input that is already JSON bytes (e.g. from ``codec.encode_many``)."""
+        body = b'{"tool":' + json.dumps(tool_name).encode() + b',"input":' + payload_json + b"}"
+        resp = await self._post(tool_name, content=body, headers={"content-type": "application/json"})
+        return resp.json()
+
+    async def call_columns(self, tool_name: str, payload: Dict[str, Any], key: str = "rows") -> ColumnBatch:
+        """Call a row-returning tool and get its ``key`` rows as columns.
+
+        Asks for the columnar encoding and decodes it without copying; services
+        that only speak JSON are converted from their row dicts instead.
+        """
+        resp = await self._post(
+            tool_name,
+            json={"tool": tool_name, "input": payload},
+            headers={"accept": f"{COLUMNAR_CONTENT_TYPE}, application/json;q=0.5"},
+        )
+        return decode_response(resp.headers.get("content-type"), resp.content, key)
+
+    async def call_many(self, calls: Sequence[Tuple[str, Dict[str, Any]]], concurrency: Optional[int] = 8, timeout: Optional[float] = None, batch: bool = True) -> List[CallResult]:
+        """Invoke several tools on this service.
+
+        With ``batch`` the calls travel in ``{"calls": [...]}`` requests and
+        the host fans each one out; ``timeout`` becomes the host-side per-call
+        deadline. The host runs a whole batch at once, so ``concurrency`` is
+        applied by sending at most that many calls per request, one request
+        after another (``None`` sends them all in one). Hosts without batch
+        support (404/405) fall back to concurrent calls. Any other failure of
+        a batch request fails every call in it: the host may already have run
+        some, so they are not replayed.
+        """
+        if not batch or not self._batch_supported or len(calls) < 2:
+            return await super().call_many(calls, concurrency=concurrency, timeout=timeout)
+        size = concurrency if concurrency and concurrency > 0 else len(calls)
+        out: List[CallResult] = []
+        for start in range(0, len(calls), size):
+            chunk = calls[start:start + size]
+            results = await self._call_batch(chunk, timeout) if self._batch_supported else None
+            if results is None:
+                results = await super().call_many(chunk, concurrency=concurrency, timeout=timeout)
+            out += results
+        return out
+
+    async def _call_batch(self, calls: Sequence[Tuple[str, Dict[str, Any]]], timeout: Optional[float]) -> Optional[List[CallResult]]:
+        """One batch request; ``None`` when the host has no batch endpoint."""
+        import httpx
+        body: Dict[str, Any] = {"calls": [{"tool": t, "input": p} for t, p in calls]}
+        if timeout is not None:
+            body["timeout_ms"] = int(timeout * 1000)
+        t0 = time.perf_counter()
+        try:
+            resp = await self._post("batch", json=body)
+            results = resp.json()["results"]
+        except httpx.HTTPStatusError as err:
+            if err.response.status_code not in (404, 405):
+                return [CallResult(tool, False, error=err, elapsed=time.perf_counter() - t0) for tool, _ in calls]
+            self._batch_supported = False
+            return None
+        except Exception as err:  # transport errors, timeouts, open circuit, malformed body
+            return [CallResult(tool, False, error=err, elapsed=time.perf_counter() - t0) for tool, _ in calls]
+        elapsed = time.perf_counter() - t0
+        out: List[CallResult] = []
+        for (tool, _), r in zip(calls, results):
+            if r.get("ok"):
+                out.append(CallResult(tool, True, r.get("output"), elapsed=elapsed))
+            else:
+                out.append(CallResult(tool, False, error=ToolCallError(tool, r.get("error", "error"), r.get("message")), elapsed=elapsed))
+        return out
+
+
+def tool_unsupported(err: Exception) -> bool:
+    """Whether a failed call means the service (or the host's RBAC policy) lacks the tool."""
+    response = getattr(err, "response", None)
+    if response is None:
+        return False
+    # the host relays an upstream 404 as a 500 carrying the service's error body
+    return response.status_code in (403, 404) or "tool_not_found" in response.text
 
 
 def get_host_base(default: str = "http://localhost:4000"):
@@ -0,0 +1,108 @@
+"""Bulk validation and JSON encoding for ``schemas`` messages.
+
+``encode_many(SignalScore, items)`` validates a whole list in one call and
+serializes it to JSON bytes in pydantic-core, without a model instance and a
+``model_dump()`` dict per item for httpx to encode again. Validation runs
+against a cached TypedDict twin of the model with the same fields,
+constraints and field validators, which is several times cheaper than
+building models. The bytes are the same JSON as ``[m.model_dump() ...]``.
+
+For hot loops each message model has a tuple-backed record type
+(``SignalScoreRecord``...) with the same fields and defaults; records, models
+and plain dicts are all accepted wherever items are.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from collections import namedtuple
+from functools import lru_cache
+from pydantic import AfterValidator, BaseModel, BeforeValidator, PlainValidator, TypeAdapter
+from typing_extensions import Annotated, TypedDict
+import pydantic_core
+
+from .schemas import ApprovedTrade, Message, SentimentIndex, SignalScore, TradePlan, TrendState
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached ``TypeAdapter(List[model])``; building one per call costs more than validating."""
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+_VALIDATORS = {"after": AfterValidator, "before": BeforeValidator, "plain": PlainValidator}
+
+
+@lru_cache(maxsize=None)
+def _wire(model: Type[BaseModel]) -> Tuple[Optional[TypeAdapter], Dict[str, Any]]:
+    """List-of-TypedDict adapter mirroring ``model``, plus its field defaults.
+
+    Returns no adapter for models whose validators cannot be carried over
+    (model validators, wrap mode); those go through ``list_adapter``.
+    """
+    decorators = model.__pydantic_decorators__
+    if decorators.model_validators:
+        return None, {}
+    fields: Dict[str, Any] = {}
+    for name, f in model.model_fields.items():
+        extra = list(f.metadata)
+        for dec in decorators.field_validators.values():
+            if name in dec.info.fields or "*" in dec.info.fields:
+                validator = _VALIDATORS.get(dec.info.mode)
+                if validator is None:
+                    return None, {}
+                extra.append(validator(dec.func))
+        fields[name] = Annotated[tuple([f.annotation] + extra)] if extra else f.annotation
+    defaults = {n: f.get_default(call_default_factory=True) for n, f in model.model_fields.items() if not f.is_required()}
+    # functional TypedDict with a computed name: mypy cannot type it statically
+    wire: Any = TypedDict(f"{model.__name__}Wire", fields)  # type: ignore[misc]
+    return TypeAdapter(List[wire]), defaults  # type: ignore[valid-type]
+
+
+def record_type(model: Type[BaseModel]) -> Type[tuple]:
+    """Namedtuple with ``model``'s fields in order, optional fields defaulted the same way."""
+    fields = model.model_fields
+    defaults = [f.get_default(call_default_factory=True) for f in fields.values() if not f.is_required()]
+    return namedtuple(f"{model.__name__}Record", list(fields), defaults=defaults)
+
+
+def _plain(items: Sequence[Any], defaults: Optional[Dict[str, Any]] = None) -> List[Any]:
+    out: List[Any] = []
+    for i in items:
+        if isinstance(i, tuple) and hasattr(i, "_asdict"):
+            out.append(i._asdict())
+        elif isinstance(i, BaseModel):
+            out.append(i.__dict__)
+        elif defaults:
+            out.append({**defaults, **i})
+        else:
+            out.append(i)
+    return out
+
+
+def validate_many(model: Type[BaseModel], items: Sequence[Any]) -> List[BaseModel]:
+    return list_adapter(model).validate_python(_plain(items))
+
+
+def dump_many(model: Type[BaseModel], items: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Validated items as ``model_dump()``-shaped dicts."""
+    adapter, defaults = _wire(model)
+    if adapter is None:
+        adapter, defaults = list_adapter(model), {}
+        return adapter.dump_python(adapter.validate_python(_plain(items)))
+    return adapter.validate_python(_plain(items, defaults))
+
+
+def encode_many(model: Type[BaseModel], items: Sequence[Any], validate: bool = True) -> bytes:
+    """Validated items as a JSON array; ``validate=False`` only encodes trusted dicts/records."""
+    adapter, defaults = _wire(model)
+    if not validate:
+        return pydantic_core.to_json(_plain(items, defaults))
+    if adapter is None:
+        adapter, defaults = list_adapter(model), {}
+    return adapter.dump_json(adapter.validate_python(_plain(items, defaults)))
+
+
+MessageRecord = record_type(Message)
+SignalScoreRecord = record_type(SignalScore)
+SentimentIndexRecord = record_type(SentimentIndex)
+TrendStateRecord = record_type(TrendState)
+TradePlanRecord = record_type(TradePlan)
+ApprovedTradeRecord = record_type(ApprovedTrade)
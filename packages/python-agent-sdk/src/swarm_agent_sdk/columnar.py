@@ -0,0 +1,142 @@
+"""Columnar binary encoding for row-shaped tool payloads.
+
+Layout (all integers little-endian)::
+
+    b"SWC1" | u32 header length | header JSON | pad to 8 | column buffers
+
+The header lists ``nrows`` and one entry per column with ``name``,
+``dtype``, ``offset`` and ``length`` (bytes, relative to the first buffer).
+Numeric columns are raw NumPy dtypes (``<f8``, ``<i8``...), ``ts_ms`` is an
+``<i8`` epoch-millisecond timestamp and ``dict`` is a ``<u4`` code column whose
+distinct strings travel in the header's ``values``. Decoding wraps the
+received buffer with ``np.frombuffer`` and does not copy it.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+from dataclasses import dataclass, field
+import json
+import struct
+import numpy as np
+
+COLUMNAR_CONTENT_TYPE = "application/x-swarm-columnar"
+MAGIC = b"SWC1"
+
+
+@dataclass
+class DictColumn:
+    """Dictionary-encoded strings: ``values[codes[i]]`` is row ``i``."""
+    codes: np.ndarray
+    values: List[str]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self) -> np.ndarray:
+        return np.asarray(self.values, dtype=object)[self.codes]
+
+
+Column = Union[np.ndarray, DictColumn]
+
+
+@dataclass
+class ColumnBatch:
+    """Named columns of equal length decoded from a columnar (or JSON) payload."""
+    nrows: int
+    columns: Dict[str, Column] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return self.nrows
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "ColumnBatch":
+        """Build a batch from JSON row dicts (the fallback path).
+
+        Columns are the union of every row's fields, typed like the services'
+        encoder: numeric only if every present value is a number (missing ones
+        become NaN), ``ts`` as epoch ms only if every row has one.
+        """
+        batch = cls(len(rows))
+        present: Dict[str, List[Any]] = {}
+        for r in rows:
+            for name, value in r.items():
+                seen = present.setdefault(name, [])
+                if value is not None:
+                    seen.append(value)
+        for name, values in present.items():
+            if name == "ts" and len(values) == len(rows) and all(isinstance(v, str) for v in values):
+                batch.columns[name] = np.array([v.rstrip("Z") for v in values], dtype="datetime64[ms]").astype(np.int64)
+            elif all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                batch.columns[name] = np.fromiter((np.nan if r.get(name) is None else r[name] for r in rows), dtype=np.float64, count=len(rows))
+            else:
+                index: Dict[str, int] = {}
+                codes = np.fromiter((index.setdefault("" if r.get(name) is None else str(r[name]), len(index)) for r in rows), dtype=np.uint32, count=len(rows))
+                batch.columns[name] = DictColumn(codes, list(index))
+        return batch
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        from .frames import format_ts
+        cols: Dict[str, List[Any]] = {}
+        for name, col in self.columns.items():
+            if isinstance(col, DictColumn):
+                cols[name] = col.decode().tolist()
+            elif name == "ts" and col.dtype == np.int64:
+                cols[name] = format_ts(col).tolist()
+            else:
+                cols[name] = col.tolist()
+        names = list(cols)
+        return [dict(zip(names, vals)) for vals in zip(*cols.values())]
+
+
+def _pad(n: int) -> int:
+    return (8 - n % 8) % 8
+
+
+def encode_columnar(batch: ColumnBatch) -> bytes:
+    header_cols: List[Dict[str, Any]] = []
+    buffers: List[bytes] = []
+    offset = 0
+    for name, col in batch.columns.items():
+        if isinstance(col, DictColumn):
+            raw = np.ascontiguousarray(col.codes, dtype="<u4").tobytes()
+            meta: Dict[str, Any] = {"name": name, "dtype": "dict", "values": col.values}
+        else:
+            arr = np.ascontiguousarray(col)
+            raw = arr.astype(arr.dtype.newbyteorder("<"), copy=False).tobytes()
+            meta = {"name": name, "dtype": "ts_ms" if name == "ts" and arr.dtype == np.int64 else arr.dtype.newbyteorder("<").str}
+        meta.update(offset=offset, length=len(raw))
+        header_cols.append(meta)
+        buffers += [raw, b"\0" * _pad(len(raw))]
+        offset += len(raw) + _pad(len(raw))
+    header = json.dumps({"nrows": batch.nrows, "columns": header_cols}).encode()
+    prefix = MAGIC + struct.pack("<I", len(header)) + header
+    return b"".join([prefix, b"\0" * _pad(len(prefix))] + buffers)
+
+
+def decode_columnar(buf: Union[bytes, bytearray, memoryview]) -> ColumnBatch:
+    if bytes(buf[:4]) != MAGIC:
+        raise ValueError("not a columnar payload")
+    (hlen,) = struct.unpack_from("<I", buf, 4)
+    header = json.loads(bytes(buf[8:8 + hlen]))
+    base = 8 + hlen + _pad(8 + hlen)
+    batch = ColumnBatch(int(header["nrows"]))
+    for col in header["columns"]:
+        dtype = col["dtype"]
+        np_dtype = np.dtype("<u4" if dtype == "dict" else "<i8" if dtype == "ts_ms" else dtype)
+        arr = np.frombuffer(buf, dtype=np_dtype, count=col["length"] // np_dtype.itemsize, offset=base + col["offset"])
+        batch.columns[col["name"]] = DictColumn(arr, col["values"]) if dtype == "dict" else arr
+    return batch
+
+
+def decode_response(content_type: Optional[str], body: bytes, key: str = "rows") -> ColumnBatch:
+    """Decode a tool response as columns, whichever encoding the service chose."""
+    if content_type and content_type.startswith(COLUMNAR_CONTENT_TYPE):
+        return decode_columnar(body)
+    return ColumnBatch.from_rows(json.loads(body)[key])
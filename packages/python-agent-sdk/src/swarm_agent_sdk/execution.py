@@ -0,0 +1,102 @@
+"""Vectorized replay of the ``ExecutionAgent`` threshold strategy.
+
+Semantics (see ``services/agents/execution-agent``): walking the prices, a
+move above ``threshold`` since the previous bar buys one unit. Otherwise, a
+move below ``-threshold`` sells one unit, but only while the position is
+long. The P&L is the cash plus the final position marked at the last price.
+
+Since a sell needs a positive position, the position is a running sum of
++1/-1 signals floored at zero. ``simulate`` computes it for a whole grid of
+symbols and thresholds at once: ``cumsum`` minus its running minimum, with
+no per-bar Python loop. Cash is accumulated in time order with ``cumsum``,
+so P&L matches the agent's loop exactly.
+"""
+from typing import Any, Dict, List, Mapping, NamedTuple, Sequence
+from dataclasses import dataclass
+import numpy as np
+
+from .backtest import best_threshold
+
+BUY, SELL = 1, -1
+
+# cap on thresholds x bars held at once by one simulate chunk
+_CHUNK_ELEMENTS = 1 << 21
+
+
+class OrderArrays(NamedTuple):
+    """Orders of one run as parallel arrays: bar index, side (``BUY``/``SELL``) and price."""
+    bar_index: np.ndarray
+    side: np.ndarray
+    price: np.ndarray
+
+    def to_dicts(self, ts: Sequence[Any]) -> List[Dict[str, Any]]:
+        """``{"ts", "side", "price"}`` dicts like the agent's loop builds."""
+        return [{"ts": ts[i], "side": "BUY" if s == BUY else "SELL", "price": p}
+                for i, s, p in zip(self.bar_index.tolist(), self.side.tolist(), self.price.tolist())]
+
+
+@dataclass
+class SimResult:
+    """Per symbol and threshold, shape ``(S, K)`` (``(K,)`` for 1-D prices)."""
+    pnl: np.ndarray
+    position: np.ndarray
+    buys: np.ndarray
+    sells: np.ndarray
+
+    @property
+    def orders(self) -> np.ndarray:
+        return self.buys + self.sells
+
+
+def _signals(delta: np.ndarray, t: np.ndarray):
+    """Executed buy/sell masks and positions for bar moves ``delta`` (n,) and thresholds ``t`` (k, 1)."""
+    buy = delta > t
+    signal = ~buy & (delta < -t)
+    running = np.cumsum(buy.astype(np.int32) - signal, axis=1)
+    position = running - np.minimum(np.minimum.accumulate(running, axis=1), 0)
+    held = np.zeros_like(position)
+    held[:, 1:] = position[:, :-1]
+    return buy, signal & (held > 0), position
+
+
+def simulate(prices, thresholds) -> SimResult:
+    """Replay every threshold over every series of closes (``(n,)`` or ``(S, n)``)."""
+    x = np.asarray(prices, dtype=np.float64)
+    thr = np.asarray(thresholds, dtype=np.float64).ravel()
+    if x.ndim == 1:
+        res = simulate(x[None, :], thr)
+        return SimResult(res.pnl[0], res.position[0], res.buys[0], res.sells[0])
+    n_sym, n = x.shape
+    shape = (n_sym, len(thr))
+    out = SimResult(np.zeros(shape), np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64))
+    if n == 0 or len(thr) == 0:
+        return out
+    delta = np.diff(x, axis=1, prepend=x[:, :1])
+    chunk = max(1, _CHUNK_ELEMENTS // n)
+    for s in range(n_sym):
+        for lo in range(0, len(thr), chunk):
+            cols = slice(lo, lo + chunk)
+            buy, sell, position = _signals(delta[s], thr[cols, None])
+            # at most one order per bar, so a single time-ordered cumsum reproduces the cash updates
+            cash = np.cumsum(np.where(buy, -x[s], np.where(sell, x[s], 0.0)), axis=1)[:, -1]
+            final = position[:, -1]
+            out.pnl[s, cols] = cash + final * x[s, -1]
+            out.position[s, cols] = final
+            out.buys[s, cols] = buy.sum(axis=1)
+            out.sells[s, cols] = sell.sum(axis=1)
+    return out
+
+
+def simulate_orders(prices, threshold: float) -> OrderArrays:
+    """The orders one threshold places over a 1-D series of closes."""
+    x = np.asarray(prices, dtype=np.float64)
+    if not len(x):
+        return OrderArrays(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8), np.empty(0))
+    buy, sell, _ = _signals(np.diff(x, prepend=x[:1]), np.array([[threshold]], dtype=np.float64))
+    bar_index = np.flatnonzero(buy[0] | sell[0])
+    return OrderArrays(bar_index, np.where(buy[0, bar_index], BUY, SELL).astype(np.int8), x[bar_index])
+
+
+def tune_thresholds(series: Mapping[str, Sequence[float]], candidates) -> Dict[str, Dict[str, float]]:
+    """Best candidate per symbol (``{"threshold", "pnl"}``); series may differ in length."""
+    return {sym: best_threshold(simulate(closes, candidates).pnl, candidates) for sym, closes in series.items()}
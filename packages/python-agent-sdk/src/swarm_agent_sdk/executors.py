@@ -0,0 +1,106 @@
+"""Named executor pools for synchronous tools registered on ``MCPClient``.
+
+``register_tool(name, func, mode=...)`` chooses where a sync tool runs:
+
+- ``inline`` calls it on the event loop. Use this for cheap functions, which
+  then skip the thread hand-off.
+- ``thread`` runs it in a bounded thread pool (``"io"`` unless ``pool`` is
+  given). Use this for blocking I/O.
+- ``process`` runs it in a process pool (``"cpu"`` unless ``pool`` is
+  given). Use this for CPU-bound numeric work. The function and the payload
+  must be picklable, so the function must be defined at module level.
+
+Each pool has a queue limit. A call that arrives when ``max_workers +
+max_queue`` calls are already pending raises ``ToolQueueFull`` rather than
+waiting behind an unbounded backlog.
+"""
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import multiprocessing
+import os
+
+from .metrics import REGISTRY
+
+EXECUTION_MODES = ("inline", "thread", "process")
+DEFAULT_POOLS = {"thread": "io", "process": "cpu"}
+
+
+class ToolQueueFull(RuntimeError):
+    def __init__(self, pool: str, pending: int) -> None:
+        super().__init__(f"tool pool {pool!r} is full ({pending} calls pending)")
+        self.pool = pool
+        self.pending = pending
+
+
+class ToolPool:
+    """A lazily started thread or process pool with a bounded backlog."""
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: Optional[int] = None, max_queue: Optional[int] = None) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"unknown pool kind {kind!r}")
+        cpus = os.cpu_count() or 1
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers or (min(32, cpus + 4) if kind == "thread" else cpus)
+        self.max_queue = max_queue
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=f"tool-{self.name}")
+            else:
+                # spawn: forking a process that runs an event loop and holds sockets is unsafe
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def run(self, func: Callable[[Dict[str, Any]], Any], payload: Dict[str, Any]) -> Any:
+        if self.max_queue is not None and self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ToolQueueFull(self.name, self.pending)
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, payload)
+        finally:
+            self.pending -= 1
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+_POOLS: Dict[str, ToolPool] = {}
+
+
+def configure_tool_pool(name: str, kind: str = "thread", max_workers: Optional[int] = None, max_queue: Optional[int] = None) -> ToolPool:
+    """Create or resize the named pool; a running pool is replaced once its calls finish."""
+    old = _POOLS.get(name)
+    if old is not None:
+        old.shutdown()
+    pool = _POOLS[name] = ToolPool(name, kind, max_workers, max_queue)
+    return pool
+
+
+def get_tool_pool(name: str, kind: str = "thread") -> ToolPool:
+    pool = _POOLS.get(name)
+    if pool is None:
+        pool = _POOLS[name] = ToolPool(name, kind)
+    elif pool.kind != kind:
+        raise ValueError(f"tool pool {name!r} is a {pool.kind} pool, not {kind}")
+    return pool
+
+
+def shutdown_tool_pools() -> None:
+    for pool in list(_POOLS.values()):
+        pool.shutdown()
+
+
+REGISTRY.callback("mcp_tool_pool_pending", "Sync tool calls running or queued per pool", ("pool",),
+                  lambda: {(name,): p.pending for name, p in list(_POOLS.items())})
+REGISTRY.callback("mcp_tool_pool_rejected_total", "Sync tool calls refused because the pool queue was full", ("pool",),
+                  lambda: {(name,): p.rejected for name, p in list(_POOLS.items())}, "counter")
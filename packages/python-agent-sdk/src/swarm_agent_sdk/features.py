@@ -0,0 +1,298 @@
+"""Write-coalescing client for ``feature-store.write_features``.
+
+Rows are buffered per ``feature_set`` across ticks, and across agents when
+they share ``get_feature_writer``. A row replaces any buffered row with the
+same (ts, symbol, feature_name, ver). Buffers are flushed once ``max_rows``
+are waiting or the oldest row has waited ``linger`` seconds. Batches go to
+``feature-store.write_features_columnar`` as dictionary-encoded columns, so
+every distinct string is sent once per batch.
+
+Delivery is at least once. A failed batch is retried with backoff and then
+kept for the next flush. With a ``spool_path``, buffered rows are also
+appended to a JSONL file, which is rewritten after each flush and replayed
+on start, so a crash does not lose them. Each spool file belongs to one
+process: the writer holds an exclusive lock on ``<spool>.lock``, and a second
+process pointed at the same file falls back to ``<spool>.<pid>``. The owner
+of ``<spool>`` adopts every ``<spool>.<pid>`` whose lock is free when it
+starts: their rows are replayed into its own spool and the files removed.
+``runtime.run_agents`` gives worker ``i`` its own ``FEATURE_SPOOL_PATH``.
+"""
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple
+from dataclasses import asdict, dataclass
+import asyncio
+import glob
+import json
+import os
+import time
+try:
+    import fcntl
+except ImportError:  # not on Windows: spool files are not locked there
+    fcntl = None  # type: ignore[assignment]
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential_jitter
+
+from .client import HttpMCPClient, MCPClient, tool_unsupported
+from .resilience import clear_deadline
+
+FeatureKey = Tuple[str, str, str, str]  # (ts, symbol, feature_name, ver)
+_DICT_FIELDS = ("ts", "symbol", "feature_name", "ver")
+
+
+@dataclass
+class FeatureWriterStats:
+    rows_in: int = 0
+    duplicates: int = 0
+    rows_written: int = 0
+    batches: int = 0
+    retries: int = 0
+    failures: int = 0
+    replayed: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def _key(row: Dict[str, Any]) -> FeatureKey:
+    return (row["ts"], row["symbol"], row["feature_name"], row.get("ver", "v1"))
+
+
+def _lock_spool(path: str) -> Optional[TextIO]:
+    """Hold an exclusive lock on ``<path>.lock``; ``None`` if another process holds it."""
+    f = open(f"{path}.lock", "a")
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return None
+    return f
+
+
+def encode_feature_columns(feature_set: str, rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """``write_features_columnar`` input: string fields as ``{"values", "codes"}``, values as a list."""
+    columns: Dict[str, Any] = {}
+    for name in _DICT_FIELDS:
+        index: Dict[str, int] = {}
+        codes = [index.setdefault(str(r.get(name, "v1" if name == "ver" else "")), len(index)) for r in rows]
+        columns[name] = {"values": list(index), "codes": codes}
+    columns["value"] = [float(r["value"]) for r in rows]
+    if any(r.get("source") is not None for r in rows):
+        index = {}
+        codes = [index.setdefault(r.get("source") or "", len(index)) for r in rows]
+        columns["source"] = {"values": list(index), "codes": codes}
+    return {"feature_set": feature_set, "nrows": len(rows), "columns": columns}
+
+
+class FeatureWriter:
+    """Buffered, deduplicating, batched feature writes for one feature-store client."""
+
+    def __init__(
+        self,
+        client: MCPClient,
+        max_rows: int = 5000,
+        linger: float = 1.0,
+        spool_path: Optional[str] = None,
+        max_attempts: int = 5,
+        backoff: float = 0.2,
+    ) -> None:
+        self.client = client
+        self.max_rows = max_rows
+        self.linger = linger
+        self.spool_path = spool_path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.stats = FeatureWriterStats()
+        self._buffers: Dict[str, Dict[FeatureKey, Dict[str, Any]]] = {}
+        self._oldest: Optional[float] = None
+        self._columnar_supported = True
+        self._spool: Optional[TextIO] = None
+        self._spool_lock: Optional[TextIO] = None
+        self._opened = False
+        self._full: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def pending(self) -> int:
+        return sum(len(b) for b in self._buffers.values())
+
+    async def write(self, feature_set: str, rows: Sequence[Dict[str, Any]]) -> int:
+        """Queue rows for writing; returns how many were accepted."""
+        self._open()
+        if not rows:
+            return 0
+        self._add(feature_set, rows)
+        if self._spool is not None:
+            self._spool.write(json.dumps({"feature_set": feature_set, "rows": list(rows)}) + "\n")
+            self._spool.flush()
+        assert self._full is not None
+        if self.pending >= self.max_rows:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._drain())
+        return len(rows)
+
+    async def flush(self) -> int:
+        """Write everything buffered now; returns the rows written."""
+        self._open()
+        assert self._lock is not None and self._full is not None
+        async with self._lock:
+            buffers, self._buffers = self._buffers, {}
+            self._oldest = None
+            self._full.clear()
+            written = 0
+            for feature_set, rows in buffers.items():
+                try:
+                    await self._send(feature_set, list(rows.values()))
+                    written += len(rows)
+                except Exception as err:
+                    self.stats.failures += 1
+                    print({"feature_writer": "flush_failed", "feature_set": feature_set, "rows": len(rows), "error": repr(err)})
+                    # keep them for the next flush, behind anything newer for the same key
+                    pending = self._buffers.setdefault(feature_set, {})
+                    for key, row in rows.items():
+                        pending.setdefault(key, row)
+                    self._oldest = self._oldest or time.monotonic()
+            self._rewrite_spool()
+            return written
+
+    async def aclose(self) -> None:
+        await self.flush()
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        if self._spool_lock is not None:
+            self._spool_lock.close()  # releases the lock
+            self._spool_lock = None
+
+    def _open(self) -> None:
+        if self._opened:
+            return
+        self._opened = True
+        self._full = asyncio.Event()
+        self._lock = asyncio.Lock()
+        if not self.spool_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.spool_path)), exist_ok=True)
+        self._spool_lock = _lock_spool(self.spool_path)
+        adopted: List[Tuple[str, TextIO]] = []
+        if self._spool_lock is None:
+            # another live process owns this spool: replaying or rewriting it would duplicate or lose its rows
+            fallback = f"{self.spool_path}.{os.getpid()}"
+            print({"feature_writer": "spool_in_use", "spool_path": self.spool_path, "using": fallback})
+            self.spool_path = fallback
+            self._spool_lock = _lock_spool(fallback)
+        elif fcntl is not None:
+            # fallback spools of processes that are gone; a live one still holds its lock
+            for orphan in glob.glob(f"{glob.escape(self.spool_path)}.*"):
+                if orphan.rsplit(".", 1)[1].isdigit():
+                    lock = _lock_spool(orphan)
+                    if lock is not None:
+                        adopted.append((orphan, lock))
+        self._replay(self.spool_path)
+        for orphan, _ in adopted:
+            self._replay(orphan)
+            print({"feature_writer": "spool_adopted", "spool_path": self.spool_path, "from": orphan})
+        self._rewrite_spool()
+        # only now that their rows are in our spool
+        for orphan, lock in adopted:
+            for path in (orphan, f"{orphan}.lock"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            lock.close()
+        if self._buffers:
+            self._task = asyncio.ensure_future(self._drain())
+
+    def _replay(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash mid-append
+                self._add(entry["feature_set"], entry["rows"])
+                self.stats.replayed += len(entry["rows"])
+
+    def _add(self, feature_set: str, rows: Sequence[Dict[str, Any]]) -> None:
+        for row in rows:
+            buf = self._buffers.setdefault(row.get("feature_set", feature_set), {})
+            key = _key(row)
+            if key in buf:
+                self.stats.duplicates += 1
+            buf[key] = row
+        self.stats.rows_in += len(rows)
+        self._oldest = self._oldest or time.monotonic()
+
+    def _rewrite_spool(self) -> None:
+        """Replace the spool with exactly the rows still buffered."""
+        if not self.spool_path:
+            return
+        if self._spool is not None:
+            self._spool.close()
+        tmp = f"{self.spool_path}.tmp"
+        with open(tmp, "w") as f:
+            for feature_set, rows in self._buffers.items():
+                f.write(json.dumps({"feature_set": feature_set, "rows": list(rows.values())}) + "\n")
+        os.replace(tmp, self.spool_path)
+        self._spool = open(self.spool_path, "a")
+
+    async def _drain(self) -> None:
+        assert self._full is not None
+        clear_deadline()  # it outlives the tick that started it
+        while self._buffers:
+            wait = (self._oldest or time.monotonic()) + self.linger - time.monotonic()
+            if wait > 0 and not self._full.is_set():
+                try:
+                    await asyncio.wait_for(self._full.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            await self.flush()
+
+    async def _send(self, feature_set: str, rows: List[Dict[str, Any]]) -> None:
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_exponential_jitter(initial=self.backoff, max=10.0),
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    self.stats.retries += 1
+                await self._write_batch(feature_set, rows)
+        self.stats.batches += 1
+        self.stats.rows_written += len(rows)
+
+    async def _write_batch(self, feature_set: str, rows: List[Dict[str, Any]]) -> None:
+        if self._columnar_supported:
+            try:
+                await self.client.call("feature-store.write_features_columnar", encode_feature_columns(feature_set, rows))
+                return
+            except Exception as err:
+                if not tool_unsupported(err):
+                    raise
+                self._columnar_supported = False
+        await self.client.call("feature-store.write_features", {"feature_set": feature_set, "rows": rows})
+
+
+_WRITERS: Dict[str, FeatureWriter] = {}
+
+
+def get_feature_writer(host_base: str, spool_path: Optional[str] = None) -> FeatureWriter:
+    """Process-wide writer per host, so sibling agents coalesce their writes.
+
+    Defaults come from ``FEATURE_SPOOL_PATH``, ``FEATURE_FLUSH_ROWS`` and
+    ``FEATURE_FLUSH_SECONDS``.
+    """
+    writer = _WRITERS.get(host_base)
+    if writer is None:
+        writer = FeatureWriter(
+            HttpMCPClient(host_base, "feature-store"),
+            max_rows=int(os.environ.get("FEATURE_FLUSH_ROWS", 5000)),
+            linger=float(os.environ.get("FEATURE_FLUSH_SECONDS", 1.0)),
+            spool_path=spool_path or os.environ.get("FEATURE_SPOOL_PATH"),
+        )
+        _WRITERS[host_base] = writer
+    return writer
@@ -0,0 +1,93 @@
+"""Columnar OHLCV container shared by the cache and decoders."""
+from typing import Any, Dict, List, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import numpy as np
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+INTERVAL_MS = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "1h": 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_ts(value: str) -> int:
+    """ISO date or timestamp (UTC when no offset is given) to epoch milliseconds."""
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // timedelta(milliseconds=1)
+
+
+def format_ts(ms) -> Any:
+    """Epoch milliseconds (scalar or array) to ``YYYY-MM-DDTHH:MM:SS.sssZ`` strings."""
+    out = np.char.add(np.datetime_as_string(np.asarray(ms, dtype="datetime64[ms]"), unit="ms"), "Z")
+    return str(out) if out.ndim == 0 else out
+
+
+@dataclass
+class OhlcvFrame:
+    """OHLCV bars as parallel arrays; ``ts`` is int64 epoch ms, sorted ascending."""
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "OhlcvFrame":
+        return cls(np.empty(0, dtype=np.int64), *(np.empty(0) for _ in OHLCV_FIELDS))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "OhlcvFrame":
+        if not rows:
+            return cls.empty()
+        ts = np.array([r["ts"].rstrip("Z") for r in rows], dtype="datetime64[ms]").astype(np.int64)
+        cols = [np.fromiter((r[f] for r in rows), dtype=np.float64, count=len(rows)) for f in OHLCV_FIELDS]
+        return cls(ts, *cols)
+
+    @classmethod
+    def from_columns(cls, batch: Any) -> "OhlcvFrame":
+        """From a ``ColumnBatch`` whose ``ts`` is epoch ms; arrays are used as-is."""
+        if not len(batch):
+            return cls.empty()
+        return cls(np.asarray(batch["ts"], dtype=np.int64), *(np.asarray(batch[f], dtype=np.float64) for f in OHLCV_FIELDS))
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        cols = [c.tolist() for c in self.columns()[1:]]
+        return [
+            {"ts": ts, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for ts, o, h, lo, c, v in zip(format_ts(self.ts).tolist(), *cols)
+        ]
+
+    def columns(self) -> List[np.ndarray]:
+        return [self.ts, self.open, self.high, self.low, self.close, self.volume]
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self.columns())
+
+    def between(self, start_ms: int, end_ms: int) -> "OhlcvFrame":
+        """Bars with ``start_ms <= ts <= end_ms``."""
+        lo = np.searchsorted(self.ts, start_ms, side="left")
+        hi = np.searchsorted(self.ts, end_ms, side="right")
+        return OhlcvFrame(*(c[lo:hi] for c in self.columns()))
+
+    def merge(self, other: "OhlcvFrame") -> "OhlcvFrame":
+        """Union by timestamp; bars already in ``self`` win over ``other``."""
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+        ts = np.concatenate((self.ts, other.ts))
+        _, first = np.unique(ts, return_index=True)  # first occurrence -> self wins
+        cols = [np.concatenate((a, b))[first] for a, b in zip(self.columns(), other.columns())]
+        return OhlcvFrame(*cols)
@@ -0,0 +1,148 @@
+"""Vectorized technical indicators over a symbols x time close matrix.
+
+Every function accepts a 1-D series or a 2-D ``(symbols, time)`` array and
+returns the full indicator series with the same shape, so column ``t`` holds
+the value the scalar agent helpers would compute from ``closes[:t + 1]``.
+``rsi``, ``sma``, ``momentum`` and ``regime`` keep the agents' original
+warm-up rules and summation order, so their output is bit-for-bit identical.
+"""
+from typing import Tuple
+import numpy as np
+
+REGIME_NEUTRAL, REGIME_UP, REGIME_DOWN, REGIME_SIDEWAYS = 0, 1, 2, 3
+REGIME_LABELS = ("neutral", "UP", "DOWN", "SIDEWAYS")
+
+
+def as_matrix(closes) -> np.ndarray:
+    """Coerce closes to a float64 ``(symbols, time)`` array."""
+    x = np.asarray(closes, dtype=np.float64)
+    if x.ndim == 1:
+        return x[None, :]
+    if x.ndim != 2:
+        raise ValueError("closes must be 1-D or 2-D (symbols x time)")
+    return x
+
+
+def _like(closes, out: np.ndarray) -> np.ndarray:
+    return out[0] if np.ndim(closes) == 1 else out
+
+
+def _window_sum(x: np.ndarray, period: int) -> np.ndarray:
+    """Sum of ``x[:, t - period + 1 : t + 1]`` for ``t >= period - 1``, oldest first."""
+    n = x.shape[1] - period + 1
+    acc = np.zeros((x.shape[0], max(n, 0)))
+    for k in range(period):
+        acc += x[:, k:k + n]
+    return acc
+
+
+def sma(closes, period: int) -> np.ndarray:
+    """Simple moving average; before ``period`` bars, the mean of all bars so far."""
+    x = as_matrix(closes)
+    out = np.empty_like(x)
+    head = min(period - 1, x.shape[1])
+    out[:, :head] = np.cumsum(x[:, :head], axis=1) / np.arange(1, head + 1)
+    if x.shape[1] >= period:
+        out[:, period - 1:] = _window_sum(x, period) / period
+    return _like(closes, out)
+
+
+def ema(closes, period: int) -> np.ndarray:
+    """Exponential moving average with ``alpha = 2 / (period + 1)``, seeded at the first bar."""
+    x = as_matrix(closes)
+    out = np.empty_like(x)
+    if x.shape[1] == 0:
+        return _like(closes, out)
+    alpha = 2.0 / (period + 1)
+    out[:, 0] = x[:, 0]
+    for t in range(1, x.shape[1]):
+        out[:, t] = alpha * x[:, t] + (1 - alpha) * out[:, t - 1]
+    return _like(closes, out)
+
+
+def _gains_losses(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    delta = np.diff(x, axis=1)
+    return np.maximum(delta, 0.0), np.maximum(-delta, 0.0)
+
+
+def rsi(closes, period: int = 5) -> np.ndarray:
+    """RSI over simple-average gains/losses of the last ``period`` deltas; 50 during warm-up."""
+    x = as_matrix(closes)
+    out = np.full_like(x, 50.0)
+    n = x.shape[1] - period
+    if n <= 0:
+        return _like(closes, out)
+    gains, losses = _gains_losses(x)
+    gsum = np.zeros((x.shape[0], n))
+    lsum = np.zeros((x.shape[0], n))
+    # newest delta first, matching the scalar helper's accumulation order
+    for k in range(period - 1, -1, -1):
+        gsum += gains[:, k:k + n]
+        lsum += losses[:, k:k + n]
+    avg_gain = gsum / period
+    avg_loss = np.where(lsum > 0, lsum / period, 1e-9)
+    out[:, period:] = 100 - (100 / (1 + avg_gain / avg_loss))
+    return _like(closes, out)
+
+
+def rsi_wilder(closes, period: int = 14) -> np.ndarray:
+    """RSI with Wilder smoothing, seeded by the simple mean of the first ``period`` deltas."""
+    x = as_matrix(closes)
+    out = np.full_like(x, 50.0)
+    if x.shape[1] <= period:
+        return _like(closes, out)
+    gains, losses = _gains_losses(x)
+    avg_gain = gains[:, :period].mean(axis=1)
+    avg_loss = losses[:, :period].mean(axis=1)
+    for t in range(period, x.shape[1]):
+        if t > period:
+            avg_gain = (avg_gain * (period - 1) + gains[:, t - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[:, t - 1]) / period
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / avg_loss
+            out[:, t] = np.where(avg_loss > 0, 100 - 100 / (1 + rs), np.where(avg_gain > 0, 100.0, 50.0))
+    return _like(closes, out)
+
+
+def macd(closes, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(macd, signal, histogram)`` series."""
+    line = ema(closes, fast) - ema(closes, slow)
+    sig = ema(line, signal)
+    return line, sig, line - sig
+
+
+def momentum(closes, lookback: int = 3) -> np.ndarray:
+    """``close[t] - close[t - lookback]``; 0 until ``lookback`` bars of history exist."""
+    x = as_matrix(closes)
+    out = np.zeros_like(x)
+    if lookback < x.shape[1]:
+        out[:, lookback:] = x[:, lookback:] - x[:, :x.shape[1] - lookback]
+    return _like(closes, out)
+
+
+def slope(closes, fast: int = 5, slow: int = 10) -> np.ndarray:
+    """Spread between fast and slow SMAs, as used by the signal agent."""
+    return sma(closes, fast) - sma(closes, slow)
+
+
+def regime(closes, window: int = 5) -> np.ndarray:
+    """Regime codes from the up/down count of the last ``window - 1`` deltas.
+
+    Codes index ``REGIME_LABELS``: UP when ups exceed downs by 2 or more,
+    DOWN for the reverse, SIDEWAYS otherwise and neutral during warm-up.
+    """
+    x = as_matrix(closes)
+    out = np.full(x.shape, REGIME_NEUTRAL, dtype=np.int8)
+    n = x.shape[1] - window
+    if n <= 0:
+        return _like(closes, out)
+    sign = np.sign(np.diff(x, axis=1)).astype(np.int16)
+    score = _window_sum(sign, window - 1)[:, 1:] if window > 1 else np.zeros((x.shape[0], n))
+    codes = np.where(score >= 2, REGIME_UP, np.where(score <= -2, REGIME_DOWN, REGIME_SIDEWAYS))
+    out[:, window:] = codes[:, -n:]
+    return _like(closes, out)
+
+
+def regime_labels(codes) -> np.ndarray:
+    """Map regime codes to their string labels."""
+    return np.asarray(REGIME_LABELS, dtype=object)[np.asarray(codes)]
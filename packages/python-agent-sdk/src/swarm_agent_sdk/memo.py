@@ -0,0 +1,245 @@
+"""Client-side memoization of idempotent tool calls.
+
+``MemoClient`` wraps a client and caches the tools it has a ``MemoPolicy``
+for, keyed by tool and payload:
+
+- A value is fresh for ``ttl`` seconds. For ``stale_ttl`` seconds after
+  that it is still returned, while a refresh runs in the background.
+- Concurrent calls for the same key share one in-flight request
+  (single-flight), whether it is a miss or a refresh.
+- Entries are evicted least recently used first, once there are more than
+  ``max_entries`` of them or their encoded size passes ``max_bytes``.
+- Each policy names invalidation topics. ``invalidate(topic)`` drops the
+  entries that listen to it. Calls to the mutating tools in ``MUTATIONS``
+  (e.g. ``config.set``) made through the same client invalidate their topics
+  on success. A request already in flight does not store its value if one of
+  its topics (or its tool) was invalidated meanwhile; other topics are not
+  affected.
+
+Failures are not cached. A failed background refresh keeps serving the
+stale value until ``stale_ttl`` runs out. Cached values are shared between
+callers, so treat them as read-only.
+"""
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+import asyncio
+import json
+import time
+import pydantic_core
+
+from .client import HttpMCPClient, MCPClient
+from .metrics import REGISTRY
+
+MEMO_CALLS = REGISTRY.counter("mcp_memo_calls_total", "Memoized tool calls by outcome: hit, stale, miss, coalesced", ("tool", "outcome"))
+
+
+@dataclass(frozen=True)
+class MemoPolicy:
+    ttl: float
+    stale_ttl: float = 0.0
+    topics: Tuple[str, ...] = ()
+
+
+DEFAULT_POLICIES: Dict[str, MemoPolicy] = {
+    "config.get": MemoPolicy(ttl=30.0, stale_ttl=300.0, topics=("config",)),
+    "broker-gateway.get_positions": MemoPolicy(ttl=1.0, topics=("positions",)),
+    "broker-gateway.get_fills": MemoPolicy(ttl=1.0, topics=("fills",)),
+}
+
+MUTATIONS: Dict[str, Tuple[str, ...]] = {
+    "config.set": ("config",),
+    "broker-gateway.submit_order": ("positions", "fills"),
+}
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0  # calls that joined a request already in flight
+    refreshes: int = 0
+    refresh_failures: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+    bytes_resident: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+    nbytes: int
+    policy: MemoPolicy
+
+
+Key = Tuple[str, str]
+
+
+def memo_key(tool_name: str, payload: Dict[str, Any]) -> Key:
+    return tool_name, json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class MemoClient(MCPClient):
+    """Drop-in wrapper that memoizes the tools in ``policies``; other tools pass through."""
+
+    def __init__(
+        self,
+        client: MCPClient,
+        policies: Optional[Dict[str, MemoPolicy]] = None,
+        max_entries: int = 10_000,
+        max_bytes: int = 16 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self._client = client
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.stats = MemoStats()
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        self._inflight: Dict[Key, "asyncio.Task[Any]"] = {}
+        # bumped by invalidation so requests already in flight do not store
+        self._epoch = 0  # clear()
+        self._topic_epochs: Dict[str, int] = {}
+        self._tool_epochs: Dict[str, int] = {}
+
+    async def call(self, tool_name: str, payload: Dict[str, Any]) -> Any:
+        policy = self.policies.get(tool_name)
+        if policy is None:
+            value = await self._client.call(tool_name, payload)
+            topics = MUTATIONS.get(tool_name)
+            if topics:
+                self.invalidate(*topics)
+            return value
+        key = memo_key(tool_name, payload)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self.clock() - entry.stored_at
+            if age < policy.ttl:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                MEMO_CALLS.inc(tool_name, "hit")
+                return entry.value
+            if age < policy.ttl + policy.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stats.stale_hits += 1
+                MEMO_CALLS.inc(tool_name, "stale")
+                if key not in self._inflight:
+                    self.stats.refreshes += 1
+                    self._flight(key, tool_name, payload, policy).add_done_callback(self._refresh_done)
+                return entry.value
+        if key in self._inflight:
+            self.stats.coalesced += 1
+            MEMO_CALLS.inc(tool_name, "coalesced")
+        else:
+            self.stats.misses += 1
+            MEMO_CALLS.inc(tool_name, "miss")
+        # shield: a caller giving up must not cancel the request other callers wait on
+        return await asyncio.shield(self._flight(key, tool_name, payload, policy))
+
+    def invalidate(self, *topics: str) -> int:
+        """Drop entries listening to any of ``topics``; returns how many were dropped."""
+        wanted = set(topics)
+        for topic in wanted:
+            self._topic_epochs[topic] = self._topic_epochs.get(topic, 0) + 1
+        self._detach(k for k in self._inflight if wanted.intersection(self.policies[k[0]].topics))
+        return self._drop(k for k, e in self._entries.items() if wanted.intersection(e.policy.topics))
+
+    def invalidate_tool(self, tool_name: str, payload: Optional[Dict[str, Any]] = None) -> int:
+        """Drop every entry for ``tool_name``, or only the one for ``payload``."""
+        self._tool_epochs[tool_name] = self._tool_epochs.get(tool_name, 0) + 1
+        if payload is not None:
+            self._detach([memo_key(tool_name, payload)])
+            return self._drop([memo_key(tool_name, payload)])
+        self._detach(k for k in self._inflight if k[0] == tool_name)
+        return self._drop(k for k in self._entries if k[0] == tool_name)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._detach(self._inflight)
+        self._drop(list(self._entries))
+
+    def _detach(self, keys: Iterable[Key]) -> None:
+        """Stop new callers joining these in-flight requests; they fetch afresh instead."""
+        for key in list(keys):
+            self._inflight.pop(key, None)
+
+    def _drop(self, keys: Iterable[Key]) -> int:
+        n = 0
+        for key in list(keys):
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.stats.bytes_resident -= entry.nbytes
+                n += 1
+        self.stats.invalidations += n
+        return n
+
+    def _flight(self, key: Key, tool_name: str, payload: Dict[str, Any], policy: MemoPolicy) -> "asyncio.Task[Any]":
+        task = self._inflight.get(key)
+        if task is None:
+            # the generation is taken now, not when the task first runs, so an
+            # invalidation in between still discards the result
+            generation = self._generation(tool_name, policy)
+            task = self._inflight[key] = asyncio.ensure_future(self._fetch(key, tool_name, payload, policy, generation))
+            task.add_done_callback(_retrieve)  # every waiter may have been cancelled
+        return task
+
+    def _generation(self, tool_name: str, policy: MemoPolicy) -> Tuple[int, ...]:
+        """Epochs a fetch must see unchanged to store its value."""
+        topics = tuple(self._topic_epochs.get(t, 0) for t in policy.topics)
+        return (self._epoch, self._tool_epochs.get(tool_name, 0)) + topics
+
+    async def _fetch(self, key: Key, tool_name: str, payload: Dict[str, Any], policy: MemoPolicy, generation: Tuple[int, ...]) -> Any:
+        try:
+            value = await self._client.call(tool_name, payload)
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+        if generation == self._generation(tool_name, policy):
+            self._store(key, value, policy)
+        return value
+
+    def _store(self, key: Key, value: Any, policy: MemoPolicy) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.stats.bytes_resident -= old.nbytes
+        nbytes = len(pydantic_core.to_json(value, fallback=str))
+        self._entries[key] = _Entry(value, self.clock(), nbytes, policy)
+        self.stats.bytes_resident += nbytes
+        while self._entries and (len(self._entries) > self.max_entries or self.stats.bytes_resident > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.stats.bytes_resident -= evicted.nbytes
+            self.stats.evictions += 1
+
+    def _refresh_done(self, task: "asyncio.Task[Any]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.refresh_failures += 1
+            print({"memo": "refresh_failed", "error": repr(task.exception())})
+
+
+def _retrieve(task: "asyncio.Task[Any]") -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+_MEMOS: Dict[Tuple[str, str, FrozenSet[Tuple[str, MemoPolicy]]], MemoClient] = {}
+
+
+def get_memo_client(host_base: str, service: str, policies: Optional[Dict[str, MemoPolicy]] = None) -> MemoClient:
+    """Process-wide memoizing client per host, service and policies, so sibling agents share entries and flights.
+
+    Callers asking for different policies get separate clients rather than
+    silently sharing the first caller's.
+    """
+    resolved = DEFAULT_POLICIES if policies is None else policies
+    key = (host_base, service, frozenset(resolved.items()))
+    memo = _MEMOS.get(key)
+    if memo is None:
+        memo = _MEMOS[key] = MemoClient(HttpMCPClient(host_base, service), resolved)
+    return memo
@@ -0,0 +1,312 @@
+"""Prometheus metrics and trace context for agent processes.
+
+``MCPClient`` and ``HttpMCPClient`` record every call in
+``mcp_client_call_seconds`` (by service, tool and outcome), request and
+response sizes, and errors by kind. ``BaseAgent`` records tick durations and
+exposes its scheduler's counters at scrape time. Recording a sample is a
+dict lookup and a bisect, cheap enough to leave on in production.
+``start_metrics_server`` serves the Prometheus text format on ``/metrics``;
+agents start it themselves when ``METRICS_PORT`` is set.
+
+Each tick runs in its own trace. Calls made during a tick send a W3C
+``traceparent`` header with a fresh span id and send the trace id as
+``x-correlation-id``, which the host passes on to services.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import asyncio
+import os
+import random
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def series(self) -> Dict[Labels, float]:
+        return dict(self._values)
+
+    def samples(self) -> Iterator[str]:
+        for values, v in list(self._values.items()):
+            yield f"{self.name}{_labels(self.labels, values)} {_num(v)}"
+
+
+class Histogram:
+    """Fixed-bucket histogram; a label set's row is per-bucket counts (last = +Inf) then the sum."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._rows: Dict[Labels, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        row = self._rows.get(labels)
+        if row is None:
+            row = self._rows[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def count(self, *labels: str) -> int:
+        row = self._rows.get(labels)
+        return int(sum(row[:-1])) if row else 0
+
+    def series(self) -> Dict[Labels, int]:
+        """Observation count per label set."""
+        return {labels: int(sum(row[:-1])) for labels, row in list(self._rows.items())}
+
+    def samples(self) -> Iterator[str]:
+        bounds = self.buckets + (float("inf"),)
+        for values, row in list(self._rows.items()):
+            total: float = 0
+            for bound, n in zip(bounds, row):
+                total += n
+                le = 'le="%s"' % _num(bound)
+                yield f"{self.name}_bucket{_labels(self.labels, values, le)} {total}"
+            yield f"{self.name}_sum{_labels(self.labels, values)} {_num(row[-1])}"
+            yield f"{self.name}_count{_labels(self.labels, values)} {total}"
+
+
+class CallbackMetric:
+    """Counter or gauge whose values are read from ``fn`` at scrape time."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], fn: Callable[[], Dict[Labels, float]], kind: str = "gauge") -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.fn = fn
+        self.kind = kind
+
+    def samples(self) -> Iterator[str]:
+        for values, v in self.fn().items():
+            yield f"{self.name}{_labels(self.labels, values)} {_num(v)}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+
+    def _add(self, metric: Any) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labels != metric.labels:
+                raise ValueError(f"metric {metric.name!r} already registered with a different type or labels")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def callback(self, name: str, help: str, labels: Sequence[str], fn: Callable[[], Dict[Labels, float]], kind: str = "gauge") -> CallbackMetric:
+        return self._add(CallbackMetric(name, help, labels, fn, kind))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for m in list(self._metrics.values()):
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+CALL_SECONDS = REGISTRY.histogram("mcp_client_call_seconds", "MCP tool call latency", ("service", "tool", "outcome"))
+REQUEST_BYTES = REGISTRY.histogram("mcp_client_request_bytes", "MCP tool call request body size", ("service", "tool"), SIZE_BUCKETS)
+RESPONSE_BYTES = REGISTRY.histogram("mcp_client_response_bytes", "MCP tool call response body size", ("service", "tool"), SIZE_BUCKETS)
+CALL_ERRORS = REGISTRY.counter("mcp_client_errors_total", "Failed MCP tool calls by error kind", ("service", "tool", "kind"))
+TICK_SECONDS = REGISTRY.histogram("agent_tick_seconds", "Agent tick duration", ("agent",))
+
+
+def error_kind(err: BaseException) -> str:
+    """HTTP status code for status errors, otherwise the exception class name."""
+    response = getattr(err, "response", None)
+    status = getattr(response, "status_code", None)
+    return str(status) if status is not None else type(err).__name__
+
+
+def record_call(service: str, tool: str, seconds: float, sent: int = 0, received: int = 0, error: Optional[BaseException] = None) -> None:
+    if error is not None:
+        CALL_SECONDS.observe(seconds, service, tool, "error")
+        CALL_ERRORS.inc(service, tool, error_kind(error))
+        return
+    CALL_SECONDS.observe(seconds, service, tool, "ok")
+    if sent:
+        REQUEST_BYTES.observe(sent, service, tool)
+    if received:
+        RESPONSE_BYTES.observe(received, service, tool)
+
+
+_SCHEDULERS: Dict[str, Any] = {}
+
+
+def track_scheduler(agent: str, scheduler: Any) -> None:
+    """Expose ``scheduler.stats`` as ``agent_*`` metrics and time its ticks."""
+    _SCHEDULERS[agent] = scheduler
+    scheduler.on_tick = lambda seconds: TICK_SECONDS.observe(seconds, agent)
+
+
+def _scheduler_stat(field: str) -> Callable[[], Dict[Labels, float]]:
+    return lambda: {(name,): getattr(s.stats, field) for name, s in list(_SCHEDULERS.items())}
+
+
+REGISTRY.callback("agent_ticks_total", "Ticks run", ("agent",), _scheduler_stat("ticks"), "counter")
+REGISTRY.callback("agent_tick_overruns_total", "Ticks that ran past the next deadline", ("agent",), _scheduler_stat("overruns"), "counter")
+REGISTRY.callback("agent_ticks_skipped_total", "Deadlines dropped after overruns", ("agent",), _scheduler_stat("skipped"), "counter")
+REGISTRY.callback("agent_tick_timeouts_total", "Ticks cancelled by tick_timeout_seconds", ("agent",), _scheduler_stat("timeouts"), "counter")
+REGISTRY.callback("agent_tick_failures_total", "Ticks that raised", ("agent",), _scheduler_stat("failures"), "counter")
+REGISTRY.callback("agent_tick_max_lag_seconds", "Worst tick start lag behind its deadline", ("agent",), _scheduler_stat("max_lag"))
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str  # 32 hex digits
+    span_id: str  # 16 hex digits
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def child(self) -> "SpanContext":
+        return SpanContext(self.trace_id, _span_id())
+
+
+_CURRENT: ContextVar[Optional[SpanContext]] = ContextVar("swarm_span", default=None)
+
+
+def _span_id() -> str:
+    return "%016x" % random.getrandbits(64)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    parts = (header or "").strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return SpanContext(parts[1].lower(), parts[2].lower())
+
+
+def current_span() -> Optional[SpanContext]:
+    return _CURRENT.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _CURRENT.get()
+    return span.trace_id if span is not None else None
+
+
+@contextmanager
+def start_span(parent: Optional[SpanContext] = None) -> Iterator[SpanContext]:
+    """Make a new span current: a child of ``parent`` or the current span, else a new trace."""
+    parent = parent or _CURRENT.get()
+    span = parent.child() if parent is not None else SpanContext("%032x" % random.getrandbits(128), _span_id())
+    token = _CURRENT.set(span)
+    try:
+        yield span
+    finally:
+        _CURRENT.reset(token)
+
+
+def trace_headers() -> Dict[str, str]:
+    """Headers for an outgoing call from the current span; empty outside any span."""
+    span = _CURRENT.get()
+    if span is None:
+        return {}
+    return {"traceparent": span.child().traceparent, "x-correlation-id": span.trace_id}
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, registry: MetricsRegistry) -> None:
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+        request = head.split(b"\r\n", 1)[0].split()
+        if len(request) >= 2 and request[0] == b"GET" and request[1].split(b"?")[0] == b"/metrics":
+            status, ctype, body = b"200 OK", CONTENT_TYPE.encode(), registry.render().encode()
+        else:
+            status, ctype, body = b"404 Not Found", b"text/plain", b"not found\n"
+        writer.write(b"HTTP/1.1 %s\r\nContent-Type: %s\r\nContent-Length: %d\r\nConnection: close\r\n\r\n%s" % (status, ctype, len(body), body))
+        await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(port: int, host: str = "0.0.0.0", registry: Optional[MetricsRegistry] = None) -> asyncio.AbstractServer:
+    reg = registry or REGISTRY
+    return await asyncio.start_server(lambda r, w: _handle(r, w, reg), host, port)
+
+
+_SERVER: Optional[Tuple[asyncio.AbstractServer, asyncio.AbstractEventLoop]] = None
+
+
+async def ensure_metrics_server() -> Optional[asyncio.AbstractServer]:
+    """Start the process's ``/metrics`` server on ``METRICS_PORT`` once per event loop."""
+    global _SERVER
+    port = os.environ.get("METRICS_PORT")
+    if not port:
+        return None
+    loop = asyncio.get_running_loop()
+    if _SERVER is not None and _SERVER[1] is loop:
+        return _SERVER[0]
+    try:
+        server = await start_metrics_server(int(port), os.environ.get("METRICS_HOST", "0.0.0.0"))
+    except OSError as err:
+        print({"metrics": "server_failed", "port": port, "error": repr(err)})
+        return None
+    _SERVER = (server, loop)
+    return server
+
+
+async def stop_metrics_server() -> None:
+    global _SERVER
+    if _SERVER is not None and _SERVER[1] is asyncio.get_running_loop():
+        server, _SERVER = _SERVER[0], None
+        server.close()
+        await server.wait_closed()
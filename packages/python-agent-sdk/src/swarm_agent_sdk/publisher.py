@@ -0,0 +1,208 @@
+"""Micro-batching publisher for the ``bus`` service.
+
+``publish`` buffers messages per topic and returns a future for each one.
+A topic's buffer is sent as one ``bus.publish_batch`` call once it holds
+``max_batch`` messages or its oldest message has waited ``linger`` seconds.
+Buffers are bounded by ``max_queue``. When a buffer is full, the
+``backpressure`` policy applies: ``block`` waits for room, ``drop_oldest``
+fails the oldest queued message, and ``error`` raises ``PublishQueueFull``.
+Buses without ``bus.publish_batch`` get one ``bus.publish`` per message,
+at most ``fallback_concurrency`` at a time.
+"""
+from typing import Any, Deque, Dict, List, Optional
+from collections import deque
+from dataclasses import asdict, dataclass, field
+import asyncio
+import time
+from pydantic import BaseModel
+import pydantic_core
+
+from .client import HttpMCPClient, MCPClient, gather_calls, tool_unsupported
+from .resilience import clear_deadline
+
+BACKPRESSURE_POLICIES = ("block", "drop_oldest", "error")
+
+
+class PublishQueueFull(RuntimeError):
+    def __init__(self, topic: str, size: int) -> None:
+        super().__init__(f"publish queue for {topic!r} is full ({size} messages)")
+        self.topic = topic
+        self.size = size
+
+
+@dataclass
+class Delivery:
+    """Outcome of one published message; ``latency`` runs from enqueue to ack."""
+    topic: str
+    ok: bool
+    latency: float
+    error: Optional[str] = None
+    ack: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class PublisherStats:
+    enqueued: int = 0
+    delivered: int = 0
+    failed: int = 0
+    dropped: int = 0
+    batches: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        out = asdict(self)
+        out["latency_avg"] = self.latency_total / self.delivered if self.delivered else 0.0
+        return out
+
+
+@dataclass
+class _Pending:
+    key: Optional[str]
+    payload: Any
+    enqueued_at: float
+    future: "asyncio.Future[Delivery]"
+
+
+@dataclass
+class _Topic:
+    queue: Deque[_Pending] = field(default_factory=deque)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+    space: asyncio.Condition = field(default_factory=asyncio.Condition)
+    task: Optional["asyncio.Task[None]"] = None
+    flushing: bool = False
+
+
+class BusPublisher:
+    """Buffered, batched ``bus.publish`` for one bus client."""
+
+    def __init__(
+        self,
+        client: MCPClient,
+        max_batch: int = 500,
+        linger: float = 0.05,
+        max_queue: int = 10_000,
+        backpressure: str = "block",
+        fallback_concurrency: int = 16,
+    ) -> None:
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"unknown backpressure policy {backpressure!r}")
+        self.client = client
+        self.max_batch = max_batch
+        self.linger = linger
+        self.max_queue = max_queue
+        self.backpressure = backpressure
+        self.fallback_concurrency = fallback_concurrency
+        self.stats = PublisherStats()
+        self._topics: Dict[str, _Topic] = {}
+        self._batch_supported = True
+        self._closing = False
+
+    async def publish(self, topic: str, payload: Any, key: Optional[str] = None) -> "asyncio.Future[Delivery]":
+        """Queue a message; await the returned future for its ``Delivery``.
+
+        ``payload`` may be a dict, a ``schemas`` model or a ``codec`` record;
+        models are encoded straight to JSON without a ``model_dump()``.
+        """
+        if self._closing:
+            raise RuntimeError("publisher is closed")
+        t = self._topics.setdefault(topic, _Topic())
+        if len(t.queue) >= self.max_queue:
+            if self.backpressure == "error":
+                raise PublishQueueFull(topic, len(t.queue))
+            if self.backpressure == "drop_oldest":
+                old = t.queue.popleft()
+                self.stats.dropped += 1
+                self._resolve(old, Delivery(topic, False, time.monotonic() - old.enqueued_at, error="dropped"))
+            else:
+                async with t.space:
+                    await t.space.wait_for(lambda: len(t.queue) < self.max_queue)
+        if isinstance(payload, tuple) and hasattr(payload, "_asdict"):
+            payload = payload._asdict()
+        fut: "asyncio.Future[Delivery]" = asyncio.get_running_loop().create_future()
+        t.queue.append(_Pending(key, payload, time.monotonic(), fut))
+        self.stats.enqueued += 1
+        if len(t.queue) >= self.max_batch:
+            t.full.set()
+        if t.task is None or t.task.done():
+            t.task = asyncio.ensure_future(self._drain(topic, t))
+        return fut
+
+    async def flush(self) -> None:
+        """Send everything queued so far without waiting for the linger time."""
+        for topic, t in self._topics.items():
+            if not t.queue:
+                continue  # idle: nothing to hurry, and no drain task to reset the flag
+            t.flushing = True
+            t.full.set()
+            if t.task is None or t.task.done():
+                t.task = asyncio.ensure_future(self._drain(topic, t))
+        tasks = [t.task for t in self._topics.values() if t.task is not None and not t.task.done()]
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def aclose(self) -> None:
+        self._closing = True
+        await self.flush()
+
+    async def _drain(self, topic: str, t: _Topic) -> None:
+        # one drain task per topic while it has messages; it exits when the queue is empty
+        clear_deadline()  # it outlives the tick that started it
+        try:
+            while t.queue:
+                if len(t.queue) < self.max_batch and not (self._closing or t.flushing):
+                    try:
+                        wait = t.queue[0].enqueued_at + self.linger - time.monotonic()
+                        if wait > 0:
+                            await asyncio.wait_for(t.full.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                batch = [t.queue.popleft() for _ in range(min(self.max_batch, len(t.queue)))]
+                if len(t.queue) < self.max_batch:
+                    t.full.clear()
+                async with t.space:
+                    t.space.notify_all()
+                await self._send(topic, batch)
+        finally:
+            t.flushing = False
+
+    async def _send(self, topic: str, batch: List[_Pending]) -> None:
+        self.stats.batches += 1
+        messages = [{"key": p.key, "payload": p.payload} if p.key is not None else {"payload": p.payload} for p in batch]
+        acks: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+        errors: List[Optional[str]] = [None] * len(batch)
+        if self._batch_supported:
+            try:
+                body = {"topic": topic, "messages": messages}
+                if isinstance(self.client, HttpMCPClient):
+                    res = await self.client.call_encoded("bus.publish_batch", pydantic_core.to_json(body))
+                else:
+                    res = await self.client.call("bus.publish_batch", body)
+                acks = [res] * len(batch)
+            except Exception as err:
+                if tool_unsupported(err):
+                    self._batch_supported = False
+                else:
+                    errors = [repr(err)] * len(batch)
+        if not self._batch_supported:
+            calls = [(self.client, "bus.publish", dict(m, topic=topic, payload=_jsonable(m["payload"]))) for m in messages]
+            results = await gather_calls(calls, concurrency=self.fallback_concurrency)
+            acks = [r.value if r.ok else None for r in results]
+            errors = [None if r.ok else repr(r.error) for r in results]
+        now = time.monotonic()
+        for p, ack, error in zip(batch, acks, errors):
+            self._resolve(p, Delivery(topic, error is None, now - p.enqueued_at, error=error, ack=ack))
+
+    def _resolve(self, p: _Pending, delivery: Delivery) -> None:
+        if delivery.ok:
+            self.stats.delivered += 1
+            self.stats.latency_total += delivery.latency
+            self.stats.latency_max = max(self.stats.latency_max, delivery.latency)
+        elif delivery.error != "dropped":
+            self.stats.failed += 1
+        if not p.future.done():
+            p.future.set_result(delivery)
+
+
+def _jsonable(payload: Any) -> Any:
+    return payload.model_dump() if isinstance(payload, BaseModel) else payload
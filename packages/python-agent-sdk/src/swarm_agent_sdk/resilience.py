@@ -0,0 +1,313 @@
+"""Tail-latency controls for ``HttpMCPClient``: deadlines, retries, hedging, circuit breaking.
+
+- ``deadline(seconds)`` sets a time budget for the calls made inside it.
+  Budgets nest, and the earliest one wins. Agents open one per tick from
+  ``tick_timeout_seconds``. Each request's timeout is capped to the time
+  left. A call made after the budget has run out raises
+  ``DeadlineExceeded`` (an ``asyncio.TimeoutError``) without being sent.
+- A ``CallPolicy`` (per client, or per tool with ``set_policy``) retries
+  transport errors, timeouts, 429s and 5xx responses with full-jitter
+  exponential backoff. It can also hedge: when a call has not answered
+  within the ``hedge_quantile`` of that tool's recent latencies, a second
+  copy is sent and the first answer wins. Retries and hedges only apply to
+  idempotent tools (``IDEMPOTENT_TOOLS`` or ``CallPolicy(idempotent=True)``),
+  and never sleep past the deadline.
+- One ``CircuitBreaker`` per service opens when at least ``failure_ratio``
+  of its last ``window`` calls failed (given ``min_calls``). While open,
+  calls raise ``CircuitOpen`` at once. After ``reset_seconds`` a single
+  probe call is let through: success closes the breaker, failure reopens it.
+  Client errors (4xx, unknown tools), the caller's own deadline running out
+  and cancellations are not outcomes at all. They count neither way, and a
+  probe ending in one leaves the breaker half-open for the next probe.
+
+Defaults come from ``MCP_RETRIES``, ``MCP_HEDGE`` and ``MCP_CIRCUIT_BREAKER``.
+Everything is counted in ``metrics``.
+"""
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Optional, TypeVar
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import asyncio
+import os
+import random
+import time
+
+from .metrics import REGISTRY
+
+T = TypeVar("T")
+
+IDEMPOTENT_TOOLS = frozenset({
+    "market-data.get_ohlcv",
+    "config.get",
+    "broker-gateway.get_positions",
+    "broker-gateway.get_fills",
+    "risk-engine.pretrade_check",
+    "risk-engine.pretrade_check_batch",
+    "backtester.run",
+    "nlp-sentiment.score_texts",
+})
+
+RETRIES = REGISTRY.counter("mcp_client_retries_total", "Call attempts repeated after a retryable failure", ("service", "tool"))
+HEDGES = REGISTRY.counter("mcp_client_hedges_total", "Hedged requests: sent, and won by the hedge", ("service", "tool", "outcome"))
+DEADLINES = REGISTRY.counter("mcp_client_deadline_exceeded_total", "Calls failed for lack of deadline budget", ("service", "tool"))
+CIRCUIT_REJECTED = REGISTRY.counter("mcp_circuit_rejected_total", "Calls refused by an open circuit breaker", ("service",))
+CIRCUIT_OPENED = REGISTRY.counter("mcp_circuit_opened_total", "Times a circuit breaker opened", ("service",))
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    pass
+
+
+class CircuitOpen(RuntimeError):
+    def __init__(self, service: str, retry_in: float) -> None:
+        super().__init__(f"circuit for {service!r} is open (retry in {retry_in:.2f}s)")
+        self.service = service
+        self.retry_in = retry_in
+
+
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("mcp_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Budget the calls inside to ``seconds`` from now (``None``: unchanged)."""
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    outer = _DEADLINE.get()
+    token = _DEADLINE.set(at if outer is None else min(outer, at))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def clear_deadline() -> None:
+    """Drop the deadline for the rest of the current task, e.g. a background drain started from a tick."""
+    _DEADLINE.set(None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current deadline, or ``None`` without one."""
+    at = _DEADLINE.get()
+    return None if at is None else at - time.monotonic()
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    retries: int = 0
+    backoff: float = 0.05
+    max_backoff: float = 2.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_delay: float = 0.005
+    idempotent: Optional[bool] = None  # None: decided by IDEMPOTENT_TOOLS
+
+    @classmethod
+    def from_env(cls) -> "CallPolicy":
+        return cls(
+            retries=int(os.environ.get("MCP_RETRIES", cls.retries)),
+            hedge=os.environ.get("MCP_HEDGE", "false").lower() == "true",
+        )
+
+    def is_idempotent(self, tool: str) -> bool:
+        return tool in IDEMPOTENT_TOOLS if self.idempotent is None else self.idempotent
+
+
+class LatencyTracker:
+    """Recent successful call latencies of one tool, for hedge delays."""
+
+    def __init__(self, size: int = 256, min_samples: int = 20) -> None:
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        service: str,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_ratio: float = 0.5,
+        reset_seconds: float = 5.0,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.service = service
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.reset_seconds = reset_seconds
+        self.enabled = enabled
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True = failure
+        self._probing = False
+
+    def before_call(self) -> None:
+        """Raise ``CircuitOpen`` unless a call may go out now."""
+        if not self.enabled or self.state == CLOSED:
+            return
+        wait = self.opened_at + self.reset_seconds - self.clock()
+        if self.state == OPEN and wait <= 0:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        CIRCUIT_REJECTED.inc(self.service)
+        raise CircuitOpen(self.service, max(0.0, wait))
+
+    def record(self, failed: bool) -> None:
+        if not self.enabled:
+            return
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if failed:
+                self._open()
+            else:
+                self.state = CLOSED
+                self._outcomes.clear()
+            return
+        self._outcomes.append(failed)
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls and sum(self._outcomes) >= self.failure_ratio * len(self._outcomes):
+            self._open()
+
+    def release(self) -> None:
+        """Give up a half-open probe without an outcome."""
+        self._probing = False
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self._outcomes.clear()
+        CIRCUIT_OPENED.inc(self.service)
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_LATENCY: Dict[tuple, LatencyTracker] = {}
+
+
+def get_breaker(service: str) -> CircuitBreaker:
+    breaker = _BREAKERS.get(service)
+    if breaker is None:
+        enabled = os.environ.get("MCP_CIRCUIT_BREAKER", "true").lower() == "true"
+        breaker = _BREAKERS[service] = CircuitBreaker(service, enabled=enabled)
+    return breaker
+
+
+def configure_breaker(service: str, **kwargs: Any) -> CircuitBreaker:
+    """Replace the service's breaker, e.g. ``configure_breaker("backtester", reset_seconds=30)``."""
+    breaker = _BREAKERS[service] = CircuitBreaker(service, **kwargs)
+    return breaker
+
+
+def is_failure(err: BaseException) -> bool:
+    """Whether ``err`` says the service is unhealthy (as opposed to a bad request)."""
+    if isinstance(err, (CircuitOpen, DeadlineExceeded, asyncio.CancelledError)):
+        return False  # the caller gave up (its own budget, or cancelled): says nothing about the service
+    if isinstance(err, asyncio.TimeoutError):
+        return True
+    response = getattr(err, "response", None)
+    if response is not None:
+        # the host relays an upstream 404 as a 500 carrying the service's error body
+        return response.status_code >= 500 and "tool_not_found" not in response.text
+    import httpx
+    return isinstance(err, httpx.TransportError)
+
+
+def _retryable(err: BaseException) -> bool:
+    if isinstance(err, DeadlineExceeded):
+        return False
+    response = getattr(err, "response", None)
+    if response is not None and response.status_code == 429:
+        return True
+    return is_failure(err)
+
+
+async def _hedged(service: str, tool: str, attempt: Callable[[], Awaitable[T]], delay: float) -> T:
+    first = asyncio.ensure_future(attempt())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+    HEDGES.inc(service, tool, "sent")
+    second = asyncio.ensure_future(attempt())
+    pending = {first, second}
+    try:
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        HEDGES.inc(service, tool, "won")
+                    return task.result()
+            if not pending:
+                return first.result()  # both failed: raise the original error
+    finally:
+        for task in (first, second):
+            if not task.done():
+                task.cancel()
+
+
+async def call_with_policy(service: str, tool: str, attempt: Callable[[], Awaitable[T]], policy: CallPolicy) -> T:
+    """Run ``attempt`` under ``service``'s breaker and the current deadline, retrying/hedging per ``policy``."""
+    breaker = get_breaker(service)
+    idempotent = policy.is_idempotent(tool)
+    retries = policy.retries if idempotent else 0
+    tracker = _LATENCY.get((service, tool))
+    if tracker is None:
+        tracker = _LATENCY[(service, tool)] = LatencyTracker()
+    for n in range(retries + 1):
+        left = remaining()
+        if left is not None and left <= 0:
+            DEADLINES.inc(service, tool)
+            raise DeadlineExceeded(f"{tool}: deadline exceeded")
+        breaker.before_call()
+        t0 = time.monotonic()
+        try:
+            delay = tracker.quantile(policy.hedge_quantile) if policy.hedge and idempotent else None
+            if delay is not None:
+                value = await _hedged(service, tool, attempt, max(delay, policy.hedge_min_delay))
+            else:
+                value = await attempt()
+        except Exception as err:
+            if is_failure(err):
+                breaker.record(True)
+            else:
+                breaker.release()  # a bad request or our own budget: says nothing about the service
+            if isinstance(err, DeadlineExceeded):
+                DEADLINES.inc(service, tool)
+            if n == retries or not _retryable(err):
+                raise
+            sleep = random.uniform(0, min(policy.max_backoff, policy.backoff * 2 ** n))
+            left = remaining()
+            if left is not None and sleep >= left:
+                raise
+            RETRIES.inc(service, tool)
+            await asyncio.sleep(sleep)
+            continue
+        except BaseException:
+            breaker.release()  # cancelled: says nothing about the service
+            raise
+        breaker.record(False)
+        tracker.add(time.monotonic() - t0)
+        return value
+    raise AssertionError("unreachable")
+
+
+REGISTRY.callback("mcp_circuit_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open", ("service",),
+                  lambda: {(name,): _STATE_VALUES[b.state] for name, b in list(_BREAKERS.items())})
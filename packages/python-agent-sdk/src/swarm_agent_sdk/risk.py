@@ -0,0 +1,183 @@
+"""Local exposure tracking and batched pre-trade checks.
+
+``ExposureIndex`` keeps net quantity, a mark price and the gross exposure per
+symbol. It is updated incrementally from broker fills. ``sync(broker)``
+asks ``broker-gateway.get_fills`` only for fills after the last offset it
+saw. Each ``exec_id`` is applied once, even from a gateway that ignores
+offsets or a fill also applied by hand; the ids are kept in an LRU of
+``max_exec_ids``, which only has to span that overlap.
+
+``pretrade_check_batch(risk, index, proposals)`` decides a whole batch with
+the risk-engine's rules. Proposals are checked in order against the current
+book plus the notional of the proposals approved before them: gross after
+the trade must stay within ``maxGross``, and the order notional within
+``maxSingle``. ``prescreen`` runs these rules as array operations over the
+batch, with a cumulative sum over the approved mask, re-screened until no
+decision changes:
+
+- Proposals clear of both limits by more than ``band`` (as a fraction of
+  the limit) are approved locally, even if every earlier borderline
+  proposal were approved.
+- Proposals over a limit by more than ``band`` are rejected locally, even
+  if every earlier borderline proposal were rejected.
+- The borderline ones, where a stale mark or an unseen fill could change
+  the answer, go to ``risk-engine.pretrade_check_batch`` in one request,
+  with the index's positions as ``current``. The local approvals before the
+  last borderline proposal go along, so the engine counts them in order.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+import numpy as np
+
+from .client import MCPClient
+from .metrics import REGISTRY
+
+APPROVED, REJECTED = "APPROVED", "REJECTED"
+
+DECISIONS = REGISTRY.counter("risk_pretrade_decisions_total", "Pre-trade decisions by source (local, engine) and status", ("source", "status"))
+
+
+@dataclass
+class ExposureStats:
+    fills_applied: int = 0
+    duplicate_fills: int = 0
+    syncs: int = 0
+    local_decisions: int = 0
+    engine_decisions: int = 0
+    engine_calls: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class ExposureIndex:
+    def __init__(self, max_exec_ids: int = 100_000) -> None:
+        self.qty: Dict[str, float] = {}
+        self.mark: Dict[str, float] = {}
+        self.gross = 0.0
+        self.fill_offset = 0
+        self.stats = ExposureStats()
+        self.max_exec_ids = max_exec_ids
+        self._exec_ids: "OrderedDict[str, None]" = OrderedDict()
+
+    def exposure(self, symbol: str) -> float:
+        return abs(self.qty.get(symbol, 0.0) * self.mark.get(symbol, 0.0))
+
+    def _set(self, symbol: str, qty: float, mark: float) -> None:
+        self.gross -= self.exposure(symbol)
+        self.qty[symbol] = qty
+        self.mark[symbol] = mark
+        self.gross += abs(qty * mark)
+
+    def apply_fill(self, fill: Dict[str, Any], side: Optional[str] = None) -> bool:
+        """Apply one fill; ``qty`` is signed unless ``side`` (or ``fill["side"]``) says SELL."""
+        exec_id = fill.get("exec_id")
+        if exec_id is not None:
+            if exec_id in self._exec_ids:
+                self._exec_ids.move_to_end(exec_id)
+                self.stats.duplicate_fills += 1
+                return False
+            self._exec_ids[exec_id] = None
+            if len(self._exec_ids) > self.max_exec_ids:
+                self._exec_ids.popitem(last=False)
+        qty = float(fill["qty"])
+        if (side or fill.get("side", "BUY")).upper() == "SELL":
+            qty = -abs(qty)
+        symbol = fill["symbol"]
+        self._set(symbol, self.qty.get(symbol, 0.0) + qty, float(fill["price"]))
+        self.stats.fills_applied += 1
+        return True
+
+    def apply_fills(self, fills: Sequence[Dict[str, Any]]) -> int:
+        return sum(self.apply_fill(f) for f in fills)
+
+    def update_mark(self, symbol: str, price: float) -> None:
+        self._set(symbol, self.qty.get(symbol, 0.0), price)
+
+    async def sync(self, broker: MCPClient) -> int:
+        """Apply the fills booked since the last sync; returns how many were new."""
+        res = await broker.call("broker-gateway.get_fills", {"offset": self.fill_offset})
+        fills = res.get("fills", [])
+        # a gateway without offsets returns everything; exec_ids keep that idempotent
+        self.fill_offset = int(res.get("next_offset", self.fill_offset + len(fills)))
+        self.stats.syncs += 1
+        return self.apply_fills(fills)
+
+    def positions(self) -> List[Dict[str, Any]]:
+        """The book as ``current`` for the risk-engine."""
+        return [{"symbol": s, "qty": q, "price": self.mark[s]} for s, q in self.qty.items() if q]
+
+    def summary(self) -> Dict[str, Any]:
+        return {"gross": round(self.gross, 2), "symbols": sum(1 for q in self.qty.values() if q), **self.stats.as_dict()}
+
+
+def _exclusive_cumsum(values: np.ndarray) -> np.ndarray:
+    out = np.zeros_like(values)
+    np.cumsum(values[:-1], out=out[1:])
+    return out
+
+
+def prescreen(gross: float, proposals: Sequence[Dict[str, Any]], band: float = 0.05) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized limit checks for a batch, in order.
+
+    Returns boolean arrays ``(approve, reject, over_gross, over_single)``;
+    proposals in neither ``approve`` nor ``reject`` are borderline. The
+    ``over_*`` arrays flag breaches for the rejected ones.
+    """
+    n = len(proposals)
+    qty = np.fromiter((p["qty"] for p in proposals), dtype=np.float64, count=n)
+    price = np.fromiter((p["price"] for p in proposals), dtype=np.float64, count=n)
+    max_gross = np.fromiter((p["limits"]["maxGross"] for p in proposals), dtype=np.float64, count=n)
+    max_single = np.fromiter((p["limits"]["maxSingle"] for p in proposals), dtype=np.float64, count=n)
+    notional = np.abs(qty * price)
+    over_single = notional > max_single * (1 + band)
+    single_ok = notional <= max_single * (1 - band)
+    # each decision depends only on earlier ones, so after k passes the first k are final
+    approve = np.zeros(n, dtype=bool)
+    reject = over_single.copy()
+    for _ in range(n + 1):
+        # earlier exposure: at most the approved and borderline ones, at least the approved ones
+        hi = gross + _exclusive_cumsum(np.where(reject, 0.0, notional)) + notional
+        lo = gross + _exclusive_cumsum(np.where(approve, notional, 0.0)) + notional
+        over_gross = lo > max_gross * (1 + band)
+        next_reject = over_gross | over_single
+        next_approve = ~next_reject & single_ok & (hi <= max_gross * (1 - band))
+        if np.array_equal(next_approve, approve) and np.array_equal(next_reject, reject):
+            break
+        approve, reject = next_approve, next_reject
+    return approve, reject, over_gross, over_single
+
+
+async def pretrade_check_batch(
+    risk: MCPClient,
+    index: ExposureIndex,
+    proposals: Sequence[Dict[str, Any]],
+    band: float = 0.05,
+) -> List[Dict[str, Any]]:
+    """One decision per proposal (``status``, ``breaches``, ``source``), in order."""
+    if not proposals:
+        return []
+    approve, reject, over_gross, over_single = prescreen(index.gross, proposals, band)
+    out: List[Optional[Dict[str, Any]]] = [None] * len(proposals)
+    for i in np.flatnonzero(approve | reject).tolist():
+        breaches = (["max_gross"] if over_gross[i] else []) + (["max_single"] if over_single[i] else [])
+        out[i] = {"status": REJECTED if breaches else APPROVED, "breaches": breaches, "source": "local"}
+    border = np.flatnonzero(~(approve | reject)).tolist()
+    if border:
+        # local approvals ahead of a borderline proposal add to the gross it is checked against
+        sent = [i for i in range(border[-1] + 1) if not reject[i]]
+        res = await risk.call("risk-engine.pretrade_check_batch", {
+            "current": index.positions(),
+            "proposals": [{k: proposals[i][k] for k in ("symbol", "side", "qty", "price", "limits")} for i in sent],
+        })
+        for i, r in zip(sent, res["results"]):
+            if not approve[i]:
+                out[i] = {**r, "source": "engine"}
+        index.stats.engine_calls += 1
+    index.stats.local_decisions += len(proposals) - len(border)
+    index.stats.engine_decisions += len(border)
+    for d in out:
+        assert d is not None
+        DECISIONS.inc(d["source"], d["status"])
+    return out  # type: ignore[return-value]
@@ -0,0 +1,124 @@
+"""Host many agents in one event loop, optionally across a few worker processes.
+
+Agents in a runtime share the process-wide transport pool (one keep-alive
+connection pool per host) and caches such as ``get_ohlcv_cache``, so adding
+an agent costs a few coroutines rather than an interpreter. Each agent keeps
+its own scheduler; one agent failing does not stop the others.
+
+Agents are described by factories, either callables or ``"module:attr"``
+strings, so the same list can be handed to worker processes::
+
+    python -m swarm_agent_sdk signal_agent.main:build_agent trend_agent.main:build_agent --workers 2
+"""
+from typing import Callable, Dict, List, Sequence, Union
+import argparse
+import asyncio
+import importlib
+import multiprocessing
+import os
+
+from .agent import BaseAgent
+from .executors import shutdown_tool_pools
+from .metrics import stop_metrics_server
+from .transport import close_transports
+
+AgentFactory = Union[str, Callable[[], BaseAgent]]
+
+
+def resolve_factory(factory: AgentFactory) -> Callable[[], BaseAgent]:
+    if callable(factory):
+        return factory
+    module, _, attr = factory.partition(":")
+    if not attr:
+        raise ValueError(f"agent factory must look like 'module:attr', got {factory!r}")
+    return getattr(importlib.import_module(module), attr)
+
+
+class AgentRuntime:
+    """Run a set of agents concurrently until all of them stop."""
+
+    def __init__(self, agents: Sequence[BaseAgent] = ()) -> None:
+        self.agents: List[BaseAgent] = []
+        self.errors: Dict[str, BaseException] = {}
+        for agent in agents:
+            self.add(agent)
+
+    def add(self, agent: BaseAgent) -> BaseAgent:
+        agent.runtime = self
+        self.agents.append(agent)
+        return agent
+
+    async def _run_one(self, agent: BaseAgent) -> None:
+        try:
+            await agent.run()
+        except Exception as err:
+            self.errors[agent.config.name] = err
+            print({"agent": agent.config.name, "error": repr(err)})
+
+    async def run(self) -> None:
+        try:
+            await asyncio.gather(*(self._run_one(a) for a in self.agents))
+        finally:
+            await close_transports()
+            await stop_metrics_server()
+            shutdown_tool_pools()
+
+    def stop(self) -> None:
+        for agent in self.agents:
+            agent.stop()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {a.config.name: a.scheduler.stats.as_dict() for a in self.agents}
+
+
+async def _serve(factories: Sequence[AgentFactory]) -> None:
+    # agents are built inside the loop that runs them
+    await AgentRuntime([resolve_factory(f)() for f in factories]).run()
+
+
+def _run_worker(factories: Sequence[AgentFactory], index: int = 0) -> None:
+    # each worker serves /metrics on its own port: METRICS_PORT + index
+    port = os.environ.get("METRICS_PORT")
+    if port and index:
+        os.environ["METRICS_PORT"] = str(int(port) + index)
+    # ... and keeps its own feature spool: "<root>.<index><ext>", stable across restarts so it is replayed
+    spool = os.environ.get("FEATURE_SPOOL_PATH")
+    if spool and index:
+        root, ext = os.path.splitext(spool)
+        os.environ["FEATURE_SPOOL_PATH"] = f"{root}.{index}{ext}"
+    try:
+        asyncio.run(_serve(factories))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_agents(factories: Sequence[AgentFactory], workers: int = 1) -> None:
+    """Run the agents built by ``factories``, spread round-robin over ``workers`` processes.
+
+    With ``workers > 1`` factories must be picklable: ``"module:attr"``
+    strings or module-level functions. With ``METRICS_PORT`` set, worker
+    ``i`` serves ``/metrics`` on ``METRICS_PORT + i``; with ``FEATURE_SPOOL_PATH``
+    set, workers after the first spool to ``<root>.<i><ext>``.
+    """
+    if workers <= 1:
+        _run_worker(factories)
+        return
+    groups = [list(factories[i::workers]) for i in range(workers)]
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_run_worker, args=(g, i), daemon=True) for i, g in enumerate(groups) if g]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(prog="python -m swarm_agent_sdk", description="Run several agents in one runtime")
+    ap.add_argument("factories", nargs="+", help="agent factories as module:attr")
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+    run_agents(args.factories, args.workers)
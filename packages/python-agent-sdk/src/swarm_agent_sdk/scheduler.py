@@ -0,0 +1,109 @@
+"""Fixed-rate tick scheduling for agents.
+
+Ticks fire on deadlines ``start + n * period`` rather than ``period`` after
+the previous tick finished, so the rate does not drift with tick duration.
+A tick that runs past the next deadline is an overrun; the ``skip`` policy
+drops the deadlines it missed and resumes on the grid, ``catch_up`` fires
+them back to back until the schedule is current again. A tick that raises
+is logged and counted in ``stats.failures``; the next one still runs.
+"""
+from typing import Awaitable, Callable, Dict, Optional
+from dataclasses import asdict, dataclass
+import asyncio
+import random
+import time
+
+TICK_POLICIES = ("skip", "catch_up")
+
+
+@dataclass
+class SchedulerStats:
+    ticks: int = 0
+    overruns: int = 0
+    skipped: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    last_duration: float = 0.0
+    max_duration: float = 0.0
+    max_lag: float = 0.0  # latest start relative to its deadline
+
+    def as_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+class TickScheduler:
+    """Call ``tick`` every ``period`` seconds on a fixed grid until ``stop`` is set.
+
+    ``jitter`` delays each start by up to that many seconds (without moving
+    the grid) so agents sharing a period do not hit the host in lockstep.
+    ``timeout`` cancels a tick that runs longer and counts it in ``stats``;
+    a ``TimeoutError`` raised by the tick itself counts as a failure.
+    ``on_tick`` is called with each tick's duration (see ``metrics.track_scheduler``).
+    """
+
+    def __init__(
+        self,
+        period: float,
+        policy: str = "skip",
+        jitter: float = 0.0,
+        timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        on_tick: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        if policy not in TICK_POLICIES:
+            raise ValueError(f"unknown tick policy {policy!r}")
+        self.period = period
+        self.policy = policy
+        self.jitter = jitter
+        self.timeout = timeout
+        self.clock = clock
+        self.on_tick = on_tick
+        self.stats = SchedulerStats()
+
+    async def run(self, tick: Callable[[], Awaitable[None]], stop: asyncio.Event) -> None:
+        deadline = self.clock()
+        while not stop.is_set():
+            delay = deadline - self.clock() + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            started = self.clock()
+            self.stats.max_lag = max(self.stats.max_lag, started - deadline)
+            try:
+                await self._run_tick(tick)
+            except Exception as err:
+                self.stats.failures += 1
+                print({"scheduler": "tick_failed", "error": repr(err)})
+            now = self.clock()
+            self.stats.ticks += 1
+            self.stats.last_duration = now - started
+            self.stats.max_duration = max(self.stats.max_duration, now - started)
+            if self.on_tick is not None:
+                self.on_tick(now - started)
+            deadline += self.period
+            if now > deadline:
+                self.stats.overruns += 1
+                if self.policy == "skip":
+                    missed = int((now - deadline) // self.period) + 1
+                    self.stats.skipped += missed
+                    deadline += missed * self.period
+
+    async def _run_tick(self, tick: Callable[[], Awaitable[None]]) -> None:
+        if not self.timeout:
+            await tick()
+            return
+        task = asyncio.ensure_future(tick())
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if not done:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            self.stats.timeouts += 1
+            return
+        task.result()
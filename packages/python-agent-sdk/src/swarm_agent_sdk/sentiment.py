@@ -0,0 +1,188 @@
+"""Streaming headline sentiment: dedupe, cached scoring and per-symbol aggregation.
+
+``SentimentPipeline.ingest(items)`` takes headlines shaped like
+``{"text", "symbol" or "symbols", "ts"?, "source"?, "weight"?}`` (``ts``
+defaults to now):
+
+1. Texts are keyed by a hash of their normalized content (case and
+   whitespace folded).
+2. Texts already in the bounded LRU cache of scores are not sent again.
+3. The rest are split into chunks of ``batch_size``, and up to
+   ``concurrency`` chunks are scored by ``nlp-sentiment.score_texts`` at
+   once.
+4. Each symbol keeps a running, exponentially time-decayed average of
+   polarity, weighted by the scorer's magnitude. Syndicated copies of a
+   story count once per symbol.
+
+Confidence is the decayed evidence weight relative to ``full_confidence``,
+capped at 1.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+import hashlib
+import time
+
+from .client import MCPClient, gather_calls
+from .frames import format_ts, parse_ts
+from .metrics import REGISTRY
+from .schemas import SentimentIndex
+
+Score = Tuple[float, float]  # (score, magnitude)
+
+TEXTS = REGISTRY.counter("sentiment_texts_total", "Headlines by outcome: scored, cache_hit, failed, syndicated", ("outcome",))
+
+
+def text_key(text: str) -> str:
+    return hashlib.blake2b(" ".join(text.lower().split()).encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class SentimentStats:
+    texts_in: int = 0
+    cache_hits: int = 0
+    scored: int = 0
+    failed: int = 0
+    syndicated: int = 0  # copies of an already counted story for the same symbol
+    batches: int = 0
+    busy_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        out = asdict(self)
+        out["texts_per_sec"] = round(self.texts_in / self.busy_seconds, 1) if self.busy_seconds else 0.0
+        out["cache_hit_rate"] = round(self.cache_hits / self.texts_in, 4) if self.texts_in else 0.0
+        return out
+
+
+@dataclass
+class _Aggregate:
+    ref_ms: int = 0  # weights are decayed to this time
+    weight: float = 0.0
+    weighted: float = 0.0
+    sources: Set[str] = field(default_factory=set)
+
+
+class SentimentPipeline:
+    def __init__(
+        self,
+        client: MCPClient,
+        provider: str = "stub",
+        batch_size: int = 128,
+        concurrency: int = 4,
+        cache_size: int = 100_000,
+        half_life: float = 3600.0,
+        full_confidence: float = 5.0,
+    ) -> None:
+        self.client = client
+        self.provider = provider
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.cache_size = cache_size
+        self.half_life_ms = half_life * 1000
+        self.full_confidence = full_confidence
+        self.stats = SentimentStats()
+        self._cache: "OrderedDict[str, Score]" = OrderedDict()
+        self._counted: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._symbols: Dict[str, _Aggregate] = {}
+
+    async def score(self, texts: Sequence[str]) -> List[Optional[Score]]:
+        """``(score, magnitude)`` per text, from the cache where possible; ``None`` if scoring failed."""
+        return await self._score([text_key(t) for t in texts], texts)
+
+    async def _score(self, keys: List[str], texts: Sequence[str]) -> List[Optional[Score]]:
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            elif key not in missing:
+                missing[key] = text
+        todo = list(missing.items())
+        chunks = [todo[i:i + self.batch_size] for i in range(0, len(todo), self.batch_size)]
+        results = await gather_calls(
+            [(self.client, "nlp-sentiment.score_texts", {"provider": self.provider, "items": [{"id": k, "text": t} for k, t in chunk]}) for chunk in chunks],
+            concurrency=self.concurrency,
+        )
+        self.stats.batches += len(chunks)
+        for chunk, res in zip(chunks, results):
+            if not res.ok:
+                print({"sentiment": "batch_failed", "texts": len(chunk), "error": repr(res.error)})
+                continue
+            for s in res.value["scores"]:
+                self._cache[s["id"]] = (float(s["score"]), float(s["magnitude"]))
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        out = [self._cache.get(k) for k in keys]
+        scored = sum(1 for k in missing if k in self._cache)
+        failed = sum(1 for o in out if o is None)
+        hits = len(keys) - failed - scored
+        self.stats.scored += scored
+        self.stats.cache_hits += hits
+        self.stats.failed += failed
+        TEXTS.inc("scored", amount=scored)
+        TEXTS.inc("cache_hit", amount=hits)
+        if failed:
+            TEXTS.inc("failed", amount=failed)
+        return out
+
+    async def ingest(self, items: Sequence[Dict[str, Any]]) -> List[SentimentIndex]:
+        """Score and aggregate headlines; returns the index of every symbol they touched."""
+        t0 = time.perf_counter()
+        self.stats.texts_in += len(items)
+        keys = [text_key(i["text"]) for i in items]
+        scores = await self._score(keys, [i["text"] for i in items])
+        touched: Dict[str, None] = {}
+        for item, key, score in zip(items, keys, scores):
+            if score is None:
+                continue
+            for symbol in _symbols_of(item):
+                if (symbol, key) in self._counted:
+                    self.stats.syndicated += 1
+                    TEXTS.inc("syndicated")
+                    continue
+                self._counted[(symbol, key)] = None
+                ts_ms = parse_ts(item["ts"]) if item.get("ts") else int(time.time() * 1000)
+                self._add(symbol, ts_ms, score, float(item.get("weight", 1.0)), item.get("source"))
+                touched[symbol] = None
+        while len(self._counted) > self.cache_size:
+            self._counted.popitem(last=False)
+        self.stats.busy_seconds += time.perf_counter() - t0
+        return [idx for idx in (self.index(s) for s in touched) if idx is not None]
+
+    def index(self, symbol: str) -> Optional[SentimentIndex]:
+        agg = self._symbols.get(symbol)
+        if agg is None or agg.weight <= 0:
+            return None
+        return SentimentIndex(
+            symbol=symbol,
+            ts=format_ts(agg.ref_ms),
+            polarity=max(-1.0, min(1.0, agg.weighted / agg.weight)),
+            confidence=min(1.0, agg.weight / self.full_confidence),
+            sources=sorted(agg.sources) or None,
+        )
+
+    def indexes(self) -> List[SentimentIndex]:
+        return [idx for idx in (self.index(s) for s in self._symbols) if idx is not None]
+
+    def _add(self, symbol: str, ts_ms: int, score: Score, weight: float, source: Optional[str]) -> None:
+        agg = self._symbols.get(symbol)
+        if agg is None:
+            agg = self._symbols[symbol] = _Aggregate(ref_ms=ts_ms)
+        w = weight * score[1]
+        if ts_ms > agg.ref_ms:
+            decay = 0.5 ** ((ts_ms - agg.ref_ms) / self.half_life_ms)
+            agg.weight *= decay
+            agg.weighted *= decay
+            agg.ref_ms = ts_ms
+        else:
+            w *= 0.5 ** ((agg.ref_ms - ts_ms) / self.half_life_ms)
+        agg.weight += w
+        agg.weighted += w * score[0]
+        if source and len(agg.sources) < 16:
+            agg.sources.add(source)
+
+
+def _symbols_of(item: Dict[str, Any]) -> Iterable[str]:
+    symbols = item.get("symbols")
+    if symbols:
+        return symbols
+    return [item["symbol"]] if item.get("symbol") else []
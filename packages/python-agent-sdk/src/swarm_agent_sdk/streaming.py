@@ -0,0 +1,304 @@
+"""Incremental indicators that update in constant time and memory per bar.
+
+Each indicator keeps a fixed-size ring buffer and reproduces the value the
+matching ``swarm_agent_sdk.indicators`` function yields at the newest bar.
+Windowed sums (SMA, RSI, regime) are kept as running sums in ``RollingSum``
+rather than re-summed each bar, so they agree with the batch functions to
+float rounding, not bit for bit; the sum is recomputed from the window every
+``size`` pushes so the drift stays bounded. State round-trips through plain dicts (``snapshot``/``restore``) so agents
+can persist it between runs.
+"""
+from typing import Any, Dict, Iterable, Optional, Type
+import numpy as np
+
+from .indicators import REGIME_DOWN, REGIME_LABELS, REGIME_NEUTRAL, REGIME_SIDEWAYS, REGIME_UP
+
+
+class RingBuffer:
+    """Fixed-capacity float64 ring buffer."""
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self._buf = np.zeros(size)
+        self._head = 0  # next write position
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == len(self._buf)
+
+    def push(self, x: float) -> float:
+        """Append ``x``; returns the value it overwrote (0.0 until full)."""
+        old = float(self._buf[self._head]) if self.full else 0.0
+        self._buf[self._head] = x
+        self._head = (self._head + 1) % len(self._buf)
+        self._count = min(self._count + 1, len(self._buf))
+        return old
+
+    def values(self) -> np.ndarray:
+        """Contents oldest first."""
+        if not self.full:
+            return self._buf[:self._count].copy()
+        return np.concatenate((self._buf[self._head:], self._buf[:self._head]))
+
+    def newest(self, k: int = 0) -> float:
+        """Value ``k`` steps back from the newest entry."""
+        if k >= self._count:
+            raise IndexError("ring buffer index out of range")
+        return float(self._buf[(self._head - 1 - k) % len(self._buf)])
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"size": len(self._buf), "values": self.values().tolist()}
+
+    @classmethod
+    def restore(cls, state: Dict[str, Any]) -> "RingBuffer":
+        ring = cls(int(state["size"]))
+        for v in state["values"]:
+            ring.push(v)
+        return ring
+
+
+class RollingSum(RingBuffer):
+    """Ring buffer with a running sum of its window and a count of nonzero entries.
+
+    The nonzero count is exact, so ``sum`` is exactly 0.0 for an all-zero
+    window (the RSI's no-loss branch depends on it) however much rounding the
+    running sum has picked up.
+    """
+
+    def __init__(self, size: int) -> None:
+        super().__init__(size)
+        self._sum = 0.0
+        self._nonzero = 0
+        self._pushes = 0
+
+    @property
+    def sum(self) -> float:
+        return self._sum if self._nonzero else 0.0
+
+    def push(self, x: float) -> float:
+        old = super().push(x)
+        self._nonzero += (x != 0.0) - (old != 0.0)
+        self._pushes += 1
+        if self._pushes % len(self._buf) == 0:
+            self._sum = float(self._buf[:self._count].sum())
+        else:
+            self._sum += x - old
+        return old
+
+
+class StreamingIndicator:
+    """Base for incremental indicators; subclasses implement ``update``."""
+    kind = ""
+
+    def __init__(self) -> None:
+        self.value: float = 0.0
+        self.count = 0
+
+    def update(self, close: float) -> float:
+        raise NotImplementedError
+
+    def params(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _rings(self) -> Dict[str, RingBuffer]:
+        return {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = {"kind": self.kind, "params": self.params(), "value": self.value, "count": self.count}
+        state["rings"] = {k: r.snapshot() for k, r in self._rings().items()}
+        return state
+
+    def _restore(self, state: Dict[str, Any]) -> None:
+        self.value = state["value"]
+        self.count = state["count"]
+        for name, ring in state.get("rings", {}).items():
+            setattr(self, name, type(getattr(self, name)).restore(ring))
+
+    @staticmethod
+    def from_snapshot(state: Dict[str, Any]) -> "StreamingIndicator":
+        ind = INDICATOR_KINDS[state["kind"]](**state["params"])
+        ind._restore(state)
+        return ind
+
+
+class StreamingSMA(StreamingIndicator):
+    kind = "sma"
+
+    def __init__(self, period: int) -> None:
+        super().__init__()
+        self.period = period
+        self._closes = RollingSum(period)
+
+    def params(self) -> Dict[str, Any]:
+        return {"period": self.period}
+
+    def _rings(self) -> Dict[str, RingBuffer]:
+        return {"_closes": self._closes}
+
+    def update(self, close: float) -> float:
+        self._closes.push(close)
+        self.count += 1
+        self.value = self._closes.sum / len(self._closes)
+        return self.value
+
+
+class StreamingEMA(StreamingIndicator):
+    kind = "ema"
+
+    def __init__(self, period: int) -> None:
+        super().__init__()
+        self.period = period
+        self._alpha = 2.0 / (period + 1)
+
+    def params(self) -> Dict[str, Any]:
+        return {"period": self.period}
+
+    def update(self, close: float) -> float:
+        self.value = close if self.count == 0 else self._alpha * close + (1 - self._alpha) * self.value
+        self.count += 1
+        return self.value
+
+
+class StreamingRSI(StreamingIndicator):
+    """Simple-average RSI over the last ``period`` deltas (see ``indicators.rsi``)."""
+    kind = "rsi"
+
+    def __init__(self, period: int = 5) -> None:
+        super().__init__()
+        self.period = period
+        self.value = 50.0
+        self._last = RingBuffer(1)
+        self._gains = RollingSum(period)
+        self._losses = RollingSum(period)
+
+    def params(self) -> Dict[str, Any]:
+        return {"period": self.period}
+
+    def _rings(self) -> Dict[str, RingBuffer]:
+        return {"_last": self._last, "_gains": self._gains, "_losses": self._losses}
+
+    def update(self, close: float) -> float:
+        if len(self._last):
+            delta = close - self._last.newest()
+            self._gains.push(max(delta, 0.0))
+            self._losses.push(max(-delta, 0.0))
+        self._last.push(close)
+        self.count += 1
+        if self.count < self.period + 1:
+            return self.value
+        gsum = self._gains.sum
+        lsum = self._losses.sum
+        avg_loss = lsum / self.period if lsum > 0 else 1e-9
+        self.value = 100 - (100 / (1 + (gsum / self.period) / avg_loss))
+        return self.value
+
+
+class StreamingMomentum(StreamingIndicator):
+    kind = "momentum"
+
+    def __init__(self, lookback: int = 3) -> None:
+        super().__init__()
+        self.lookback = lookback
+        self._closes = RingBuffer(lookback + 1)
+
+    def params(self) -> Dict[str, Any]:
+        return {"lookback": self.lookback}
+
+    def _rings(self) -> Dict[str, RingBuffer]:
+        return {"_closes": self._closes}
+
+    def update(self, close: float) -> float:
+        self._closes.push(close)
+        self.count += 1
+        if self._closes.full:
+            self.value = close - self._closes.newest(self.lookback)
+        return self.value
+
+
+class StreamingRegime(StreamingIndicator):
+    """Up/down count regime; ``value`` is a code into ``REGIME_LABELS``."""
+    kind = "regime"
+
+    def __init__(self, window: int = 5) -> None:
+        super().__init__()
+        self.window = window
+        self.value = float(REGIME_NEUTRAL)
+        self._last = RingBuffer(1)
+        self._signs = RollingSum(max(window - 1, 1))
+
+    def params(self) -> Dict[str, Any]:
+        return {"window": self.window}
+
+    def _rings(self) -> Dict[str, RingBuffer]:
+        return {"_last": self._last, "_signs": self._signs}
+
+    @property
+    def label(self) -> str:
+        return REGIME_LABELS[int(self.value)]
+
+    def update(self, close: float) -> float:
+        if len(self._last):
+            self._signs.push(float(np.sign(close - self._last.newest())))
+        self._last.push(close)
+        self.count += 1
+        if self.count < self.window + 1:
+            return self.value
+        s = self._signs.sum if self.window > 1 else 0.0
+        self.value = float(REGIME_UP if s >= 2 else REGIME_DOWN if s <= -2 else REGIME_SIDEWAYS)
+        return self.value
+
+
+INDICATOR_KINDS: Dict[str, Type[StreamingIndicator]] = {
+    cls.kind: cls for cls in (StreamingSMA, StreamingEMA, StreamingRSI, StreamingMomentum, StreamingRegime)
+}
+
+
+class StreamSet:
+    """Named streaming indicators for one series plus a timestamp cursor.
+
+    ``update`` ignores bars at or before the last one seen, so callers can
+    re-fetch from ``last_ts`` without double counting.
+    """
+
+    def __init__(self, indicators: Dict[str, StreamingIndicator]) -> None:
+        self.indicators = indicators
+        self.last_ts: Optional[str] = None
+        self.last_close: Optional[float] = None
+
+    def update(self, ts: str, close: float) -> bool:
+        if self.last_ts is not None and ts <= self.last_ts:
+            return False
+        for ind in self.indicators.values():
+            ind.update(close)
+        self.last_ts = ts
+        self.last_close = close
+        return True
+
+    def update_many(self, bars: Iterable[Dict[str, Any]], field: str = "close") -> int:
+        """Feed row dicts (``ts`` + ``field``) in order; returns the number of new bars."""
+        return sum(1 for bar in bars if self.update(bar["ts"], bar[field]))
+
+    def __getitem__(self, name: str) -> StreamingIndicator:
+        return self.indicators[name]
+
+    def values(self) -> Dict[str, float]:
+        return {name: ind.value for name, ind in self.indicators.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "last_ts": self.last_ts,
+            "last_close": self.last_close,
+            "indicators": {name: ind.snapshot() for name, ind in self.indicators.items()},
+        }
+
+    @classmethod
+    def restore(cls, state: Dict[str, Any]) -> "StreamSet":
+        s = cls({name: StreamingIndicator.from_snapshot(ind) for name, ind in state["indicators"].items()})
+        s.last_ts = state.get("last_ts")
+        s.last_close = state.get("last_close")
+        return s
@@ -0,0 +1,368 @@
+"""Push-based OHLCV bar subscriptions.
+
+``md.subscribe_bars(symbols, interval)`` on an ``OhlcvCache`` (or
+``subscribe_bars(md, ...)`` on any market-data client) returns a
+``BarSubscription``: an async iterator over closed bars, in timestamp order
+per symbol::
+
+    async with md.subscribe_bars(["AAPL", "MSFT"], "1m") as bars:
+        async for bar in bars:
+            ...
+
+The bars come from a ``BarFeed``:
+
+- ``WebSocketBarFeed`` reads a streaming endpoint (``MARKET_DATA_STREAM_URL``).
+  It sends ``{"action": "subscribe", "symbols": [...], "interval": "1m"}``
+  and then expects JSON messages that are either one bar
+  (``{"symbol", "ts", "open", "high", "low", "close", "volume"}``) or a
+  batch (``{"bars": [...]}``). It reconnects with backoff. Bars missed while
+  it was disconnected are backfilled like any other gap. A message or bar
+  that does not decode is logged, counted in ``malformed`` and skipped.
+- ``PollingBarFeed`` asks ``market-data.get_ohlcv`` for the bars after the
+  last one it saw, every ``poll_seconds``, up to the last closed bar. It is the default when no stream
+  is configured, so agents still run against a host without streaming.
+- ``LocalBarFeed`` is an in-process stand-in for tests and benchmarks.
+  ``await feed.publish(bar, interval)`` hands the bar to every open
+  subscription.
+
+A subscription remembers the last timestamp per symbol and drops duplicates
+and out-of-order bars. When a bar arrives more than one interval after the
+previous one, the missing range is fetched from ``market-data.get_ohlcv``
+and delivered first. When the subscription was opened through an
+``OhlcvCache``, that fetch goes through the cache. With ``since``, the first
+bar of each symbol is also preceded by the history from ``since``. Closed
+markets show up as gaps whose backfill returns nothing.
+
+Each subscription has its own bounded buffer of ``buffer`` bars. With
+``overflow="block"`` a slow consumer holds up its feed. With
+``"drop_oldest"`` the oldest buffered bar is discarded and counted in
+``stats.dropped``.
+"""
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+from dataclasses import asdict, dataclass
+import asyncio
+import json
+import os
+import time
+import websockets
+
+from .client import MCPClient, HttpMCPClient, get_host_base
+from .frames import INTERVAL_MS, format_ts, parse_ts
+from .metrics import REGISTRY
+
+OVERFLOW_POLICIES = ("block", "drop_oldest")
+
+BARS = REGISTRY.counter("bar_subscription_bars_total", "Bars by outcome: delivered, backfilled, duplicate, dropped, malformed", ("outcome",))
+
+
+class Bar(NamedTuple):
+    symbol: str
+    ts: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    @classmethod
+    def from_row(cls, symbol: str, row: Dict[str, Any]) -> "Bar":
+        return cls(symbol, row["ts"], float(row["open"]), float(row["high"]), float(row["low"]), float(row["close"]), float(row["volume"]))
+
+    def row(self) -> Dict[str, Any]:
+        """``get_ohlcv``-style row, e.g. for ``StreamSet.update_many``."""
+        return {"ts": self.ts, "open": self.open, "high": self.high, "low": self.low, "close": self.close, "volume": self.volume}
+
+
+@dataclass
+class SubscriptionStats:
+    received: int = 0
+    delivered: int = 0
+    duplicates: int = 0
+    gaps: int = 0
+    backfilled: int = 0
+    backfill_failed: int = 0
+    dropped: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+Emit = Callable[[Bar], Awaitable[None]]
+
+
+class BarFeed:
+    """Source of bars for a ``BarSubscription``."""
+
+    async def run(self, symbols: Sequence[str], interval: str, emit: Emit) -> None:
+        """Pass bars for ``symbols`` to ``emit`` until cancelled."""
+        raise NotImplementedError
+
+
+class LocalBarFeed(BarFeed):
+    """In-process feed: ``publish`` delivers straight into the open subscriptions."""
+
+    def __init__(self) -> None:
+        self._subscribers: List[Tuple[Set[str], str, Emit]] = []
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def run(self, symbols: Sequence[str], interval: str, emit: Emit) -> None:
+        entry = (set(symbols), interval, emit)
+        self._subscribers.append(entry)
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            self._subscribers.remove(entry)
+
+    async def publish(self, bar: Bar, interval: str) -> None:
+        for symbols, iv, emit in list(self._subscribers):
+            if iv == interval and bar.symbol in symbols:
+                await emit(bar)
+
+
+class PollingBarFeed(BarFeed):
+    """Incremental ``get_ohlcv`` polls of closed bars; starts with the last ``lookback`` of them."""
+
+    def __init__(self, client: MCPClient, poll_seconds: float = 5.0, lookback: int = 1, concurrency: int = 32) -> None:
+        self.client = client
+        self.poll_seconds = poll_seconds
+        self.lookback = lookback
+        self.concurrency = concurrency
+
+    async def run(self, symbols: Sequence[str], interval: str, emit: Emit) -> None:
+        step = INTERVAL_MS[interval]
+        last: Dict[str, int] = {}
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def poll(symbol: str, closed: int) -> List[Bar]:
+            start = last[symbol] + step if symbol in last else closed - (self.lookback - 1) * step
+            if start > closed:
+                return []
+            # the bar starting at ``closed`` is the last one that has closed
+            payload = {"symbol": symbol, "start": format_ts(start), "end": format_ts(closed), "interval": interval}
+            async with sem:
+                rows = (await self.client.call("market-data.get_ohlcv", payload)).get("rows", [])
+            return [Bar.from_row(symbol, r) for r in rows if parse_ts(r["ts"]) <= closed]
+
+        while True:
+            closed = int(time.time() * 1000) // step * step - step
+            results = await asyncio.gather(*(poll(s, closed) for s in symbols), return_exceptions=True)
+            for symbol, res in zip(symbols, results):
+                if isinstance(res, BaseException):
+                    print({"bar_feed": "poll_failed", "symbol": symbol, "error": repr(res)})
+                    continue
+                for bar in res:
+                    last[symbol] = max(last.get(symbol, 0), parse_ts(bar.ts))
+                    await emit(bar)
+            await asyncio.sleep(self.poll_seconds)
+
+
+class WebSocketBarFeed(BarFeed):
+    """Bars pushed over a websocket; see the module docstring for the protocol."""
+
+    def __init__(self, url: str, min_backoff: float = 0.5, max_backoff: float = 30.0) -> None:
+        self.url = url
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.malformed = 0
+
+    def _decode(self, message: Union[str, bytes]) -> List[Bar]:
+        """The bars in one message; malformed ones are logged, counted and left out."""
+        try:
+            data = json.loads(message)
+            rows = data.get("bars", [data])
+            if not isinstance(rows, list):
+                raise TypeError(f"bars is {type(rows).__name__}, not a list")
+        except (ValueError, TypeError, AttributeError) as err:  # not JSON, not an object, or no bar list
+            self._skip(message, err)
+            return []
+        bars: List[Bar] = []
+        for row in rows:
+            try:
+                # normalize so timestamps compare equal to cached and backfilled rows
+                bars.append(Bar.from_row(row["symbol"], {**row, "ts": format_ts(parse_ts(row["ts"]))}))
+            except (KeyError, TypeError, ValueError, AttributeError) as err:
+                self._skip(row, err)
+        return bars
+
+    def _skip(self, message: Any, err: BaseException) -> None:
+        self.malformed += 1
+        BARS.inc("malformed")
+        print({"bar_feed": "malformed", "url": self.url, "error": repr(err), "message": str(message)[:200]})
+
+    async def run(self, symbols: Sequence[str], interval: str, emit: Emit) -> None:
+        delay = self.min_backoff
+        while True:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    await ws.send(json.dumps({"action": "subscribe", "symbols": list(symbols), "interval": interval}))
+                    delay = self.min_backoff
+                    async for message in ws:
+                        for bar in self._decode(message):
+                            await emit(bar)
+            except (OSError, websockets.WebSocketException) as err:
+                print({"bar_feed": "disconnected", "url": self.url, "error": repr(err), "retry_in": delay})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+
+class BarSubscription:
+    """Gap-free, deduplicated bars from ``feed`` behind a bounded buffer.
+
+    ``backfill`` is the market-data client used to fill gaps (none: gaps are
+    only counted). ``since`` is an ISO date, or one per symbol, to backfill
+    from before the first bar.
+    """
+
+    def __init__(
+        self,
+        feed: BarFeed,
+        symbols: Sequence[str],
+        interval: str,
+        backfill: Optional[MCPClient] = None,
+        since: Union[None, str, Dict[str, str]] = None,
+        buffer: int = 10_000,
+        overflow: str = "block",
+    ) -> None:
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"unknown interval {interval!r}")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow!r}")
+        self.feed = feed
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.step = INTERVAL_MS[interval]
+        self.backfill = backfill
+        self.since = since
+        self.overflow = overflow
+        self.last_ms: Dict[str, int] = {}
+        self.stats = SubscriptionStats()
+        self._wanted = set(self.symbols)
+        self._queue: "asyncio.Queue[Optional[Bar]]" = asyncio.Queue(buffer)
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+    @property
+    def buffered(self) -> int:
+        return self._queue.qsize()
+
+    async def start(self) -> None:
+        if self._task is None and not self._closed:
+            self._task = asyncio.ensure_future(self._pump())
+            await asyncio.sleep(0)  # let the feed attach before the caller publishes
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+        if self._queue.full():
+            self._queue.get_nowait()  # room for the end marker; the consumer is going away
+        self._queue.put_nowait(None)
+
+    async def __aenter__(self) -> "BarSubscription":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __aiter__(self) -> "BarSubscription":
+        return self
+
+    async def __anext__(self) -> Bar:
+        await self.start()
+        bar = await self._queue.get()
+        if bar is None:
+            self._queue.put_nowait(None)
+            if self._error is not None:
+                raise self._error
+            raise StopAsyncIteration
+        self.stats.delivered += 1
+        BARS.inc("delivered")
+        return bar
+
+    async def batches(self, max_bars: int = 1000) -> AsyncIterator[List[Bar]]:
+        """Everything buffered, at least one bar and at most ``max_bars`` at a time."""
+        async for bar in self:
+            out = [bar]
+            while len(out) < max_bars and not self._queue.empty():
+                nxt = self._queue.get_nowait()
+                if nxt is None:
+                    self._queue.put_nowait(None)
+                    break
+                out.append(nxt)
+            self.stats.delivered += len(out) - 1
+            BARS.inc("delivered", amount=len(out) - 1)
+            yield out
+
+    async def _pump(self) -> None:
+        try:
+            await self.feed.run(self.symbols, self.interval, self._emit)
+        except asyncio.CancelledError:
+            return
+        except Exception as err:
+            self._error = err
+        self.close()
+
+    async def _emit(self, bar: Bar) -> None:
+        if bar.symbol not in self._wanted:
+            return
+        self.stats.received += 1
+        ms = parse_ts(bar.ts)
+        last = self.last_ms.get(bar.symbol)
+        if last is None:
+            since = self.since.get(bar.symbol) if isinstance(self.since, dict) else self.since
+            if since is not None and parse_ts(since) < ms:
+                await self._backfill(bar.symbol, parse_ts(since), ms - 1)
+        elif ms <= last:
+            self.stats.duplicates += 1
+            BARS.inc("duplicate")
+            return
+        elif ms - last > self.step:
+            self.stats.gaps += 1
+            await self._backfill(bar.symbol, last + 1, ms - 1)
+        self.last_ms[bar.symbol] = ms
+        await self._put(bar)
+
+    async def _backfill(self, symbol: str, lo: int, hi: int) -> None:
+        if self.backfill is None:
+            return
+        payload = {"symbol": symbol, "start": format_ts(lo), "end": format_ts(hi), "interval": self.interval}
+        try:
+            rows = (await self.backfill.call("market-data.get_ohlcv", payload)).get("rows", [])
+        except Exception as err:
+            self.stats.backfill_failed += 1
+            print({"bar_subscription": "backfill_failed", "symbol": symbol, "start": payload["start"], "error": repr(err)})
+            return
+        for row in rows:
+            ms = parse_ts(row["ts"])
+            if lo <= ms <= hi:
+                self.last_ms[symbol] = ms
+                self.stats.backfilled += 1
+                BARS.inc("backfilled")
+                await self._put(Bar.from_row(symbol, row))
+
+    async def _put(self, bar: Bar) -> None:
+        if self.overflow == "drop_oldest" and self._queue.full():
+            self._queue.get_nowait()
+            self.stats.dropped += 1
+            BARS.inc("dropped")
+        await self._queue.put(bar)
+
+
+def default_bar_feed() -> BarFeed:
+    """``WebSocketBarFeed`` on ``MARKET_DATA_STREAM_URL`` if set, else polling every ``BAR_POLL_SECONDS`` (default 5)."""
+    url = os.environ.get("MARKET_DATA_STREAM_URL")
+    if url:
+        return WebSocketBarFeed(url)
+    return PollingBarFeed(HttpMCPClient(get_host_base(), "market-data"), float(os.environ.get("BAR_POLL_SECONDS", 5)))
+
+
+def subscribe_bars(md: MCPClient, symbols: Sequence[str], interval: str, feed: Optional[BarFeed] = None, **kwargs: Any) -> BarSubscription:
+    """Subscription on ``feed`` (default: ``default_bar_feed()``) that backfills gaps through ``md``."""
+    return BarSubscription(feed or default_bar_feed(), symbols, interval, backfill=md, **kwargs)
@@ -0,0 +1,144 @@
+from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+import asyncio
+import os
+import socket
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool settings shared by every HttpMCPClient talking to one host."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    timeout: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        return cls(
+            max_connections=int(os.environ.get("MCP_POOL_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive_connections=int(os.environ.get("MCP_POOL_MAX_KEEPALIVE", cls.max_keepalive_connections)),
+            keepalive_expiry=float(os.environ.get("MCP_POOL_KEEPALIVE_EXPIRY", cls.keepalive_expiry)),
+            timeout=float(os.environ.get("MCP_TIMEOUT", cls.timeout)),
+            http2=os.environ.get("MCP_HTTP2", "false").lower() == "true",
+        )
+
+
+def agent_headers() -> Dict[str, str]:
+    """Agent identity headers derived from AGENT_ID/AGENT_ROLE/API_KEY/TRACE_ID.
+
+    ``TRACE_ID`` only applies to calls made outside a ``metrics.start_span``;
+    agent ticks send their own trace per request.
+    """
+    headers: Dict[str, str] = {}
+    agent_id = os.environ.get("AGENT_ID")
+    agent_role = os.environ.get("AGENT_ROLE")
+    api_key = os.environ.get("API_KEY")
+    trace_id = os.environ.get("TRACE_ID")
+    if agent_id:
+        headers["x-agent-id"] = agent_id
+    if agent_role:
+        headers["x-agent-role"] = agent_role
+    if api_key:
+        headers["authorization"] = f"Bearer {api_key}"
+    if trace_id:
+        headers["x-correlation-id"] = trace_id
+    return headers
+
+
+class TransportPool:
+    """Process-wide registry of pooled ``httpx.AsyncClient`` instances, one per host.
+
+    Clients are bound to the event loop that created them; a client requested
+    from a different (or closed) loop is replaced transparently. The replaced
+    client is closed on its own loop if that loop is still running; otherwise
+    its pooled sockets are shut down directly, since nothing can await there.
+    """
+
+    def __init__(self, config: Optional[PoolConfig] = None) -> None:
+        self._config = config
+        self._clients: Dict[str, Tuple[Any, asyncio.AbstractEventLoop]] = {}
+        self._warned_h2 = False
+
+    @property
+    def config(self) -> PoolConfig:
+        if self._config is None:
+            self._config = PoolConfig.from_env()
+        return self._config
+
+    def configure(self, config: PoolConfig) -> None:
+        """Set pool limits; applies to clients created after this call."""
+        self._config = config
+
+    def get(self, host_base: str) -> Any:
+        import httpx
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(host_base)
+        if entry is not None:
+            client, owner = entry
+            if owner is loop and not client.is_closed:
+                return client
+            _close_stale(client, owner)
+        cfg = self.config
+        http2 = cfg.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                http2 = False
+                if not self._warned_h2:
+                    self._warned_h2 = True
+                    print({"transport": "http2_unavailable", "detail": "h2 is not installed, using HTTP/1.1; install the http2 extra"})
+        client = httpx.AsyncClient(
+            base_url=host_base,
+            headers=agent_headers(),
+            timeout=cfg.timeout,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+            ),
+        )
+        self._clients[host_base] = (client, loop)
+        return client
+
+    async def aclose(self) -> None:
+        """Close every pooled client owned by the running loop."""
+        loop = asyncio.get_running_loop()
+        for host, (client, owner) in list(self._clients.items()):
+            if owner is loop:
+                del self._clients[host]
+                await client.aclose()
+
+
+def _close_stale(client: Any, owner: asyncio.AbstractEventLoop) -> None:
+    """Release a client whose loop is no longer the caller's."""
+    if client.is_closed:
+        return
+    if owner.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+        return
+    # the owner loop has stopped: its transports cannot be closed through it,
+    # so shut the sockets down and let the server see the connections go
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    for conn in getattr(pool, "connections", []):
+        stream = getattr(getattr(conn, "_connection", None), "_network_stream", None)
+        sock = stream.get_extra_info("socket") if stream is not None else None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+_POOL = TransportPool()
+
+
+def get_transport_pool() -> TransportPool:
+    return _POOL
+
+
+async def close_transports() -> None:
+    await _POOL.aclose()
@@ -0,0 +1,236 @@
+"""Run per-symbol agent work across a large universe each heartbeat.
+
+Symbols are sharded by a stable hash so several processes or hosts can split
+one universe (``SHARD_INDEX``/``SHARD_COUNT``), ordered by priority (staleness
+by default) and processed with bounded concurrency. Each cycle produces a
+``CycleReport`` with its duration and the symbols that failed, were skipped
+for lack of time, or finished after the cycle budget.
+
+With ``stream_bars`` an agent that overrides ``subscribe``/``on_bars`` runs
+event-driven instead: each batch of pushed bars runs as a cycle over the
+symbols it touches, without a cycle budget.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from dataclasses import dataclass, field
+import asyncio
+import multiprocessing
+import os
+import time
+import zlib
+from pydantic import Field
+
+from .agent import AgentConfig, BaseAgent
+from .client import MCPClient
+from .frames import INTERVAL_MS, format_ts, parse_ts
+from .metrics import start_span
+from .subscribe import Bar, BarSubscription
+
+
+def shard_symbols(symbols: Sequence[str], shard_index: int, shard_count: int) -> List[str]:
+    """Symbols owned by ``shard_index``; stable across processes and restarts."""
+    if shard_count <= 1:
+        return list(symbols)
+    return [s for s in symbols if zlib.crc32(s.encode()) % shard_count == shard_index]
+
+
+@dataclass
+class CycleReport:
+    started_at: float
+    duration: float = 0.0
+    completed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    late: List[str] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "duration": round(self.duration, 4),
+            "completed": len(self.completed),
+            "failed": len(self.failed),
+            "skipped": len(self.skipped),
+            "late": len(self.late),
+        }
+
+
+class UniverseRunner:
+    """Bounded-concurrency fan-out of ``work(symbol)`` over a symbol shard.
+
+    ``priority`` maps a symbol to a score (higher runs first); without it the
+    least recently completed symbols go first. When ``cycle_budget`` is set,
+    symbols not started by then are skipped and those finishing after it
+    are reported late.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        work: Callable[[str], Awaitable[None]],
+        concurrency: int = 32,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        cycle_budget: Optional[float] = None,
+        priority: Optional[Callable[[str], float]] = None,
+    ) -> None:
+        self.symbols = shard_symbols(symbols, shard_index, shard_count)
+        self.work = work
+        self.concurrency = concurrency
+        self.cycle_budget = cycle_budget
+        self.priority = priority
+        self.last_done: Dict[str, float] = {}
+
+    def order(self) -> List[str]:
+        if self.priority is not None:
+            return sorted(self.symbols, key=self.priority, reverse=True)
+        return sorted(self.symbols, key=lambda s: self.last_done.get(s, float("-inf")))
+
+    async def run_cycle(
+        self,
+        symbols: Optional[Sequence[str]] = None,
+        work: Optional[Callable[[str], Awaitable[None]]] = None,
+        budget: bool = True,
+    ) -> CycleReport:
+        """Run ``work`` (default ``self.work``) over ``symbols`` (default the ordered shard)."""
+        report = CycleReport(started_at=time.time())
+        work = work or self.work
+        t0 = time.monotonic()
+        deadline = t0 + self.cycle_budget if self.cycle_budget and budget else None
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def one(symbol: str) -> None:
+            async with sem:
+                if deadline is not None and time.monotonic() >= deadline:
+                    report.skipped.append(symbol)
+                    return
+                try:
+                    await work(symbol)
+                except Exception as err:
+                    report.failed[symbol] = repr(err)
+                    return
+                now = time.monotonic()
+                self.last_done[symbol] = now
+                report.completed.append(symbol)
+                if deadline is not None and now > deadline:
+                    report.late.append(symbol)
+
+        await asyncio.gather(*(one(s) for s in (self.order() if symbols is None else symbols)))
+        report.duration = time.monotonic() - t0
+        return report
+
+
+def _env_symbols() -> List[str]:
+    return [s.strip() for s in os.environ.get("SYMBOLS", "AAPL").split(",") if s.strip()]
+
+
+class UniverseConfig(AgentConfig):
+    symbols: List[str] = Field(default_factory=_env_symbols)
+    concurrency: int = Field(default=32, ge=1)
+    shard_index: int = Field(default_factory=lambda: int(os.environ.get("SHARD_INDEX", 0)), ge=0)
+    shard_count: int = Field(default_factory=lambda: int(os.environ.get("SHARD_COUNT", 1)), ge=1)
+    cycle_budget_seconds: Optional[float] = None
+    stream_bars: bool = Field(default_factory=lambda: os.environ.get("STREAM_BARS", "false").lower() == "true")
+    bar_interval: str = Field(default_factory=lambda: os.environ.get("BAR_INTERVAL", "1d"))
+
+
+class UniverseAgent(BaseAgent):
+    """Agent whose tick runs ``tick_symbol`` for every symbol in its shard.
+
+    When ``subscribe`` returns a subscription, ``run`` consumes it instead of
+    ticking and hands each symbol's new bars to ``on_bars``.
+    """
+
+    def __init__(self, config: UniverseConfig, client: MCPClient) -> None:
+        super().__init__(config, client)
+        self.config: UniverseConfig = config
+        has_priority = type(self).priority is not UniverseAgent.priority
+        self.runner = UniverseRunner(
+            config.symbols,
+            self.tick_symbol,
+            concurrency=config.concurrency,
+            shard_index=config.shard_index,
+            shard_count=config.shard_count,
+            cycle_budget=config.cycle_budget_seconds,
+            priority=self.priority if has_priority else None,
+        )
+        self.last_report: Optional[CycleReport] = None
+        self.subscription: Optional[BarSubscription] = None
+
+    async def tick_symbol(self, symbol: str) -> None:
+        """Override with the per-symbol unit of work."""
+        raise NotImplementedError
+
+    def priority(self, symbol: str) -> float:
+        """Override to order symbols (higher first), e.g. by recent volatility."""
+        return 0.0
+
+    def subscribe(self) -> Optional[BarSubscription]:
+        """Override to run event-driven, e.g. ``self.md.subscribe_bars(self.runner.symbols, ...)``; called after ``setup``."""
+        return None
+
+    def bars_since(self, warmup: int) -> Dict[str, str]:
+        """Per-symbol ``since`` for ``subscribe_bars``.
+
+        The bar after the ``last_ts`` of the symbol's stream (live or restored
+        from saved state), else the start of the last ``warmup`` closed bars.
+        """
+        step = INTERVAL_MS[self.config.bar_interval]
+        fresh = format_ts(int(time.time() * 1000) // step * step - warmup * step)
+        out: Dict[str, str] = {}
+        for symbol in self.runner.symbols:
+            live = self.streams.get(symbol)
+            last = live.last_ts if live is not None else self._saved_streams.get(symbol, {}).get("last_ts")
+            out[symbol] = format_ts(parse_ts(last) + step) if last else fresh
+        return out
+
+    async def on_bars(self, symbol: str, rows: List[Dict[str, Any]]) -> None:
+        """Override with the handling of new bars (``get_ohlcv``-style rows, oldest first)."""
+        raise NotImplementedError
+
+    async def on_batch(self, bars: Sequence[Bar]) -> None:
+        by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        for bar in bars:
+            by_symbol.setdefault(bar.symbol, []).append(bar.row())
+        self.last_report = await self.runner.run_cycle(list(by_symbol), lambda s: self.on_bars(s, by_symbol[s]), budget=False)
+
+    async def tick(self) -> None:
+        self.last_report = await self.runner.run_cycle()
+
+    async def _serve(self) -> None:
+        sub = self.subscribe()
+        if sub is None:
+            return await super()._serve()
+        self.subscription = sub
+        if self._stop_event.is_set():
+            return
+        async with sub:
+            async for bars in sub.batches():
+                if self._stop_event.is_set():
+                    break
+                with start_span():
+                    await self.on_batch(bars)
+                self._count_tick()
+
+    def stop(self) -> None:
+        super().stop()
+        if self.subscription is not None:
+            self.subscription.close()
+
+
+def _run_shard(factory: Callable[[int, int], BaseAgent], shard_index: int, shard_count: int) -> None:
+    asyncio.run(factory(shard_index, shard_count).run())
+
+
+def run_sharded(factory: Callable[[int, int], BaseAgent], shard_count: int) -> None:
+    """Run ``factory(shard_index, shard_count)`` agents in one process per shard.
+
+    ``factory`` must be picklable (a module-level function).
+    """
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_run_shard, args=(factory, i, shard_count), daemon=True) for i in range(shard_count)]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
@@ -0,0 +1,68 @@
+"""OhlcvCache coverage and on-disk persistence, against a fake market-data client."""
+import asyncio
+import os
+
+import numpy as np
+
+from swarm_agent_sdk.cache import OhlcvCache
+from swarm_agent_sdk.client import MCPClient
+from swarm_agent_sdk.frames import format_ts, parse_ts
+
+DAY = 86_400_000
+NOW = parse_ts("2024-02-01T00:00:00.000Z") / 1000
+
+
+def market_data(calls):
+    client = MCPClient()
+
+    def get_ohlcv(p):
+        calls.append((p["start"], p["end"]))
+        lo, hi = parse_ts(p["start"]), parse_ts(p["end"])
+        rows = []
+        for ts in range(-(-lo // DAY) * DAY, hi + 1, DAY):
+            px = 100.0 + ts / DAY % 7
+            rows.append({"ts": format_ts(ts), "open": px, "high": px + 1, "low": px - 1, "close": px, "volume": 1000.0})
+        return {"rows": rows}
+
+    client.register_tool("market-data.get_ohlcv", get_ohlcv, mode="inline")
+    return client
+
+
+def get(cache, start="2024-01-01", end="2024-01-10"):
+    return asyncio.run(cache.get_frame("AAPL", start, end, "1d"))
+
+
+def test_second_request_is_a_hit():
+    calls = []
+    cache = OhlcvCache(market_data(calls), clock=lambda: NOW)
+    first = get(cache)
+    assert len(first) == 10 and len(calls) == 1
+    assert get(cache).to_rows() == first.to_rows()
+    assert len(calls) == 1 and cache.stats.hits == 1
+
+
+def test_forming_bar_is_refetched():
+    calls = []
+    # mid-session on 2024-01-10: that day's bar is still forming
+    cache = OhlcvCache(market_data(calls), clock=lambda: (parse_ts("2024-01-10T12:00:00.000Z")) / 1000)
+    get(cache)
+    get(cache)
+    assert len(calls) == 2 and calls[1][0].startswith("2024-01-10")
+
+
+def test_sibling_cache_starts_warm_from_disk(tmp_path):
+    calls = []
+    rows = get(OhlcvCache(market_data(calls), cache_dir=str(tmp_path), clock=lambda: NOW)).to_rows()
+    warm = OhlcvCache(market_data(calls), cache_dir=str(tmp_path), clock=lambda: NOW)
+    assert get(warm).to_rows() == rows
+    assert len(calls) == 1 and warm.stats.disk_loads == 1
+
+
+def test_torn_series_on_disk_is_a_miss(tmp_path):
+    calls = []
+    get(OhlcvCache(market_data(calls), cache_dir=str(tmp_path), clock=lambda: NOW))
+    # a close column from some other write, shorter than ts
+    np.save(os.path.join(tmp_path, "1d", "AAPL", "close.npy"), np.zeros(3))
+    cold = OhlcvCache(market_data(calls), cache_dir=str(tmp_path), clock=lambda: NOW)
+    assert len(get(cold)) == 10
+    assert len(calls) == 2 and cold.stats.disk_loads == 0
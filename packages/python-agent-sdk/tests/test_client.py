@@ -0,0 +1,55 @@
+"""HttpMCPClient.call_many batching, against a fake batch endpoint."""
+import asyncio
+
+import httpx
+import pytest
+
+from swarm_agent_sdk.client import HttpMCPClient
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self._body = body
+
+    def json(self):
+        return self._body
+
+
+class FakeHost(HttpMCPClient):
+    """Answers ``/call/{service}`` in-process; records the size of each batch request."""
+
+    def __init__(self, batch: bool = True) -> None:
+        super().__init__("http://host", "svc")
+        self.batch = batch
+        self.batches = []
+        self.singles = 0
+
+    async def _post(self, tool_name, headers=None, **kwargs):
+        body = kwargs["json"]
+        if tool_name == "batch":
+            if not self.batch:
+                request = httpx.Request("POST", "http://host/call/svc")
+                raise httpx.HTTPStatusError("not found", request=request, response=httpx.Response(404, request=request))
+            self.batches.append(len(body["calls"]))
+            return FakeResponse({"results": [{"ok": True, "output": c["input"]["i"]} for c in body["calls"]]})
+        self.singles += 1
+        return FakeResponse(body["input"]["i"])
+
+
+def calls(n):
+    return [("svc.echo", {"i": i}) for i in range(n)]
+
+
+@pytest.mark.parametrize("concurrency, sizes", [(8, [8, 8, 4]), (5, [5, 5, 5, 5]), (None, [20]), (32, [20])])
+def test_batches_hold_at_most_concurrency_calls(concurrency, sizes):
+    host = FakeHost()
+    results = asyncio.run(host.call_many(calls(20), concurrency=concurrency))
+    assert host.batches == sizes
+    assert [r.unwrap() for r in results] == list(range(20))
+
+
+def test_host_without_batches_falls_back_once():
+    host = FakeHost(batch=False)
+    results = asyncio.run(host.call_many(calls(20), concurrency=8))
+    assert [r.unwrap() for r in results] == list(range(20))
+    assert host.batches == [] and host.singles == 20 and not host._batch_supported
@@ -0,0 +1,83 @@
+"""FeatureWriter spooling: replay after a crash and adoption of orphaned fallback spools."""
+import asyncio
+import json
+import os
+
+from swarm_agent_sdk.client import MCPClient
+from swarm_agent_sdk.features import FeatureWriter, _lock_spool
+
+
+def feature_store(written):
+    client = MCPClient()
+
+    def write_columnar(p):
+        written.append(p["nrows"])
+        return {"written": p["nrows"]}
+
+    client.register_tool("feature-store.write_features_columnar", write_columnar, mode="inline")
+    return client
+
+
+def row(ts, value=1.0):
+    return {"ts": ts, "symbol": "AAPL", "feature_set": "fs", "feature_name": "x", "value": value, "ver": "v1"}
+
+
+def spool(path, *rows):
+    with open(path, "w") as f:
+        for r in rows:
+            f.write(json.dumps({"feature_set": "fs", "rows": [r]}) + "\n")
+
+
+def run(writer):
+    async def go():
+        await writer.write("fs", [])  # opens the spool and replays it
+        try:
+            return await writer.flush()
+        finally:
+            await writer.aclose()
+    return asyncio.run(go())
+
+
+def test_spool_is_replayed_on_start(tmp_path):
+    path = str(tmp_path / "features.jsonl")
+    spool(path, row("t1"), row("t2"))
+    with open(path, "a") as f:
+        f.write('{"feature_set": "fs", "ro')  # torn last line
+    written = []
+    writer = FeatureWriter(feature_store(written), spool_path=path)
+    assert run(writer) == 2
+    assert writer.stats.replayed == 2 and written == [2]
+    assert open(path).read() == ""
+
+
+def test_orphaned_fallback_spool_is_adopted(tmp_path):
+    path = str(tmp_path / "features.jsonl")
+    spool(f"{path}.4242", row("t1"), row("t2", 2.0))
+    written = []
+    writer = FeatureWriter(feature_store(written), spool_path=path)
+    assert run(writer) == 2
+    assert writer.stats.replayed == 2
+    assert not os.path.exists(f"{path}.4242") and not os.path.exists(f"{path}.4242.lock")
+
+
+def test_live_fallback_spool_is_left_alone(tmp_path):
+    path = str(tmp_path / "features.jsonl")
+    spool(f"{path}.4242", row("t1"))
+    held = _lock_spool(f"{path}.4242")  # its process is still running
+    try:
+        writer = FeatureWriter(feature_store([]), spool_path=path)
+        assert run(writer) == 0
+        assert writer.stats.replayed == 0 and os.path.exists(f"{path}.4242")
+    finally:
+        held.close()
+
+
+def test_second_writer_falls_back_to_a_pid_spool(tmp_path):
+    path = str(tmp_path / "features.jsonl")
+    owner = _lock_spool(path)
+    try:
+        writer = FeatureWriter(feature_store([]), spool_path=path)
+        run(writer)
+        assert writer.spool_path == f"{path}.{os.getpid()}"
+    finally:
+        owner.close()
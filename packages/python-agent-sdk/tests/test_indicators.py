@@ -0,0 +1,107 @@
+"""Parity of the vectorized indicators with the agents' original scalar helpers."""
+from typing import List
+import random
+
+import numpy as np
+import pytest
+
+from swarm_agent_sdk.indicators import momentum, regime, regime_labels, rsi, sma
+
+
+# the helpers signal-agent and trend-agent used before swarm_agent_sdk.indicators
+
+def ref_rsi(values: List[float], period: int = 5) -> float:
+    if len(values) < period + 1:
+        return 50.0
+    gains = []
+    losses = []
+    for i in range(1, period + 1):
+        delta = values[-i] - values[-i-1]
+        gains.append(max(delta, 0))
+        losses.append(max(-delta, 0))
+    avg_gain = sum(gains) / period
+    avg_loss = sum(losses) / period if sum(losses) > 0 else 1e-9
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def ref_sma(values: List[float], period: int) -> float:
+    if len(values) < period:
+        return sum(values) / max(len(values), 1)
+    return sum(values[-period:]) / period
+
+
+def ref_momentum(values: List[float], lookback: int = 3) -> float:
+    if len(values) < lookback + 1:
+        return 0.0
+    return values[-1] - values[-1 - lookback]
+
+
+def ref_regime(values: List[float], window: int = 5) -> str:
+    if len(values) < window + 1:
+        return "neutral"
+    diffs = [values[i] - values[i-1] for i in range(-window+1, 0)]
+    s = sum(1 for d in diffs if d > 0) - sum(1 for d in diffs if d < 0)
+    if s >= 2:
+        return "UP"
+    if s <= -2:
+        return "DOWN"
+    return "SIDEWAYS"
+
+
+def series(n: int, seed: int = 0) -> List[float]:
+    rng = random.Random(seed)
+    out, price = [], 100.0
+    for _ in range(n):
+        # rounded prices give flat bars, which exercise the zero-loss and zero-delta branches
+        price = round(price + rng.uniform(-1, 1), 1)
+        out.append(price)
+    return out
+
+
+LENGTHS = [0, 1, 2, 4, 5, 6, 9, 10, 11, 40]
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+@pytest.mark.parametrize("period", [1, 5, 14])
+def test_rsi_matches_scalar(n, period):
+    closes = series(n, seed=n)
+    expected = [ref_rsi(closes[:t + 1], period) for t in range(n)]
+    assert rsi(closes, period).tolist() == expected
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+@pytest.mark.parametrize("period", [1, 5, 10])
+def test_sma_matches_scalar(n, period):
+    closes = series(n, seed=n)
+    expected = [ref_sma(closes[:t + 1], period) for t in range(n)]
+    assert sma(closes, period).tolist() == expected
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+@pytest.mark.parametrize("lookback", [1, 3, 5, 10])
+def test_momentum_matches_scalar(n, lookback):
+    closes = series(n, seed=n)
+    expected = [ref_momentum(closes[:t + 1], lookback) for t in range(n)]
+    assert momentum(closes, lookback).tolist() == expected
+
+
+def test_momentum_short_history():
+    assert momentum([1.0] * 4, 5).tolist() == [0.0] * 4
+    assert momentum([1.0] * 6, 10).tolist() == [0.0] * 6
+
+
+@pytest.mark.parametrize("n", LENGTHS)
+@pytest.mark.parametrize("window", [2, 5, 8])
+def test_regime_matches_scalar(n, window):
+    closes = series(n, seed=n)
+    expected = [ref_regime(closes[:t + 1], window) for t in range(n)]
+    assert regime_labels(regime(closes, window)).tolist() == expected
+
+
+def test_matrix_rows_match_series():
+    closes = np.array([series(30, seed=s) for s in range(4)])
+    for fn, arg in ((rsi, 5), (sma, 10), (momentum, 3), (regime, 5)):
+        out = fn(closes, arg)
+        for row, expected in zip(out, closes):
+            assert row.tolist() == fn(expected, arg).tolist()
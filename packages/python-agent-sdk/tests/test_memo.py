@@ -0,0 +1,205 @@
+"""MemoClient single-flight, stale refresh and invalidation, against a fake service."""
+import asyncio
+
+import pytest
+
+from swarm_agent_sdk.client import MCPClient
+from swarm_agent_sdk.memo import MemoClient, MemoPolicy, get_memo_client
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeService:
+    """``config.get`` returning a version that ``config.set`` bumps; ``gate`` holds calls in flight."""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.version = 0
+        self.fail = False
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.client = MCPClient()
+        self.client.register_tool("config.get", self.get, mode="inline")
+        self.client.register_tool("config.set", self.set, mode="inline")
+        self.client.register_tool("broker-gateway.get_fills", self.get, mode="inline")
+
+    async def get(self, p):
+        self.calls.append(p)
+        await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("down")
+        return {"version": self.version}
+
+    async def set(self, p):
+        self.version += 1
+        return {"ok": True}
+
+
+POLICIES = {
+    "config.get": MemoPolicy(ttl=10.0, stale_ttl=20.0, topics=("config",)),
+    "broker-gateway.get_fills": MemoPolicy(ttl=10.0, topics=("fills",)),
+}
+
+
+def memo(service, clock):
+    return MemoClient(service.client, POLICIES, clock=clock)
+
+
+def test_fresh_value_is_a_hit():
+    async def go():
+        service, clock = FakeService(), Clock()
+        m = memo(service, clock)
+        await m.call("config.get", {"key": "a"})
+        clock.now = 9.0
+        await m.call("config.get", {"key": "a"})
+        await m.call("config.get", {"key": "b"})
+        return service, m
+
+    service, m = asyncio.run(go())
+    assert len(service.calls) == 2 and m.stats.hits == 1 and m.stats.misses == 2
+
+
+def test_concurrent_misses_share_one_request():
+    async def go():
+        service, clock = FakeService(), Clock()
+        service.gate.clear()
+        m = memo(service, clock)
+        waiters = [asyncio.ensure_future(m.call("config.get", {"key": "a"})) for _ in range(5)]
+        await asyncio.sleep(0)
+        service.gate.set()
+        return service, m, await asyncio.gather(*waiters)
+
+    service, m, values = asyncio.run(go())
+    assert len(service.calls) == 1 and values == [{"version": 0}] * 5
+    assert m.stats.misses == 1 and m.stats.coalesced == 4
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_request():
+    async def go():
+        service, clock = FakeService(), Clock()
+        service.gate.clear()
+        m = memo(service, clock)
+        first = asyncio.ensure_future(m.call("config.get", {"key": "a"}))
+        second = asyncio.ensure_future(m.call("config.get", {"key": "a"}))
+        await asyncio.sleep(0)
+        first.cancel()
+        service.gate.set()
+        return service, await second
+
+    service, value = asyncio.run(go())
+    assert value == {"version": 0} and len(service.calls) == 1
+
+
+def test_stale_value_is_served_while_one_refresh_runs():
+    async def go():
+        service, clock = FakeService(), Clock()
+        m = memo(service, clock)
+        await m.call("config.get", {"key": "a"})
+        service.version = 1
+        service.gate.clear()
+        clock.now = 15.0
+        stale = [await m.call("config.get", {"key": "a"}) for _ in range(3)]
+        service.gate.set()
+        await asyncio.sleep(0.01)
+        clock.now = 16.0
+        return service, m, stale, await m.call("config.get", {"key": "a"})
+
+    service, m, stale, fresh = asyncio.run(go())
+    assert stale == [{"version": 0}] * 3 and fresh == {"version": 1}
+    assert len(service.calls) == 2 and m.stats.stale_hits == 3 and m.stats.refreshes == 1
+
+
+def test_failed_refresh_keeps_the_stale_value_until_stale_ttl():
+    async def go():
+        service, clock = FakeService(), Clock()
+        m = memo(service, clock)
+        await m.call("config.get", {"key": "a"})
+        service.fail = True
+        clock.now = 15.0
+        stale = await m.call("config.get", {"key": "a"})
+        await asyncio.sleep(0.01)
+        clock.now = 31.0
+        with pytest.raises(RuntimeError):
+            await m.call("config.get", {"key": "a"})
+        return m, stale
+
+    m, stale = asyncio.run(go())
+    assert stale == {"version": 0} and m.stats.refresh_failures == 1
+
+
+def test_mutation_invalidates_its_topic():
+    async def go():
+        service, clock = FakeService(), Clock()
+        m = memo(service, clock)
+        await m.call("config.get", {"key": "a"})
+        await m.call("broker-gateway.get_fills", {})
+        await m.call("config.set", {"key": "a", "value": 1})
+        return service, m, await m.call("config.get", {"key": "a"})
+
+    service, m, value = asyncio.run(go())
+    assert value == {"version": 1} and m.stats.invalidations == 1
+    assert len(m._entries) == 2  # get_fills listens to "fills" and was kept
+
+
+def test_invalidation_discards_a_request_in_flight_on_that_topic_only():
+    async def go():
+        service, clock = FakeService(), Clock()
+        service.gate.clear()
+        m = memo(service, clock)
+        config = asyncio.ensure_future(m.call("config.get", {"key": "a"}))
+        fills = asyncio.ensure_future(m.call("broker-gateway.get_fills", {}))
+        await asyncio.sleep(0)
+        m.invalidate("config")
+        service.gate.set()
+        await asyncio.gather(config, fills)
+        return m
+
+    m = asyncio.run(go())
+    assert [k[0] for k in m._entries] == ["broker-gateway.get_fills"]
+
+
+def test_call_after_invalidation_does_not_join_the_old_request():
+    async def go():
+        service, clock = FakeService(), Clock()
+        service.gate.clear()
+        m = memo(service, clock)
+        old = asyncio.ensure_future(m.call("config.get", {"key": "a"}))
+        await asyncio.sleep(0)
+        service.version = 1
+        m.invalidate("config")
+        new = asyncio.ensure_future(m.call("config.get", {"key": "a"}))
+        await asyncio.sleep(0)
+        service.gate.set()
+        await asyncio.gather(old, new)
+        return service, m, await m.call("config.get", {"key": "a"})
+
+    service, m, cached = asyncio.run(go())
+    assert len(service.calls) == 2 and m.stats.coalesced == 0
+    assert cached == {"version": 1} and m.stats.hits == 1
+
+
+def test_entries_are_evicted_lru():
+    async def go():
+        service, clock = FakeService(), Clock()
+        m = MemoClient(service.client, POLICIES, max_entries=2, clock=clock)
+        for key in "abacab":
+            await m.call("config.get", {"key": key})
+        return service, m
+
+    service, m = asyncio.run(go())
+    # "a" was used again before "c" arrived, so "b" goes first
+    assert [c["key"] for c in service.calls] == ["a", "b", "c", "b"] and m.stats.evictions == 2
+
+
+def test_shared_memo_clients_are_keyed_by_policies():
+    a = get_memo_client("http://memo-test", "config")
+    assert get_memo_client("http://memo-test", "config") is a
+    b = get_memo_client("http://memo-test", "config", POLICIES)
+    assert b is not a and b.policies == POLICIES
+    assert get_memo_client("http://memo-test", "config", dict(POLICIES)) is b
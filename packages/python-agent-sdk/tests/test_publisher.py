@@ -0,0 +1,184 @@
+"""BusPublisher batching, backpressure and the per-message fallback, against a fake bus."""
+import asyncio
+
+import pytest
+
+from swarm_agent_sdk.client import MCPClient
+from swarm_agent_sdk.publisher import BusPublisher, PublishQueueFull
+
+
+class Response:
+    def __init__(self, status_code: int, text: str = "") -> None:
+        self.status_code = status_code
+        self.text = text
+
+
+class HttpError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(status_code)
+        self.response = Response(status_code)
+
+
+class FakeBus:
+    """``bus.publish_batch`` (unless ``batch=False``) and ``bus.publish``, recording calls."""
+
+    def __init__(self, batch: bool = True, fail: bool = False) -> None:
+        self.batches = []
+        self.singles = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.client = MCPClient()
+        self.client.register_tool("bus.publish_batch", self.publish_batch if batch else self.unsupported, mode="inline")
+        self.client.register_tool("bus.publish", self.publish, mode="inline")
+        self.fail = fail
+
+    async def publish_batch(self, p):
+        await self.gate.wait()
+        if self.fail:
+            raise HttpError(503)
+        self.batches.append([m["payload"] for m in p["messages"]])
+        return {"ok": True}
+
+    async def unsupported(self, p):
+        raise HttpError(404)
+
+    async def publish(self, p):
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        await asyncio.sleep(0.001)
+        self.inflight -= 1
+        self.singles.append(p["payload"])
+        return {"ok": True}
+
+
+def run(coro_fn):
+    return asyncio.run(coro_fn())
+
+
+def test_messages_within_linger_go_as_one_batch():
+    async def go():
+        bus = FakeBus()
+        pub = BusPublisher(bus.client, linger=0.02)
+        futs = [await pub.publish("t", {"i": i}) for i in range(3)]
+        deliveries = await asyncio.gather(*futs)
+        await pub.aclose()
+        return bus, pub, deliveries
+
+    bus, pub, deliveries = run(go)
+    assert bus.batches == [[{"i": 0}, {"i": 1}, {"i": 2}]]
+    assert all(d.ok for d in deliveries) and pub.stats.delivered == 3
+
+
+def test_full_batch_is_sent_without_waiting_for_linger():
+    async def go():
+        bus = FakeBus()
+        pub = BusPublisher(bus.client, max_batch=2, linger=10.0)
+        futs = [await pub.publish("t", {"i": i}) for i in range(2)]
+        await asyncio.wait_for(asyncio.gather(*futs), 1.0)
+        await pub.aclose()
+        return bus
+
+    assert run(go).batches == [[{"i": 0}, {"i": 1}]]
+
+
+def test_flush_leaves_idle_topics_batching():
+    async def go():
+        bus = FakeBus()
+        pub = BusPublisher(bus.client, linger=0.05)
+        await pub.publish("idle", {"i": -1})
+        await pub.flush()
+        await pub.flush()  # "idle" has nothing queued now
+        futs = [await pub.publish("idle", {"i": i}) for i in range(3)]
+        await asyncio.sleep(0.01)
+        sent_early = len(bus.batches)
+        await asyncio.gather(*futs)
+        await pub.aclose()
+        return bus, sent_early
+
+    bus, sent_early = run(go)
+    assert sent_early == 1
+    assert bus.batches[1:] == [[{"i": 0}, {"i": 1}, {"i": 2}]]
+
+
+def test_backpressure_error_raises_when_full():
+    async def go():
+        bus = FakeBus()
+        bus.gate.clear()
+        pub = BusPublisher(bus.client, max_batch=1, max_queue=1, linger=0.0, backpressure="error")
+        await pub.publish("t", {"i": 0})
+        await asyncio.sleep(0.01)  # taken off the queue, stuck in flight
+        await pub.publish("t", {"i": 1})
+        with pytest.raises(PublishQueueFull):
+            await pub.publish("t", {"i": 2})
+        bus.gate.set()
+        await pub.aclose()
+
+    run(go)
+
+
+def test_backpressure_drop_oldest_fails_the_dropped_message():
+    async def go():
+        bus = FakeBus()
+        bus.gate.clear()
+        pub = BusPublisher(bus.client, max_batch=1, max_queue=1, linger=0.0, backpressure="drop_oldest")
+        await pub.publish("t", {"i": 0})
+        await asyncio.sleep(0.01)
+        dropped = await pub.publish("t", {"i": 1})
+        kept = await pub.publish("t", {"i": 2})
+        bus.gate.set()
+        await pub.aclose()
+        return bus, pub, await dropped, await kept
+
+    bus, pub, dropped, kept = run(go)
+    assert not dropped.ok and dropped.error == "dropped" and kept.ok
+    assert pub.stats.dropped == 1 and [{"i": 2}] in bus.batches
+
+
+def test_backpressure_block_waits_for_room():
+    async def go():
+        bus = FakeBus()
+        bus.gate.clear()
+        pub = BusPublisher(bus.client, max_batch=1, max_queue=1, linger=0.0, backpressure="block")
+        await pub.publish("t", {"i": 0})
+        await asyncio.sleep(0.01)
+        await pub.publish("t", {"i": 1})
+        blocked = asyncio.ensure_future(pub.publish("t", {"i": 2}))
+        await asyncio.sleep(0.01)
+        was_blocked = not blocked.done()
+        bus.gate.set()
+        await (await blocked)
+        await pub.aclose()
+        return was_blocked, pub
+
+    was_blocked, pub = run(go)
+    assert was_blocked and pub.stats.delivered == 3
+
+
+def test_failed_batch_fails_its_messages_and_keeps_batching():
+    async def go():
+        bus = FakeBus(fail=True)
+        pub = BusPublisher(bus.client, linger=0.0)
+        delivery = await (await pub.publish("t", {"i": 0}))
+        await pub.aclose()
+        return bus, pub, delivery
+
+    bus, pub, delivery = run(go)
+    assert not delivery.ok and "503" in delivery.error
+    assert pub._batch_supported and bus.singles == []
+
+
+def test_bus_without_batches_gets_bounded_single_publishes():
+    async def go():
+        bus = FakeBus(batch=False)
+        pub = BusPublisher(bus.client, linger=0.01, fallback_concurrency=4)
+        futs = [await pub.publish("t", {"i": i}) for i in range(50)]
+        deliveries = await asyncio.gather(*futs)
+        await pub.aclose()
+        return bus, deliveries
+
+    bus, deliveries = run(go)
+    assert all(d.ok for d in deliveries)
+    assert sorted(p["i"] for p in bus.singles) == list(range(50))
+    assert bus.max_inflight == 4
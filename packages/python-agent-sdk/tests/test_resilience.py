@@ -0,0 +1,225 @@
+"""Circuit breaker states, hedging and deadline propagation, without a network."""
+import asyncio
+import itertools
+
+import pytest
+
+from swarm_agent_sdk.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CallPolicy,
+    CircuitOpen,
+    DeadlineExceeded,
+    call_with_policy,
+    configure_breaker,
+    deadline,
+    remaining,
+)
+
+_names = itertools.count()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Response:
+    def __init__(self, status_code: int, text: str = "") -> None:
+        self.status_code = status_code
+        self.text = text
+
+
+class HttpError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(status_code)
+        self.response = Response(status_code)
+
+
+def breaker(**kwargs):
+    clock = Clock()
+    service = f"svc{next(_names)}"
+    kwargs = {"window": 4, "min_calls": 4, "failure_ratio": 0.5, "reset_seconds": 5.0, **kwargs}
+    return service, configure_breaker(service, clock=clock, **kwargs), clock
+
+
+def call(service, attempt, policy=CallPolicy(), tool="t.get"):
+    return asyncio.run(call_with_policy(service, tool, attempt, policy))
+
+
+def outcome(value=None, error=None, sleep=0.0):
+    async def attempt():
+        if sleep:
+            await asyncio.sleep(sleep)
+        if error is not None:
+            raise error
+        return value
+    return attempt
+
+
+def trip(service):
+    for _ in range(4):
+        with pytest.raises(HttpError):
+            call(service, outcome(error=HttpError(503)))
+
+
+def test_breaker_opens_on_failure_ratio_and_rejects():
+    service, b, _ = breaker()
+    call(service, outcome(1))
+    call(service, outcome(1))
+    for _ in range(2):
+        with pytest.raises(HttpError):
+            call(service, outcome(error=HttpError(503)))
+    assert b.state == OPEN
+    with pytest.raises(CircuitOpen):
+        call(service, outcome(1))
+
+
+def test_client_errors_do_not_open_the_breaker():
+    service, b, _ = breaker()
+    for _ in range(8):
+        with pytest.raises(HttpError):
+            call(service, outcome(error=HttpError(404)))
+    assert b.state == CLOSED
+
+
+def test_half_open_probe_success_closes():
+    service, b, clock = breaker()
+    trip(service)
+    clock.now = 5.0
+    assert call(service, outcome("ok")) == "ok"
+    assert b.state == CLOSED
+
+
+def test_half_open_probe_failure_reopens():
+    service, b, clock = breaker()
+    trip(service)
+    clock.now = 5.0
+    with pytest.raises(HttpError):
+        call(service, outcome(error=HttpError(500)))
+    assert b.state == OPEN and b.opened_at == 5.0
+
+
+@pytest.mark.parametrize("error", [HttpError(400), DeadlineExceeded("budget")])
+def test_uninformative_probe_stays_half_open(error):
+    service, b, clock = breaker()
+    trip(service)
+    clock.now = 5.0
+    with pytest.raises(type(error)):
+        call(service, outcome(error=error))
+    assert b.state == HALF_OPEN
+    # the next probe is let through and decides
+    assert call(service, outcome("ok")) == "ok"
+    assert b.state == CLOSED
+
+
+def test_only_one_probe_at_a_time():
+    service, b, clock = breaker()
+    trip(service)
+    clock.now = 5.0
+
+    async def go():
+        slow = asyncio.ensure_future(call_with_policy(service, "t.get", outcome("ok", sleep=0.02), CallPolicy()))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpen):
+            await call_with_policy(service, "t.get", outcome("ok"), CallPolicy())
+        return await slow
+
+    assert asyncio.run(go()) == "ok"
+    assert b.state == CLOSED
+
+
+def test_cancelled_probe_releases_the_slot():
+    service, b, clock = breaker()
+    trip(service)
+    clock.now = 5.0
+
+    async def go():
+        task = asyncio.ensure_future(call_with_policy(service, "t.get", outcome("ok", sleep=1.0), CallPolicy()))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(go())
+    assert b.state == HALF_OPEN
+    assert call(service, outcome("ok")) == "ok"
+
+
+def test_hedge_answers_with_the_faster_copy():
+    service, _, _ = breaker()
+    policy = CallPolicy(hedge=True, hedge_quantile=0.5, hedge_min_delay=0.001, idempotent=True)
+    for _ in range(20):
+        call(service, outcome("warm"), policy)
+    attempts = []
+
+    async def attempt():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.sleep(1.0)
+            return "slow"
+        return "hedge"
+
+    assert call(service, attempt, policy) == "hedge"
+    assert len(attempts) == 2
+
+
+def test_no_hedge_for_non_idempotent_tools():
+    service, _, _ = breaker()
+    policy = CallPolicy(hedge=True, hedge_quantile=0.5, hedge_min_delay=0.001)
+    for _ in range(20):
+        call(service, outcome("warm"), policy, tool="broker-gateway.submit_order")
+    attempts = []
+
+    async def attempt():
+        attempts.append(1)
+        await asyncio.sleep(0.02)
+        return "once"
+
+    assert call(service, attempt, policy, tool="broker-gateway.submit_order") == "once"
+    assert attempts == [1]
+
+
+def test_nested_deadlines_take_the_earliest():
+    with deadline(10.0):
+        with deadline(0.5):
+            assert remaining() <= 0.5
+        assert 0.5 < remaining() <= 10.0
+    assert remaining() is None
+
+
+def test_spent_deadline_fails_without_sending():
+    service, b, _ = breaker()
+    sent = []
+
+    async def attempt():
+        sent.append(1)
+
+    async def go():
+        with deadline(0.01):
+            await asyncio.sleep(0.02)
+            await call_with_policy(service, "t.get", attempt, CallPolicy())
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(go())
+    assert sent == [] and b.state == CLOSED
+
+
+def test_retries_stop_at_the_deadline():
+    service, _, _ = breaker(min_calls=100)
+    attempts = []
+
+    async def attempt():
+        attempts.append(1)
+        raise HttpError(503)
+
+    async def go():
+        with deadline(0.05):
+            await call_with_policy(service, "t.get", attempt, CallPolicy(retries=50, backoff=0.02, max_backoff=0.02, idempotent=True))
+
+    with pytest.raises(HttpError):
+        asyncio.run(go())
+    assert 1 <= len(attempts) < 10
@@ -0,0 +1,150 @@
+"""ExposureIndex bookkeeping and batched pre-trade checks, against a fake broker and risk-engine."""
+import asyncio
+import random
+
+import pytest
+
+from swarm_agent_sdk.client import MCPClient
+from swarm_agent_sdk.risk import ExposureIndex, prescreen, pretrade_check_batch
+
+LIMITS = {"maxGross": 10_000, "maxSingle": 3_000}
+
+
+def fill(exec_id, symbol="AAPL", qty=10, price=100.0, side="BUY"):
+    return {"exec_id": exec_id, "symbol": symbol, "qty": qty, "price": price, "side": side}
+
+
+def broker(fills, offsets=True):
+    client = MCPClient()
+
+    def get_fills(p):
+        if not offsets:
+            return {"fills": list(fills)}
+        return {"fills": fills[int(p.get("offset", 0)):], "next_offset": len(fills)}
+
+    client.register_tool("broker-gateway.get_fills", get_fills, mode="inline")
+    return client
+
+
+def test_fills_update_gross_and_duplicates_are_ignored():
+    index = ExposureIndex()
+    assert index.apply_fill(fill("e1"))
+    assert index.apply_fill(fill("e2", symbol="MSFT", qty=5, price=200.0))
+    assert not index.apply_fill(fill("e1"))
+    assert index.apply_fill(fill("e3", qty=4, side="SELL"))
+    assert index.qty == {"AAPL": 6.0, "MSFT": 5.0}
+    assert index.gross == 600.0 + 1000.0
+    assert index.stats.duplicate_fills == 1
+
+
+def test_sync_only_applies_new_fills():
+    fills = [fill("e1"), fill("e2")]
+    client = broker(fills)
+    index = ExposureIndex()
+    assert asyncio.run(index.sync(client)) == 2
+    fills.append(fill("e3"))
+    assert asyncio.run(index.sync(client)) == 1
+    assert index.fill_offset == 3 and index.qty["AAPL"] == 30.0
+
+
+def test_sync_without_offsets_dedupes_on_exec_id():
+    fills = [fill("e1"), fill("e2")]
+    client = broker(fills, offsets=False)
+    index = ExposureIndex()
+    asyncio.run(index.sync(client))
+    fills.append(fill("e3"))
+    assert asyncio.run(index.sync(client)) == 1
+    assert index.qty["AAPL"] == 30.0 and index.stats.duplicate_fills == 2
+
+
+def test_seen_exec_ids_are_bounded():
+    index = ExposureIndex(max_exec_ids=3)
+    for i in range(10):
+        index.apply_fill(fill(f"e{i}", qty=1))
+    assert len(index._exec_ids) == 3
+    assert not index.apply_fill(fill("e9", qty=1))  # recent ids are still deduplicated
+    assert index.qty["AAPL"] == 10.0
+
+
+def sequential(gross, proposals):
+    """The risk-engine's rules, one proposal at a time: approvals add to gross."""
+    out = []
+    for p in proposals:
+        notional = abs(p["qty"] * p["price"])
+        breaches = (["max_gross"] if gross + notional > p["limits"]["maxGross"] else []) + (["max_single"] if notional > p["limits"]["maxSingle"] else [])
+        if not breaches:
+            gross += notional
+        out.append({"status": "REJECTED" if breaches else "APPROVED", "breaches": breaches})
+    return out
+
+
+def risk_engine(calls):
+    client = MCPClient()
+
+    def check_batch(p):
+        calls.append(len(p["proposals"]))
+        gross = sum(abs(c["qty"] * c["price"]) for c in p["current"])
+        return {"results": sequential(gross, p["proposals"])}
+
+    client.register_tool("risk-engine.pretrade_check_batch", check_batch, mode="inline")
+    return client
+
+
+def proposals(n, seed):
+    rng = random.Random(seed)
+    return [{"symbol": f"S{i}", "side": "BUY", "qty": rng.randint(1, 40), "price": 100.0, "limits": LIMITS} for i in range(n)]
+
+
+def test_prescreen_counts_earlier_approvals():
+    batch = [{"symbol": s, "side": "BUY", "qty": 25, "price": 100.0, "limits": LIMITS} for s in "ABCD"]
+    approve, reject, over_gross, _ = prescreen(1_000.0, batch)
+    # 1000 + 3 x 2500 = 8500 fits, the fourth would take gross to 11000
+    assert approve.tolist() == [True, True, True, False]
+    assert reject.tolist() == [False, False, False, True] and over_gross[3]
+
+
+def test_prescreen_leaves_borderline_undecided():
+    batch = [{"symbol": "A", "side": "BUY", "qty": 25, "price": 100.0, "limits": LIMITS},
+             {"symbol": "B", "side": "BUY", "qty": 25, "price": 100.0, "limits": LIMITS}]
+    approve, reject, _, _ = prescreen(5_000.0, batch)  # the second lands exactly on maxGross
+    assert approve.tolist() == [True, False] and reject.tolist() == [False, False]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_local_decisions_agree_with_sequential_rules(seed):
+    batch = proposals(30, seed)
+    gross = random.Random(seed).uniform(0, 8_000)
+    approve, reject, _, _ = prescreen(gross, batch)
+    expected = [d["status"] for d in sequential(gross, batch)]
+    for i, status in enumerate(expected):
+        if approve[i]:
+            assert status == "APPROVED"
+        if reject[i]:
+            assert status == "REJECTED"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_check_matches_sequential_rules(seed):
+    index = ExposureIndex()
+    index.apply_fill(fill("e0", qty=random.Random(seed).randint(0, 80), price=100.0))
+    batch = proposals(30, seed)
+    calls = []
+    decisions = asyncio.run(pretrade_check_batch(risk_engine(calls), index, batch))
+    expected = sequential(index.gross, batch)
+    assert [d["status"] for d in decisions] == [e["status"] for e in expected]
+    for d, e in zip(decisions, expected):
+        if d["source"] == "engine":
+            assert d["breaches"] == e["breaches"]
+        else:
+            # a local reject names the breaches that are certain, e.g. max_single without a borderline max_gross
+            assert set(d["breaches"]) <= set(e["breaches"]) and (d["breaches"] or d["status"] == "APPROVED")
+    assert len(calls) <= 1
+
+
+def test_clear_batch_needs_no_engine_call():
+    calls = []
+    batch = [{"symbol": "A", "side": "BUY", "qty": 1, "price": 100.0, "limits": LIMITS},
+             {"symbol": "B", "side": "BUY", "qty": 50, "price": 100.0, "limits": LIMITS}]
+    decisions = asyncio.run(pretrade_check_batch(risk_engine(calls), ExposureIndex(), batch))
+    assert [d["status"] for d in decisions] == ["APPROVED", "REJECTED"]
+    assert decisions[1]["breaches"] == ["max_single"] and calls == []
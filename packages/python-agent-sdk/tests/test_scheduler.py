@@ -0,0 +1,57 @@
+"""TickScheduler: tick timeouts versus failures raised by the tick itself."""
+import asyncio
+
+from swarm_agent_sdk.resilience import DeadlineExceeded
+from swarm_agent_sdk.scheduler import TickScheduler
+
+
+def run(scheduler, tick, ticks):
+    async def go():
+        stop = asyncio.Event()
+        calls = []
+
+        async def counted():
+            calls.append(len(calls))
+            if len(calls) == ticks:
+                stop.set()
+            await tick(len(calls))
+
+        await scheduler.run(counted, stop)
+        return len(calls)
+
+    return asyncio.run(go())
+
+
+def test_failing_tick_does_not_stop_the_loop():
+    async def tick(n):
+        if n % 2:
+            raise RuntimeError("boom")
+
+    scheduler = TickScheduler(0.001)
+    assert run(scheduler, tick, 4) == 4
+    assert scheduler.stats.failures == 2 and scheduler.stats.ticks == 4
+
+
+def test_deadline_from_a_downstream_call_is_a_failure_not_a_timeout():
+    async def tick(n):
+        raise DeadlineExceeded("market-data.get_ohlcv")
+
+    scheduler = TickScheduler(0.001, timeout=1.0)
+    run(scheduler, tick, 2)
+    assert scheduler.stats.failures == 2 and scheduler.stats.timeouts == 0
+
+
+def test_tick_past_its_timeout_is_cancelled_and_counted():
+    cancelled = []
+
+    async def tick(n):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+
+    scheduler = TickScheduler(0.001, timeout=0.01)
+    run(scheduler, tick, 2)
+    assert scheduler.stats.timeouts == 2 and scheduler.stats.failures == 0
+    assert cancelled == [1, 2]
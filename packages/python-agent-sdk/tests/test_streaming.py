@@ -0,0 +1,79 @@
+"""Streaming indicators against the batch functions, and snapshot round-trips."""
+import json
+
+import numpy as np
+import pytest
+
+from swarm_agent_sdk.indicators import ema, momentum, regime, rsi, sma
+from swarm_agent_sdk.streaming import (
+    RollingSum,
+    StreamingEMA,
+    StreamingIndicator,
+    StreamingMomentum,
+    StreamingRegime,
+    StreamingRSI,
+    StreamingSMA,
+    StreamSet,
+)
+
+from test_indicators import series
+
+CASES = [
+    (lambda: StreamingSMA(5), lambda c: sma(c, 5)),
+    (lambda: StreamingSMA(1), lambda c: sma(c, 1)),
+    (lambda: StreamingEMA(10), lambda c: ema(c, 10)),
+    (lambda: StreamingRSI(5), lambda c: rsi(c, 5)),
+    (lambda: StreamingRSI(14), lambda c: rsi(c, 14)),
+    (lambda: StreamingMomentum(3), lambda c: momentum(c, 3)),
+    (lambda: StreamingRegime(5), lambda c: regime(c, 5)),
+]
+
+
+def stream(ind, closes):
+    return [ind.update(c) for c in closes]
+
+
+@pytest.mark.parametrize("make, batch", CASES)
+@pytest.mark.parametrize("seed", range(5))
+def test_streaming_matches_batch(make, batch, seed):
+    # long enough for many re-normalisations of the running sums
+    closes = series(2_000, seed=seed)
+    np.testing.assert_allclose(stream(make(), closes), batch(closes), rtol=1e-9, atol=1e-9)
+
+
+def test_rolling_sum_is_exactly_zero_for_an_all_zero_window():
+    ring = RollingSum(3)
+    for x in [0.1, 0.2, 0.3, 0.0, 0.0, 0.0]:
+        ring.push(x)
+    assert ring.sum == 0.0
+
+
+def test_rolling_sum_tracks_the_window():
+    ring = RollingSum(4)
+    values = series(1_000, seed=7)
+    for t, x in enumerate(values):
+        ring.push(x)
+        assert ring.sum == pytest.approx(sum(values[max(t - 3, 0):t + 1]), abs=1e-9)
+
+
+@pytest.mark.parametrize("make, _", CASES)
+def test_snapshot_restore_continues_the_stream(make, _):
+    closes = series(300, seed=3)
+    whole = make()
+    stream(whole, closes)
+    first = make()
+    stream(first, closes[:137])
+    resumed = StreamingIndicator.from_snapshot(json.loads(json.dumps(first.snapshot())))
+    assert type(resumed) is type(first)
+    np.testing.assert_allclose(stream(resumed, closes[137:])[-1], whole.value, rtol=1e-9, atol=1e-9)
+
+
+def test_stream_set_restore_skips_seen_bars():
+    bars = [{"ts": f"2024-01-{d:02d}", "close": c} for d, c in enumerate(series(30, seed=1), start=1)]
+    live = StreamSet({"sma": StreamingSMA(5), "rsi": StreamingRSI(5), "trend": StreamingRegime(5)})
+    live.update_many(bars[:20])
+    restored = StreamSet.restore(json.loads(json.dumps(live.snapshot())))
+    assert restored.update_many(bars[15:]) == 10  # bars 16-20 were already seen
+    live.update_many(bars[20:])
+    assert restored.last_ts == live.last_ts
+    assert restored.values() == pytest.approx(live.values())
@@ -0,0 +1,56 @@
+"""WebSocketBarFeed decoding, against a local websocket server."""
+import asyncio
+import json
+
+from websockets.asyncio.server import serve
+
+from swarm_agent_sdk.subscribe import WebSocketBarFeed
+
+
+def bar(symbol="AAPL", ts="2024-01-02T00:00:00Z", close=100.0):
+    return {"symbol": symbol, "ts": ts, "open": close, "high": close, "low": close, "close": close, "volume": 10.0}
+
+
+MESSAGES = [
+    json.dumps(bar(ts="2024-01-02T00:00:00Z")),
+    "not json",
+    json.dumps([1, 2]),
+    json.dumps({"bars": 3}),
+    json.dumps({k: v for k, v in bar().items() if k != "close"}),
+    json.dumps(bar(ts="yesterday")),
+    json.dumps({"bars": [bar(ts="2024-01-03T00:00:00Z"), bar(ts=None), bar(ts="2024-01-04T00:00:00Z")]}),
+    json.dumps(bar(ts="2024-01-05T00:00:00Z")),
+]
+
+
+def test_malformed_messages_are_skipped_without_reconnecting():
+    connections = []
+
+    async def handler(ws):
+        connections.append(json.loads(await ws.recv()))
+        for m in MESSAGES:
+            await ws.send(m)
+        await ws.wait_closed()
+
+    async def go():
+        got = []
+        done = asyncio.Event()
+
+        async def emit(b):
+            got.append(b.ts)
+            if len(got) == 4:
+                done.set()
+
+        async with serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            feed = WebSocketBarFeed(f"ws://127.0.0.1:{port}")
+            task = asyncio.ensure_future(feed.run(["AAPL"], "1d", emit))
+            await asyncio.wait_for(done.wait(), 5.0)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return feed, got
+
+    feed, got = asyncio.run(go())
+    assert got == ["2024-01-02T00:00:00.000Z", "2024-01-03T00:00:00.000Z", "2024-01-04T00:00:00.000Z", "2024-01-05T00:00:00.000Z"]
+    assert feed.malformed == 6
+    assert connections == [{"action": "subscribe", "symbols": ["AAPL"], "interval": "1d"}]
@@ -0,0 +1,106 @@
+"""TransportPool client reuse across event loops, against a local HTTP server."""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from swarm_agent_sdk.transport import PoolConfig, TransportPool
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("content-length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def pooled_sockets(client):
+    return [conn._connection._network_stream.get_extra_info("socket") for conn in client._transport._pool.connections]
+
+
+def test_same_loop_reuses_the_client(server):
+    pool = TransportPool(PoolConfig())
+
+    async def go():
+        client = pool.get(server)
+        assert pool.get(server) is client
+        await pool.aclose()
+        return client
+
+    assert asyncio.run(go()).is_closed
+
+
+def test_client_from_a_running_loop_is_closed_on_that_loop(server):
+    pool = TransportPool(PoolConfig())
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+
+    async def first():
+        return pool.get(server)
+
+    old = asyncio.run_coroutine_threadsafe(first(), other).result(1.0)
+
+    async def second():
+        client = pool.get(server)
+        await asyncio.sleep(0.05)
+        await pool.aclose()
+        return client
+
+    assert asyncio.run(second()) is not old
+    assert old.is_closed
+    other.call_soon_threadsafe(other.stop)
+    thread.join(1.0)
+    other.close()
+
+
+def test_client_from_a_finished_loop_has_its_sockets_shut_down(server):
+    pool = TransportPool(PoolConfig())
+
+    async def first():
+        client = pool.get(server)
+        assert (await client.get("/")).text == "ok"
+        return client, pooled_sockets(client)
+
+    old, sockets = asyncio.run(first())
+    assert len(sockets) == 1
+
+    async def second():
+        client = pool.get(server)
+        await pool.aclose()
+        return client
+
+    assert asyncio.run(second()) is not old
+    with pytest.raises(OSError):
+        sockets[0].getpeername()
+
+
+def test_missing_h2_is_logged_once(server, capsys, monkeypatch):
+    import sys
+    monkeypatch.setitem(sys.modules, "h2", None)  # import h2 raises ImportError
+    pool = TransportPool(PoolConfig(http2=True))
+
+    async def go():
+        pool.get(server)
+        await pool.aclose()
+        pool.get(server)
+        await pool.aclose()
+
+    asyncio.run(go())
+    assert capsys.readouterr().out.count("http2_unavailable") == 1
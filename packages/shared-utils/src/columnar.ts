@@ -0,0 +1,80 @@
+import type http from 'http';
+
+// Columnar response encoding (negotiated via `accept: application/x-swarm-columnar`).
+// Layout: "SWC1" | u32 LE header length | header JSON | pad to 8 | column buffers.
+// Numbers -> <f8, `ts` -> ts_ms (<i8 epoch ms), other strings -> dictionary-encoded <u4 codes.
+// The schema is the union of every row's fields: a column is <f8 only if all its
+// present values are numbers (missing ones decode as NaN), `ts` is ts_ms only if
+// every row has a parseable timestamp, and anything else is dictionary-encoded
+// with missing values as ''.
+export const COLUMNAR_CONTENT_TYPE = 'application/x-swarm-columnar';
+
+type ColumnKind = 'ts_ms' | '<f8' | 'dict';
+
+function columnKinds(rows: Array<Record<string, unknown>>): Map<string, ColumnKind> {
+  const kinds = new Map<string, ColumnKind>();
+  for (const r of rows) {
+    for (const [name, v] of Object.entries(r)) {
+      const seen = kinds.get(name);
+      if (seen === 'dict' || v === undefined || v === null) {
+        if (!seen) kinds.set(name, name === 'ts' ? 'dict' : '<f8');
+        continue;
+      }
+      if (name === 'ts') kinds.set(name, Number.isFinite(Date.parse(String(v))) ? 'ts_ms' : 'dict');
+      else kinds.set(name, typeof v === 'number' ? '<f8' : 'dict');
+    }
+  }
+  // a ts missing from some row has no epoch value to send
+  if (kinds.get('ts') === 'ts_ms' && rows.some(r => r.ts === undefined || r.ts === null)) kinds.set('ts', 'dict');
+  return kinds;
+}
+
+export function encodeColumnar(rows: Array<Record<string, unknown>>): Buffer {
+  const n = rows.length;
+  const columns: Array<Record<string, unknown>> = [];
+  const buffers: Buffer[] = [];
+  let offset = 0;
+  const pushBuffer = (buf: Buffer) => {
+    const pad = (8 - (buf.length % 8)) % 8;
+    buffers.push(buf, Buffer.alloc(pad));
+    const at = offset;
+    offset += buf.length + pad;
+    return at;
+  };
+  for (const [name, kind] of columnKinds(rows)) {
+    if (kind === 'ts_ms') {
+      const arr = new BigInt64Array(n);
+      rows.forEach((r, i) => { arr[i] = BigInt(Date.parse(String(r[name]))); });
+      const buf = Buffer.from(arr.buffer);
+      columns.push({ name, dtype: 'ts_ms', offset: pushBuffer(buf), length: buf.length });
+    } else if (kind === '<f8') {
+      const arr = new Float64Array(n);
+      rows.forEach((r, i) => { arr[i] = typeof r[name] === 'number' ? (r[name] as number) : NaN; });
+      const buf = Buffer.from(arr.buffer);
+      columns.push({ name, dtype: '<f8', offset: pushBuffer(buf), length: buf.length });
+    } else {
+      const values: string[] = [];
+      const index = new Map<string, number>();
+      const codes = new Uint32Array(n);
+      rows.forEach((r, i) => {
+        const v = String(r[name] ?? '');
+        let code = index.get(v);
+        if (code === undefined) { code = values.length; index.set(v, code); values.push(v); }
+        codes[i] = code;
+      });
+      const buf = Buffer.from(codes.buffer);
+      columns.push({ name, dtype: 'dict', values, offset: pushBuffer(buf), length: buf.length });
+    }
+  }
+  const header = Buffer.from(JSON.stringify({ nrows: n, columns }), 'utf8');
+  const prefix = Buffer.alloc(8);
+  prefix.write('SWC1', 0, 'latin1');
+  prefix.writeUInt32LE(header.length, 4);
+  const headPad = Buffer.alloc((8 - ((8 + header.length) % 8)) % 8);
+  return Buffer.concat([prefix, header, headPad, ...buffers]);
+}
+
+export function wantsColumnar(req: http.IncomingMessage, output: unknown): output is { rows: Array<Record<string, unknown>> } {
+  const accept = req.headers['accept'];
+  return typeof accept === 'string' && accept.includes(COLUMNAR_CONTENT_TYPE) && Array.isArray((output as any)?.rows);
+}
@@ -3,15 +3,17 @@ from swarm_agent_sdk import MCPClient, BaseAgent, AgentConfig
 
 class ExampleAgent(BaseAgent):
     async def setup(self) -> None:
-        self.client.register_tool("telemetry.log", lambda p: print(f"[telemetry] {p}"))
+        self.client.register_tool("telemetry.log", lambda p: print(f"[telemetry] {p}"), mode="inline")
 
     async def tick(self) -> None:
         await self.client.call("telemetry.log", {"level": "info", "msg": "heartbeat", "agent": self.config.name})
 
-async def main():
+def build_agent() -> ExampleAgent:
     client = MCPClient()
-    agent = ExampleAgent(AgentConfig(name="base-agent"), client)
-    await agent.run()
+    return ExampleAgent(AgentConfig(name="base-agent"), client)
+
+async def main():
+    await build_agent().run()
 
 if __name__ == "__main__":
     try:
@@ -1,19 +1,25 @@
 import asyncio
 from swarm_agent_sdk import BaseAgent, AgentConfig, get_host_base
+from swarm_agent_sdk.cache import get_ohlcv_cache
 from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.features import get_feature_writer
 
 class RoundtripAgent(BaseAgent):
-    async def tick(self) -> None:
+    async def setup(self) -> None:
         host = get_host_base()
-        md = HttpMCPClient(host, "market-data")
-        fs = HttpMCPClient(host, "feature-store")
-        ohlcv = await md.call("market-data.get_ohlcv", {"symbol": "AAPL", "start": "2024-01-01", "end": "2024-01-03", "interval": "1d"})
+        self.md = get_ohlcv_cache(host)
+        self.features = get_feature_writer(host)
+        self.on_teardown(self.features.flush)
+
+    async def tick(self) -> None:
+        ohlcv = await self.md.call("market-data.get_ohlcv", {"symbol": "AAPL", "start": "2024-01-01", "end": "2024-01-03", "interval": "1d"})
         rows = [
             {"ts": r["ts"], "symbol": "AAPL", "feature_set": "demo", "feature_name": "close", "value": r["close"], "ver": "v1"}
             for r in ohlcv["rows"]
         ]
-        res = await fs.call("feature-store.write_features", {"feature_set": "demo", "rows": rows})
-        print({"wrote": res.get("wrote", 0)})
+        await self.features.write("demo", rows)
+        # flush now so the demo reports what actually reached the store
+        print({"wrote": await self.features.flush()})
         self.stop()
 
 async def main():
@@ -1,62 +1,61 @@
 import asyncio
-from typing import List, Dict
+import os
+import uuid
+from typing import Optional, Sequence
 from swarm_agent_sdk import BaseAgent, AgentConfig, get_host_base
+from swarm_agent_sdk.cache import get_ohlcv_cache
 from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.backtest import best_threshold
+from swarm_agent_sdk.execution import simulate, simulate_orders
+from swarm_agent_sdk.features import get_feature_writer
+from swarm_agent_sdk.metrics import current_trace_id
 
 class ExecutionAgent(BaseAgent):
-    def __init__(self, config: AgentConfig, threshold: float) -> None:
+    def __init__(self, config: AgentConfig, threshold: float, candidates: Optional[Sequence[float]] = None) -> None:
         super().__init__(config, HttpMCPClient(get_host_base(), "noop"))
         self.threshold = threshold
+        # with candidates, each tick re-tunes the threshold on the bars it fetched
+        self.candidates = list(candidates or [])
         host = get_host_base()
-        self.md = HttpMCPClient(host, "market-data")
-        self.fs = HttpMCPClient(host, "feature-store")
+        self.md = get_ohlcv_cache(host)
+        self.features = get_feature_writer(host)
+        self.on_teardown(self.features.flush)
+        self.analytics = HttpMCPClient(host, "analytics")
 
     async def tick(self) -> None:
         ohlcv = await self.md.call("market-data.get_ohlcv", {"symbol":"AAPL","start":"2024-01-01","end":"2024-01-10","interval":"1d"})
-        prices = [{"ts": r["ts"], "price": r["close"]} for r in ohlcv["rows"]]
-        last = prices[0]["price"]
-        cash = 0.0
-        position = 0
-        orders: List[Dict] = []
-        for p in prices:
-            delta = p["price"] - last
-            if delta > self.threshold:
-                # BUY 1 unit
-                orders.append({"ts": p["ts"], "side": "BUY", "price": p["price"]})
-                position += 1
-                cash -= p["price"]
-            elif delta < -self.threshold and position > 0:
-                # SELL 1 unit
-                orders.append({"ts": p["ts"], "side": "SELL", "price": p["price"]})
-                position -= 1
-                cash += p["price"]
-            last = p["price"]
-        # mark to market
-        if prices:
-            cash += position * prices[-1]["price"]
+        stamps = [r["ts"] for r in ohlcv["rows"]]
+        closes = [r["close"] for r in ohlcv["rows"]]
+        if self.candidates and closes:
+            # every candidate replayed in one vectorized pass, same fills and P&L as a single run
+            self.threshold = best_threshold(simulate(closes, self.candidates).pnl, self.candidates)["threshold"]
+        orders = simulate_orders(closes, self.threshold).to_dicts(stamps)
+        cash = float(simulate(closes, [self.threshold]).pnl[0])
         # write orders as features
         rows = [
             {"ts": o["ts"], "symbol": "AAPL", "feature_set": "orders_sim", "feature_name": o["side"].lower(), "value": o["price"], "ver": "v1"}
             for o in orders
         ]
         if rows:
-            await self.fs.call("feature-store.write_features", {"feature_set": "orders_sim", "rows": rows})
-        # write analytics stat
+            await self.features.write("orders_sim", rows)
+        # write analytics stat (best effort: a failure is logged, not raised)
+        corr = current_trace_id() or str(uuid.uuid4())
+        # pick last timestamp if exists else now
+        ts = rows[-1]["ts"] if rows else "2024-01-10T00:00:00.000Z"
         try:
-            analytics = HttpMCPClient(get_host_base(), "analytics")
-            import os, uuid
-            corr = os.environ.get("TRACE_ID") or str(uuid.uuid4())
-            # pick last timestamp if exists else now
-            ts = rows[-1]["ts"] if rows else "2024-01-10T00:00:00.000Z"
-            await analytics.call("analytics.write_exec_stat", {"ts": ts, "symbol": "AAPL", "orders_count": len(orders), "pnl": float(round(cash, 2)), "trace_id": corr})
-        except Exception:
-            pass
-        print({"orders": len(orders), "pnl": round(cash, 2)})
+            await self.analytics.call("analytics.write_exec_stat", {"ts": ts, "symbol": "AAPL", "orders_count": len(orders), "pnl": float(round(cash, 2)), "trace_id": corr})
+        except Exception as err:
+            print({"analytics": "write_failed", "trace_id": corr, "error": repr(err)})
+        print({"orders": len(orders), "pnl": round(cash, 2), "threshold": self.threshold})
         self.stop()
 
+def build_agent() -> ExecutionAgent:
+    # EXEC_THRESHOLD_CANDIDATES="0.1,0.2,0.5": tune the threshold each tick instead of using 0.2
+    candidates = [float(c) for c in os.environ.get("EXEC_THRESHOLD_CANDIDATES", "").split(",") if c.strip()]
+    return ExecutionAgent(AgentConfig(name="execution-agent", heartbeat_seconds=5), threshold=0.2, candidates=candidates)
+
 async def main():
-    agent = ExecutionAgent(AgentConfig(name="execution-agent", heartbeat_seconds=5), threshold=0.2)
-    await agent.run()
+    await build_agent().run()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,28 +1,44 @@
 import asyncio
+from typing import Any, Dict, List
 from swarm_agent_sdk import BaseAgent, AgentConfig, get_host_base
 from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.risk import ExposureIndex, pretrade_check_batch
+
+LIMITS = {"maxGross": 100000, "maxSingle": 10000}
 
 class RiskAgent(BaseAgent):
-    async def tick(self) -> None:
+    async def setup(self) -> None:
         host = get_host_base()
-        risk = HttpMCPClient(host, "risk-engine")
-        broker = HttpMCPClient(host, "broker-gateway")
-        # demo proposal
-        proposal = {"symbol":"AAPL","side":"BUY","qty":1,"price":100,"limits":{"maxGross":100000,"maxSingle":10000},"current":[]}
-        decision = await risk.call("risk-engine.pretrade_check", proposal)
-        order = None
-        if decision.get("status") == "APPROVED":
-            order = await broker.call("broker-gateway.submit_order", {"symbol":"AAPL","side":"BUY","qty":1})
-        positions = await broker.call("broker-gateway.get_positions", {})
-        fills = await broker.call("broker-gateway.get_fills", {})
-        print({"risk_decision": decision, "order": order, "positions": positions, "fills": fills})
+        self.risk = HttpMCPClient(host, "risk-engine")
+        self.broker = HttpMCPClient(host, "broker-gateway")
+        # gross and per-symbol exposure, kept current from new fills only
+        self.exposure = ExposureIndex()
+
+    def proposals(self) -> List[Dict[str, Any]]:
+        # demo batch: one clear approve, one near maxSingle (sent to the risk-engine), one clear reject
+        return [
+            {"symbol":"AAPL","side":"BUY","qty":1,"price":100,"limits":LIMITS},
+            {"symbol":"MSFT","side":"BUY","qty":30,"price":330,"limits":LIMITS},
+            {"symbol":"NVDA","side":"BUY","qty":200,"price":120,"limits":LIMITS},
+        ]
+
+    async def tick(self) -> None:
+        await self.exposure.sync(self.broker)
+        proposals = self.proposals()
+        decisions = await pretrade_check_batch(self.risk, self.exposure, proposals)
+        approved = [p for p, d in zip(proposals, decisions) if d["status"] == "APPROVED"]
+        orders = [r.unwrap() for r in await self.broker.call_many([
+            ("broker-gateway.submit_order", {k: p[k] for k in ("symbol", "side", "qty", "price")}) for p in approved
+        ])] if approved else []
+        await self.exposure.sync(self.broker)
+        print({"risk_decisions": decisions, "orders": orders, "exposure": self.exposure.summary()})
         self.stop()
 
+def build_agent() -> RiskAgent:
+    return RiskAgent(AgentConfig(name="risk-agent", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
+
 async def main():
-    agent = RiskAgent(AgentConfig(name="risk-agent", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
-    await agent.run()
+    await build_agent().run()
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-
@@ -1,29 +1,55 @@
 import asyncio
+import os
+from typing import Any, Dict, List
 from swarm_agent_sdk import BaseAgent, AgentConfig, get_host_base
 from swarm_agent_sdk.client import HttpMCPClient
-from swarm_agent_sdk.schemas import SentimentIndex
+from swarm_agent_sdk.features import get_feature_writer
+from swarm_agent_sdk.publisher import BusPublisher
+from swarm_agent_sdk.sentiment import SentimentPipeline
 
 class SentimentAgent(BaseAgent):
-    async def tick(self) -> None:
+    async def setup(self) -> None:
         host = get_host_base()
-        nlp = HttpMCPClient(host, "nlp-sentiment")
-        fs = HttpMCPClient(host, "feature-store")
-        bus = HttpMCPClient(host, "bus")
-        res = await nlp.call("nlp-sentiment.score_texts", {"provider":"stub","items":[{"id":"n1","text":"NVDA upgraded by analyst, strong outlook"},{"id":"n2","text":"CEO resigns unexpectedly, guidance cut"}]})
-        # aggregate average score as daily sentiment for a symbol demo
-        scores = [s["score"] for s in res["scores"]]
-        avg = sum(scores)/len(scores) if scores else 0.0
-        ts = "2024-01-15T00:00:00.000Z"
-        row = {"ts": ts, "symbol": "NVDA", "feature_set": "sentiment_demo", "feature_name": "avg_stub", "value": float(avg), "ver": "v1"}
-        sent = SentimentIndex(symbol="NVDA", ts=ts, polarity=float(avg), confidence=1.0, sources=["stub"]).model_dump()
-        await fs.call("feature-store.write_features", {"feature_set": "sentiment_demo", "rows": [row]})
-        await bus.call("bus.publish", {"topic": "sentiment_data_stream", "payload": sent})
-        print({"sentiment": sent, "published": True})
+        self.nlp = HttpMCPClient(host, "nlp-sentiment")
+        self.pipeline = SentimentPipeline(
+            self.nlp,
+            batch_size=int(os.environ.get("SENTIMENT_BATCH_SIZE", 128)),
+            concurrency=int(os.environ.get("SENTIMENT_CONCURRENCY", 4)),
+        )
+        self.features = get_feature_writer(host)
+        self.on_teardown(self.features.flush)
+        self.bus = HttpMCPClient(host, "bus")
+        self.publisher = BusPublisher(self.bus)
+        self.on_teardown(self.publisher.aclose)
+
+    async def headlines(self) -> List[Dict[str, Any]]:
+        """Headlines that arrived since the last tick; override with a real feed."""
+        return [
+            {"id": "n1", "symbol": "NVDA", "ts": "2024-01-15T00:00:00.000Z", "source": "stub", "text": "NVDA upgraded by analyst, strong outlook"},
+            {"id": "n2", "symbol": "NVDA", "ts": "2024-01-15T00:00:00.000Z", "source": "stub", "text": "CEO resigns unexpectedly, guidance cut"},
+        ]
+
+    async def tick(self) -> None:
+        updated = await self.pipeline.ingest(await self.headlines())
+        rows = []
+        for idx in updated:
+            await self.publisher.publish("sentiment_data_stream", idx, key=idx.symbol)
+            # polarity keeps the avg_stub name existing readers of sentiment_demo query
+            rows += [
+                {"ts": idx.ts, "symbol": idx.symbol, "feature_set": "sentiment_demo", "feature_name": "avg_stub", "value": idx.polarity, "ver": "v1"},
+                {"ts": idx.ts, "symbol": idx.symbol, "feature_set": "sentiment_demo", "feature_name": "confidence", "value": idx.confidence, "ver": "v1"},
+            ]
+        if rows:
+            await self.features.write("sentiment_demo", rows)
+        await self.publisher.flush()
+        print({"sentiment": [i.model_dump() for i in updated], "pipeline": self.pipeline.stats.as_dict(), "bus": self.publisher.stats.as_dict()})
         self.stop()
 
+def build_agent() -> SentimentAgent:
+    return SentimentAgent(AgentConfig(name="sentiment-agent", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
+
 async def main():
-    agent = SentimentAgent(AgentConfig(name="sentiment-agent", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
-    await agent.run()
+    await build_agent().run()
 
 if __name__ == "__main__":
     asyncio.run(main())
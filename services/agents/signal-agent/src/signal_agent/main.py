@@ -1,60 +1,77 @@
 import asyncio
-from typing import List
-from swarm_agent_sdk import BaseAgent, AgentConfig, get_host_base
+from typing import Any, Dict, List, Optional
+from swarm_agent_sdk import get_host_base
+from swarm_agent_sdk.cache import get_ohlcv_cache
 from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.features import get_feature_writer
+from swarm_agent_sdk.publisher import BusPublisher
+from swarm_agent_sdk.subscribe import BarSubscription
 from swarm_agent_sdk.schemas import SignalScore
+from swarm_agent_sdk.universe import UniverseAgent, UniverseConfig
+from swarm_agent_sdk.streaming import StreamSet, StreamingRSI, StreamingSMA
 
-def rsi(values: List[float], period: int = 5) -> float:
-    if len(values) < period + 1:
-        return 50.0
-    gains = []
-    losses = []
-    for i in range(1, period + 1):
-        delta = values[-i] - values[-i-1]
-        gains.append(max(delta, 0))
-        losses.append(max(-delta, 0))
-    avg_gain = sum(gains) / period
-    avg_loss = sum(losses) / period if sum(losses) > 0 else 1e-9
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+class SignalAgent(UniverseAgent):
+    async def setup(self) -> None:
+        host = get_host_base()
+        self.md = get_ohlcv_cache(host)
+        self.features = get_feature_writer(host)
+        self.on_teardown(self.features.flush)
+        self.bus = HttpMCPClient(host, "bus")
+        self.publisher = BusPublisher(self.bus)
+        self.on_teardown(self.publisher.aclose)
 
+    def indicators(self, symbol: str) -> StreamSet:
+        return self.stream(symbol, lambda: {"rsi5": StreamingRSI(5), "sma5": StreamingSMA(5), "sma10": StreamingSMA(10)})
 
-def sma(values: List[float], period: int) -> float:
-    if len(values) < period:
-        return sum(values) / max(len(values), 1)
-    return sum(values[-period:]) / period
+    async def tick_symbol(self, symbol: str) -> None:
+        stream = self.indicators(symbol)
+        # only fetch bars from the last one seen; the first tick warms up on the full window
+        ohlcv = await self.md.call("market-data.get_ohlcv", {"symbol":symbol,"start":stream.last_ts or "2024-01-01","end":"2024-01-15","interval":"1d"})
+        await self.on_bars(symbol, ohlcv["rows"])
 
-class SignalAgent(BaseAgent):
-    async def tick(self) -> None:
-        host = get_host_base()
-        md = HttpMCPClient(host, "market-data")
-        fs = HttpMCPClient(host, "feature-store")
-        bus = HttpMCPClient(host, "bus")
-        ohlcv = await md.call("market-data.get_ohlcv", {"symbol":"AAPL","start":"2024-01-01","end":"2024-01-15","interval":"1d"})
-        closes = [r["close"] for r in ohlcv["rows"]]
-        ts = ohlcv["rows"][-1]["ts"]
-        rsi5 = rsi(closes, 5)
-        sma5 = sma(closes, 5)
-        sma10 = sma(closes, 10)
+    def subscribe(self) -> Optional[BarSubscription]:
+        # STREAM_BARS=true: react to pushed bars instead of polling each heartbeat
+        if not self.config.stream_bars:
+            return None
+        # a fresh stream starts on enough closed bars to fill sma10
+        return self.md.subscribe_bars(self.runner.symbols, self.config.bar_interval, since=self.bars_since(10))
+
+    async def on_bars(self, symbol: str, rows: List[Dict[str, Any]]) -> None:
+        stream = self.indicators(symbol)
+        if not stream.update_many(rows):
+            print({"signal": None, "symbol": symbol, "reason": "no new bars"})
+            return
+        ts = stream.last_ts
+        rsi5 = stream["rsi5"].value
+        sma5 = stream["sma5"].value
+        sma10 = stream["sma10"].value
         slope = sma5 - sma10
         # Simple composite score in [-1,1]
         rsi_norm = (rsi5 - 50.0) / 50.0
-        slope_norm = max(min(slope / max(closes[-1], 1e-9), 1.0), -1.0)
+        slope_norm = max(min(slope / max(stream.last_close, 1e-9), 1.0), -1.0)
         score_val = float(max(min(0.7 * rsi_norm + 0.3 * slope_norm, 1.0), -1.0))
-        sig = SignalScore(symbol="AAPL", ts=ts, strategy="rsi_sma_combo", score=score_val, features={"rsi5": float(rsi5), "sma5": float(sma5), "sma10": float(sma10)}).model_dump()
-        await bus.call("bus.publish", {"topic": "signals.rsi_sma", "payload": sig})
+        sig = SignalScore(symbol=symbol, ts=ts, strategy="rsi_sma_combo", score=score_val, features={"rsi5": float(rsi5), "sma5": float(sma5), "sma10": float(sma10)}).model_dump()
         # Also persist as feature for demo
         rows = [
-            {"ts": ts, "symbol": "AAPL", "feature_set": "signals_demo", "feature_name": "rsi5", "value": float(rsi5), "ver": "v1"},
-            {"ts": ts, "symbol": "AAPL", "feature_set": "signals_demo", "feature_name": "score", "value": float(score_val), "ver": "v1"},
+            {"ts": ts, "symbol": symbol, "feature_set": "signals_demo", "feature_name": "rsi5", "value": float(rsi5), "ver": "v1"},
+            {"ts": ts, "symbol": symbol, "feature_set": "signals_demo", "feature_name": "score", "value": float(score_val), "ver": "v1"},
         ]
-        await fs.call("feature-store.write_features", {"feature_set": "signals_demo", "rows": rows})
+        # queued for a batched publish; delivery is reported in the cycle summary
+        await self.publisher.publish("signals.rsi_sma", sig, key=symbol)
+        await self.features.write("signals_demo", rows)
         print({"signal": sig})
+
+    async def tick(self) -> None:
+        await super().tick()
+        await self.publisher.flush()
+        print({"cycle": self.last_report.summary(), "bus": self.publisher.stats.as_dict()})
         self.stop()
 
+def build_agent() -> SignalAgent:
+    return SignalAgent(UniverseConfig(name="signal-agent", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
+
 async def main():
-    agent = SignalAgent(AgentConfig(name="signal-agent", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
-    await agent.run()
+    await build_agent().run()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,35 +1,48 @@
-import asyncio, statistics
-from typing import List
+import asyncio
 from swarm_agent_sdk import BaseAgent, AgentConfig, get_host_base
+from swarm_agent_sdk.backtest import best_threshold, sweep
+from swarm_agent_sdk.cache import get_ohlcv_cache
 from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.memo import get_memo_client
+from swarm_agent_sdk.publisher import BusPublisher
+from swarm_agent_sdk.resilience import CallPolicy
+from swarm_agent_sdk.risk import ExposureIndex, pretrade_check_batch
 
 class StrategyBuilderAgent(BaseAgent):
-    async def tick(self) -> None:
+    async def setup(self) -> None:
         host = get_host_base()
-        md = HttpMCPClient(host, "market-data")
-        bt = HttpMCPClient(host, "backtester")
-        risk = HttpMCPClient(host, "risk-engine")
-        bus = HttpMCPClient(host, "bus")
-        cfg = HttpMCPClient(host, "config")
+        self.md = get_ohlcv_cache(host)
+        # pre-trade checks are read-only: retry them and hedge calls slower than their p95
+        self.risk = HttpMCPClient(host, "risk-engine", policy=CallPolicy(retries=2, hedge=True))
+        # the book the proposals are checked against, kept current from new fills
+        self.broker = HttpMCPClient(host, "broker-gateway")
+        self.exposure = ExposureIndex()
+        self.bus = HttpMCPClient(host, "bus")
+        self.publisher = BusPublisher(self.bus)
+        self.on_teardown(self.publisher.aclose)
+        # config.get is memoized process-wide: fresh for 30s, then refreshed in the background
+        self.cfg = get_memo_client(host, "config")
+
+    async def tick(self) -> None:
         # fetch synthetic prices
-        ohlcv = await md.call("market-data.get_ohlcv", {"symbol":"AAPL","start":"2024-01-01","end":"2024-01-10","interval":"1d"})
-        prices = [{"ts": r["ts"], "price": r["close"]} for r in ohlcv["rows"]]
+        frame = await self.md.get_frame("AAPL", "2024-01-01", "2024-01-10", "1d")
+        prices = [{"ts": r["ts"], "price": r["close"]} for r in frame.to_rows()]
         # strategies as thresholds (fetch from config; fallback default)
         try:
-            cfg_res = await cfg.call("config.get", {"key": "strategy.candidates"})
+            cfg_res = await self.cfg.call("config.get", {"key": "strategy.candidates"})
             candidates = cfg_res.get("value") or [0.2, 0.5, 1.0]
             if not isinstance(candidates, list):
                 candidates = [0.2, 0.5, 1.0]
         except Exception:
             candidates = [0.2, 0.5, 1.0]
-        reports = []
-        for thr in candidates:
-            res = await bt.call("backtester.run", {"prices": prices, "threshold": thr})
-            reports.append((thr, res["pnl"]))
-        best = max(reports, key=lambda t: t[1])
-        # construct a simple proposal and call pretrade_check
-        proposal = {"symbol":"AAPL","side":"BUY","qty":1,"price":prices[-1]["price"],"limits":{"maxGross":100000,"maxSingle":10000},"current":[]}
-        decision = await risk.call("risk-engine.pretrade_check", proposal)
+        # same semantics as backtester.run, scored in-process over the whole grid
+        pnl = sweep(frame.close, candidates)
+        reports = list(zip(candidates, pnl.tolist()))
+        best = best_threshold(pnl, candidates)
+        # construct a simple proposal and check it against the current book
+        proposal = {"symbol":"AAPL","side":"BUY","qty":1,"price":prices[-1]["price"],"limits":{"maxGross":100000,"maxSingle":10000}}
+        await self.exposure.sync(self.broker)
+        decision = (await pretrade_check_batch(self.risk, self.exposure, [proposal]))[0]
         draft = {
             "ts": prices[-1]["ts"],
             "symbol": "AAPL",
@@ -37,16 +50,18 @@ class StrategyBuilderAgent(BaseAgent):
             "action": "BUY",
             "qty": 1,
             "price": prices[-1]["price"],
-            "score": float(best[1]),
+            "score": best["pnl"],
             "risk_status": decision.get("status"),
         }
-        await bus.call("bus.publish", {"topic": "trade_plan_drafts", "payload": draft})
-        print({"candidates": reports, "chosen_threshold": best[0], "pnl": best[1], "risk": decision, "draft": draft})
+        await self.publisher.publish("trade_plan_drafts", draft, key="AAPL")
+        print({"candidates": reports, "chosen_threshold": best["threshold"], "pnl": best["pnl"], "risk": decision, "draft": draft})
         self.stop()
 
+def build_agent() -> StrategyBuilderAgent:
+    return StrategyBuilderAgent(AgentConfig(name="strategy-builder", heartbeat_seconds=5, tick_timeout_seconds=4.5), HttpMCPClient(get_host_base(), "noop"))
+
 async def main():
-    agent = StrategyBuilderAgent(AgentConfig(name="strategy-builder", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
-    await agent.run()
+    await build_agent().run()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,49 +1,69 @@
 import asyncio
-from typing import List
-from swarm_agent_sdk import BaseAgent, AgentConfig, get_host_base
+from typing import Any, Dict, List, Optional
+from swarm_agent_sdk import get_host_base
+from swarm_agent_sdk.cache import get_ohlcv_cache
 from swarm_agent_sdk.client import HttpMCPClient
+from swarm_agent_sdk.features import get_feature_writer
+from swarm_agent_sdk.publisher import BusPublisher
+from swarm_agent_sdk.subscribe import BarSubscription
 from swarm_agent_sdk.schemas import TrendState
+from swarm_agent_sdk.universe import UniverseAgent, UniverseConfig
+from swarm_agent_sdk.streaming import StreamSet, StreamingMomentum, StreamingRegime
 
-def momentum(values: List[float], lookback: int = 3) -> float:
-    if len(values) < lookback + 1:
-        return 0.0
-    return values[-1] - values[-1 - lookback]
-
-def regime(values: List[float], window: int = 5) -> str:
-    if len(values) < window + 1:
-        return "neutral"
-    diffs = [values[i] - values[i-1] for i in range(-window+1, 0)]
-    s = sum(1 for d in diffs if d > 0) - sum(1 for d in diffs if d < 0)
-    if s >= 2:
-        return "UP"
-    if s <= -2:
-        return "DOWN"
-    return "SIDEWAYS"
-
-class TrendAgent(BaseAgent):
-    async def tick(self) -> None:
+class TrendAgent(UniverseAgent):
+    async def setup(self) -> None:
         host = get_host_base()
-        md = HttpMCPClient(host, "market-data")
-        fs = HttpMCPClient(host, "feature-store")
-        bus = HttpMCPClient(host, "bus")
-        ohlcv = await md.call("market-data.get_ohlcv", {"symbol":"AAPL","start":"2024-01-01","end":"2024-01-15","interval":"1d"})
-        closes = [r["close"] for r in ohlcv["rows"]]
-        mom = momentum(closes, 3)
-        reg = regime(closes, 5)
-        ts = ohlcv["rows"][-1]["ts"]
+        self.md = get_ohlcv_cache(host)
+        self.features = get_feature_writer(host)
+        self.on_teardown(self.features.flush)
+        self.bus = HttpMCPClient(host, "bus")
+        self.publisher = BusPublisher(self.bus)
+        self.on_teardown(self.publisher.aclose)
+
+    def indicators(self, symbol: str) -> StreamSet:
+        return self.stream(symbol, lambda: {"momentum3": StreamingMomentum(3), "regime5": StreamingRegime(5)})
+
+    async def tick_symbol(self, symbol: str) -> None:
+        stream = self.indicators(symbol)
+        # only fetch bars from the last one seen; the first tick warms up on the full window
+        ohlcv = await self.md.call("market-data.get_ohlcv", {"symbol":symbol,"start":stream.last_ts or "2024-01-01","end":"2024-01-15","interval":"1d"})
+        await self.on_bars(symbol, ohlcv["rows"])
+
+    def subscribe(self) -> Optional[BarSubscription]:
+        # STREAM_BARS=true: react to pushed bars instead of polling each heartbeat
+        if not self.config.stream_bars:
+            return None
+        # a fresh stream starts on enough closed bars to fill regime5
+        return self.md.subscribe_bars(self.runner.symbols, self.config.bar_interval, since=self.bars_since(6))
+
+    async def on_bars(self, symbol: str, rows: List[Dict[str, Any]]) -> None:
+        stream = self.indicators(symbol)
+        if not stream.update_many(rows):
+            print({"trend": None, "symbol": symbol, "reason": "no new bars"})
+            return
+        mom = stream["momentum3"].value
+        reg = stream["regime5"].label
+        ts = stream.last_ts
         rows = [
-            {"ts": ts, "symbol": "AAPL", "feature_set": "trend_demo", "feature_name": "momentum3", "value": float(mom), "ver": "v1"},
-            {"ts": ts, "symbol": "AAPL", "feature_set": "trend_demo", "feature_name": f"regime_{reg}", "value": 1.0, "ver": "v1"},
+            {"ts": ts, "symbol": symbol, "feature_set": "trend_demo", "feature_name": "momentum3", "value": float(mom), "ver": "v1"},
+            {"ts": ts, "symbol": symbol, "feature_set": "trend_demo", "feature_name": f"regime_{reg}", "value": 1.0, "ver": "v1"},
         ]
-        await fs.call("feature-store.write_features", {"feature_set": "trend_demo", "rows": rows})
-        trend = TrendState(symbol="AAPL", ts=ts, regime=reg, slope=float(mom), strength=None).model_dump()
-        await bus.call("bus.publish", {"topic": "trends.state", "payload": trend})
+        trend = TrendState(symbol=symbol, ts=ts, regime=reg, slope=float(mom), strength=None).model_dump()
+        await self.publisher.publish("trends.state", trend, key=symbol)
+        await self.features.write("trend_demo", rows)
         print({"trend": trend})
+
+    async def tick(self) -> None:
+        await super().tick()
+        await self.publisher.flush()
+        print({"cycle": self.last_report.summary(), "bus": self.publisher.stats.as_dict()})
         self.stop()
 
+def build_agent() -> TrendAgent:
+    return TrendAgent(UniverseConfig(name="trend-agent", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
+
 async def main():
-    agent = TrendAgent(AgentConfig(name="trend-agent", heartbeat_seconds=5), HttpMCPClient(get_host_base(), "noop"))
-    await agent.run()
+    await build_agent().run()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -23,6 +23,15 @@ describe('backtester tools', () => {
     expect(Array.isArray(out.trades)).toBe(true);
     expect(typeof out.pnl).toBe('number');
   });
-});
-
 
+  // expected values come from swarm_agent_sdk.backtest.sweep; both sides must agree exactly
+  it('pnl matches the SDK sweep engine', async () => {
+    const closes = [100, 101, 99, 102, 102.5, 98, 103.25, 103];
+    const prices = closes.map((price, i) => ({ ts: `2024-01-0${i + 1}T00:00:00Z`, price }));
+    const expected: Array<[number, number]> = [[-0.5, -108.75], [0, -5.75], [0.5, -6.25], [1, 94.75], [2.5, -4.25], [10, 0]];
+    for (const [threshold, pnl] of expected) {
+      const out = await call('backtester.run', { prices, threshold });
+      expect(out.pnl).toBe(pnl);
+    }
+  });
+});
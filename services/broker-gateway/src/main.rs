@@ -41,6 +41,7 @@ struct Fill {
     cl_ord_id: String,
     exec_id: String,
     symbol: String,
+    side: String,
     price: f64,
     qty: i64,
     venue: String,
@@ -61,7 +62,7 @@ async fn call(State(state): State<AppState>, Json(req): Json<CallReq>) -> Result
             let price = input.price.unwrap_or(100.0);
             let ts = chrono::Utc::now().to_rfc3339();
             let venue = "SIM".to_string();
-            let fill = Fill { ts: ts.clone(), cl_ord_id: cl_ord_id.clone(), exec_id, symbol: input.symbol.clone(), price, qty: input.qty, venue };
+            let fill = Fill { ts: ts.clone(), cl_ord_id: cl_ord_id.clone(), exec_id, symbol: input.symbol.clone(), side: input.side.to_uppercase(), price, qty: input.qty, venue };
             {
                 let mut mem = state.inner.lock().unwrap();
                 let pos = mem.positions.entry(input.symbol.clone()).or_insert(0);
@@ -78,8 +79,11 @@ async fn call(State(state): State<AppState>, Json(req): Json<CallReq>) -> Result
             Ok(Json(serde_json::json!({"positions": positions})))
         }
         "broker-gateway.get_fills" => {
+            // fills are append-only: `offset` skips the ones a caller has already seen
+            let offset = req.input.get("offset").and_then(|v| v.as_u64()).unwrap_or(0) as usize;
             let mem = state.inner.lock().unwrap();
-            Ok(Json(serde_json::json!({"fills": mem.fills})))
+            let fills = &mem.fills[offset.min(mem.fills.len())..];
+            Ok(Json(serde_json::json!({"fills": fills, "next_offset": mem.fills.len()})))
         }
         "broker-gateway.cancel" | "broker-gateway.replace" => {
             Ok(Json(serde_json::json!({"status":"UNSUPPORTED_IN_SIM"})))
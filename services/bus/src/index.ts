@@ -12,11 +12,28 @@ function registerTool<I, O>(tool: Tool<I, O>) { tools[tool.name] = tool; log.inf
 
 const PublishInput = z.object({ topic: z.string().min(1), key: z.string().optional(), payload: z.any() });
 const PublishOutput = z.object({ topic: z.string(), partition: z.number(), offset: z.string() });
+const PublishBatchInput = z.object({ topic: z.string().min(1), messages: z.array(z.object({ key: z.string().optional(), payload: z.any() })).min(1) });
+const PublishBatchOutput = z.object({ topic: z.string(), count: z.number(), partitions: z.array(z.object({ partition: z.number(), offset: z.string() })) });
 
 const brokers = (process.env.KAFKA_BROKERS || 'localhost:19092').split(',');
 const kafka = new Kafka({ clientId: 'swarm-bus', brokers, logLevel: logLevel.NOTHING });
 const producer = kafka.producer();
 
+function enrich(payload: any, req?: http.IncomingMessage): Record<string, any> {
+  const corr = (req?.headers['x-correlation-id'] as string | undefined) || Math.random().toString(36).slice(2);
+  const agentRole = req?.headers['x-agent-role'] as string | undefined;
+  const agentId = req?.headers['x-agent-id'] as string | undefined;
+  return {
+    ...payload,
+    ts: payload?.ts || new Date().toISOString(),
+    cid: payload?.cid || corr,
+    source: payload?.source || agentId || agentRole || 'unknown',
+    version: payload?.version || 'v1',
+    _agent_role: agentRole,
+    _agent_id: agentId,
+  };
+}
+
 registerTool({
   name: 'bus.publish',
   input: PublishInput,
@@ -24,25 +41,25 @@ registerTool({
   handler: async (input, req?: http.IncomingMessage) => {
     const { topic, key, payload } = PublishInput.parse(input);
     await producer.connect();
-    const corr = (req?.headers['x-correlation-id'] as string | undefined) || Math.random().toString(36).slice(2);
-    const agentRole = req?.headers['x-agent-role'] as string | undefined;
-    const agentId = req?.headers['x-agent-id'] as string | undefined;
-    const nowIso = new Date().toISOString();
-    const enriched = {
-      ...payload,
-      ts: payload?.ts || nowIso,
-      cid: payload?.cid || corr,
-      source: payload?.source || agentId || agentRole || 'unknown',
-      version: payload?.version || 'v1',
-      _agent_role: agentRole,
-      _agent_id: agentId,
-    } as Record<string, any>;
-    const res = await producer.send({ topic, messages: [{ key, value: JSON.stringify(enriched) }] });
+    const res = await producer.send({ topic, messages: [{ key, value: JSON.stringify(enrich(payload, req)) }] });
     const first = res[0];
     return { topic, partition: first.partition, offset: String(first.baseOffset) };
   }
 });
 
+// Many messages for one topic in a single producer.send
+registerTool({
+  name: 'bus.publish_batch',
+  input: PublishBatchInput,
+  output: PublishBatchOutput,
+  handler: async (input, req?: http.IncomingMessage) => {
+    const { topic, messages } = PublishBatchInput.parse(input);
+    await producer.connect();
+    const res = await producer.send({ topic, messages: messages.map((m) => ({ key: m.key, value: JSON.stringify(enrich(m.payload, req)) })) });
+    return { topic, count: messages.length, partitions: res.map((r) => ({ partition: r.partition, offset: String(r.baseOffset) })) };
+  }
+});
+
 const port = Number(process.env.PORT || 4007);
 const registry = new client.Registry();
 client.collectDefaultMetrics({ register: registry });
@@ -24,6 +24,19 @@ describe('feature-store tools', () => {
     expect(Array.isArray(g.rows)).toBe(true);
     expect(g.rows.find((r: any) => r.feature_name === 'x')).toBeTruthy();
   });
-});
-
 
+  it('write_features_columnar expands dictionary-encoded columns', async () => {
+    const ts = new Date().toISOString();
+    const columns = {
+      ts: { values: [ts], codes: [0, 0] },
+      symbol: { values: ['MSFT', 'NVDA'], codes: [0, 1] },
+      feature_name: { values: ['col_x'], codes: [0, 0] },
+      ver: { values: ['v1'], codes: [0, 0] },
+      value: [1.5, 2.5],
+    };
+    const w = await call('feature-store.write_features_columnar', { feature_set: 'test_set', nrows: 2, columns });
+    expect(w.wrote).toBe(2);
+    const g = await call('feature-store.get_features', { feature_set: 'test_set', symbol: 'NVDA' });
+    expect(g.rows.find((r: any) => r.feature_name === 'col_x' && r.value === 2.5)).toBeTruthy();
+  });
+});
@@ -1,6 +1,7 @@
 import pino from 'pino';
 import { z } from 'zod';
 import http from 'http';
+import { COLUMNAR_CONTENT_TYPE, encodeColumnar, wantsColumnar } from '@swarm/shared-utils';
 import client from 'prom-client';
 
 const log = pino({ name: '@swarm/feature-store' });
@@ -18,6 +19,14 @@ const FeatureRow = z.object({ ts: z.string(), symbol: z.string(), feature_set: z
 const WriteFeaturesInput = z.object({ feature_set: z.string(), rows: z.array(FeatureRow) });
 const WriteFeaturesOutput = z.object({ wrote: z.number() });
 
+// Columnar batch: string fields are dictionary-encoded so each distinct value is sent once
+const DictStrings = z.object({ values: z.array(z.string()), codes: z.array(z.number().int().nonnegative()) });
+const WriteFeaturesColumnarInput = z.object({
+  feature_set: z.string(),
+  nrows: z.number().int().nonnegative(),
+  columns: z.object({ ts: DictStrings, symbol: DictStrings, feature_name: DictStrings, ver: DictStrings, value: z.array(z.number()), source: DictStrings.optional() }),
+});
+
 const GetFeaturesInput = z.object({ feature_set: z.string(), symbol: z.string() });
 const GetFeaturesOutput = z.object({ rows: z.array(FeatureRow) });
 
@@ -123,21 +132,18 @@ async function pgEnsureTable(): Promise<void> {
 async function pgWriteFeatures(feature_set: string, rows: Array<z.infer<typeof FeatureRow>>): Promise<number> {
   const pool = await pgGetPool();
   await pgEnsureTable();
+  // one statement per batch: rows travel as parallel arrays and are expanded by unnest
   const text = `INSERT INTO features (ts, symbol, feature_set, feature_name, value, ver, source)
-                VALUES ($1, $2, $3, $4, $5, $6, $7)`;
-  const client = await pool.connect();
-  try {
-    await client.query('BEGIN');
-    for (const r of rows) {
-      await client.query(text, [r.ts, r.symbol, r.feature_set, r.feature_name, r.value, r.ver, r.source ?? null]);
-    }
-    await client.query('COMMIT');
-  } catch (e) {
-    await client.query('ROLLBACK');
-    throw e;
-  } finally {
-    client.release();
-  }
+                SELECT * FROM unnest($1::timestamptz[], $2::text[], $3::text[], $4::text[], $5::float8[], $6::text[], $7::text[])`;
+  await pool.query(text, [
+    rows.map(r => r.ts),
+    rows.map(r => r.symbol),
+    rows.map(r => r.feature_set),
+    rows.map(r => r.feature_name),
+    rows.map(r => r.value),
+    rows.map(r => r.ver),
+    rows.map(r => r.source ?? null),
+  ]);
   return rows.length;
 }
 
@@ -154,21 +160,52 @@ async function pgGetFeatures(feature_set: string, symbol: string): Promise<Array
   return res.rows.map((r: any) => ({ ts: r.ts instanceof Date ? r.ts.toISOString() : r.ts, symbol: r.symbol, feature_set: r.feature_set, feature_name: r.feature_name, value: Number(r.value), ver: r.ver, source: r.source ?? undefined }));
 }
 
+async function writeFeatures(feature_set: string, rows: Array<z.infer<typeof FeatureRow>>): Promise<number> {
+  if (BACKEND === 'clickhouse') {
+    return chWriteFeatures(feature_set, rows);
+  } else if (BACKEND === 'postgres') {
+    return pgWriteFeatures(feature_set, rows);
+  }
+  MEMORY[feature_set] = MEMORY[feature_set] || [];
+  MEMORY[feature_set].push(...rows);
+  return rows.length;
+}
+
+function expandColumns(input: z.infer<typeof WriteFeaturesColumnarInput>): Array<z.infer<typeof FeatureRow>> {
+  const { feature_set, nrows, columns: c } = input;
+  const rows: Array<z.infer<typeof FeatureRow>> = new Array(nrows);
+  for (let i = 0; i < nrows; i++) {
+    const source = c.source ? c.source.values[c.source.codes[i]] : undefined;
+    rows[i] = {
+      ts: c.ts.values[c.ts.codes[i]],
+      symbol: c.symbol.values[c.symbol.codes[i]],
+      feature_set,
+      feature_name: c.feature_name.values[c.feature_name.codes[i]],
+      value: c.value[i],
+      ver: c.ver.values[c.ver.codes[i]],
+      source: source || undefined,
+    };
+  }
+  return rows;
+}
+
 registerTool({
   name: 'feature-store.write_features',
   input: WriteFeaturesInput,
   output: WriteFeaturesOutput,
-  handler: (input) => {
+  handler: async (input) => {
     const parsed = WriteFeaturesInput.parse(input);
-    if (BACKEND === 'clickhouse') {
-      return chWriteFeatures(parsed.feature_set, parsed.rows).then((n) => ({ wrote: n }));
-    } else if (BACKEND === 'postgres') {
-      return pgWriteFeatures(parsed.feature_set, parsed.rows).then((n) => ({ wrote: n }));
-    }
-    const key = parsed.feature_set;
-    MEMORY[key] = MEMORY[key] || [];
-    MEMORY[key].push(...parsed.rows);
-    return { wrote: parsed.rows.length };
+    return { wrote: await writeFeatures(parsed.feature_set, parsed.rows) };
+  }
+});
+
+registerTool({
+  name: 'feature-store.write_features_columnar',
+  input: WriteFeaturesColumnarInput,
+  output: WriteFeaturesOutput,
+  handler: async (input) => {
+    const parsed = WriteFeaturesColumnarInput.parse(input);
+    return { wrote: await writeFeatures(parsed.feature_set, expandColumns(parsed)) };
   }
 });
 
@@ -219,6 +256,11 @@ client.collectDefaultMetrics({ register: registry });
         const input = tool.input.parse(body.input);
         const output = await tool.handler(input as any);
         const validated = tool.output.parse(output);
+        if (wantsColumnar(req, validated)) {
+          res.writeHead(200, { 'content-type': COLUMNAR_CONTENT_TYPE });
+          res.end(encodeColumnar(validated.rows));
+          return;
+        }
         res.writeHead(200, { 'content-type': 'application/json' });
         res.end(JSON.stringify(validated));
         return;
@@ -1,6 +1,7 @@
 import pino from 'pino';
 import { z } from 'zod';
 import http from 'http';
+import { COLUMNAR_CONTENT_TYPE, encodeColumnar, wantsColumnar } from '@swarm/shared-utils';
 
 const log = pino({ name: '@swarm/market-data' });
 
@@ -82,6 +83,11 @@ registerTool({
         const input = tool.input.parse(body.input);
         const output = await tool.handler(input as any);
         const validated = tool.output.parse(output);
+        if (wantsColumnar(req, validated)) {
+          res.writeHead(200, { 'content-type': COLUMNAR_CONTENT_TYPE });
+          res.end(encodeColumnar(validated.rows));
+          return;
+        }
         res.writeHead(200, { 'content-type': 'application/json' });
         res.end(JSON.stringify(validated));
         return;
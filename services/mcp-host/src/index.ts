@@ -17,6 +17,9 @@ const routes = {
 };
 
 const CallInput = z.object({ tool: z.string(), input: z.any() });
+// Batch envelope: many tool invocations for one service in a single request
+const BatchInput = z.object({ calls: z.array(CallInput).min(1), timeout_ms: z.number().positive().optional() });
+type BatchResult = { ok: true; output: unknown } | { ok: false; error: string; message?: string };
 
 // --- RBAC config ---
 type Policy = Record<string, string[]>; // role -> allowed tool names
@@ -50,18 +53,24 @@ if (RBAC_ENABLED && Object.keys(POLICY).length === 0) {
     "signal_agent": [
       "market-data.*",
       "feature-store.write_features",
+      "feature-store.write_features_columnar",
       "config.get",
       "bus.publish",
+      "bus.publish_batch",
     ],
     "sentiment_agent": [
       "nlp-sentiment.*",
       "feature-store.write_features",
+      "feature-store.write_features_columnar",
       "bus.publish",
+      "bus.publish_batch",
     ],
     "trend_agent": [
       "market-data.*",
       "feature-store.write_features",
+      "feature-store.write_features_columnar",
       "bus.publish",
+      "bus.publish_batch",
     ],
     // Orchestrator
     "strategy_builder": [
@@ -69,19 +78,25 @@ if (RBAC_ENABLED && Object.keys(POLICY).length === 0) {
       "feature-store.*",
       "backtester.run",
       "risk-engine.pretrade_check",
+      "risk-engine.pretrade_check_batch",
+      "broker-gateway.get_fills",
       "config.get",
       "bus.publish",
+      "bus.publish_batch",
     ],
     // Risk & execution
     "risk_agent": [
       "risk-engine.*",
       "bus.publish",
+      "bus.publish_batch",
     ],
     "execution_agent": [
       "broker-gateway.*",
       "feature-store.write_features",
+      "feature-store.write_features_columnar",
       "analytics.*",
       "bus.publish",
+      "bus.publish_batch",
     ],
     // Natural language interface
     "neural_command": [
@@ -89,6 +104,7 @@ if (RBAC_ENABLED && Object.keys(POLICY).length === 0) {
       "risk-engine.*",
       "config.*",
       "bus.publish",
+      "bus.publish_batch",
       "command-agent.*"
     ],
     // Observability / admin
@@ -148,6 +164,45 @@ async function forwardCall(targetBaseUrl: string, tool: string, input: unknown,
   return await res.json();
 }
 
+function withTimeout<T>(p: Promise<T>, ms?: number): Promise<T> {
+  if (!ms) return p;
+  return new Promise<T>((resolve, reject) => {
+    const timer = setTimeout(() => reject(new Error(`timeout after ${ms}ms`)), ms);
+    p.then((v) => { clearTimeout(timer); resolve(v); }, (e) => { clearTimeout(timer); reject(e); });
+  });
+}
+
+async function forwardBatch(targetBaseUrl: string, batch: z.infer<typeof BatchInput>, correlationId: string, role?: string, agentId?: string): Promise<BatchResult[]> {
+  const settled = await Promise.allSettled(batch.calls.map((c) => {
+    if (!isToolAllowed(role, c.tool)) return Promise.reject(Object.assign(new Error('RBAC denied'), { code: 'forbidden' }));
+    return withTimeout(forwardCall(targetBaseUrl, c.tool, c.input, correlationId, role, agentId), batch.timeout_ms);
+  }));
+  return settled.map((r) => r.status === 'fulfilled'
+    ? { ok: true, output: r.value }
+    : { ok: false, error: (r.reason as any)?.code || 'upstream_error', message: String((r.reason as any)?.message || r.reason) });
+}
+
+// Pass-through variant that preserves the upstream encoding (e.g. columnar responses)
+async function forwardCallRaw(targetBaseUrl: string, tool: string, input: unknown, correlationId: string, accept: string, role?: string, agentId?: string) {
+  const url = new URL('/call', targetBaseUrl);
+  const res = await fetch(url, {
+    method: 'POST',
+    headers: {
+      'content-type': 'application/json',
+      'accept': accept,
+      'x-correlation-id': correlationId,
+      ...(role ? { 'x-agent-role': role } : {}),
+      ...(agentId ? { 'x-agent-id': agentId } : {}),
+    },
+    body: JSON.stringify({ tool, input }),
+  });
+  if (!res.ok) {
+    const txt = await res.text();
+    throw new Error(`Upstream ${targetBaseUrl} error ${res.status}: ${txt}`);
+  }
+  return { contentType: res.headers.get('content-type') || 'application/json', body: Buffer.from(await res.arrayBuffer()) };
+}
+
 const requestCounter = new client.Counter({ name: 'mcp_host_http_requests_total', help: 'Total HTTP requests', labelNames: ['method', 'path', 'status'] });
 const errorCounter = new client.Counter({ name: 'mcp_host_errors_total', help: 'Unhandled errors' });
 const registry = new client.Registry();
@@ -182,8 +237,19 @@ const server = http.createServer(async (req, res) => {
       }
       const chunks: Buffer[] = [];
       for await (const chunk of req) chunks.push(chunk as Buffer);
-      const body = CallInput.parse(JSON.parse(Buffer.concat(chunks).toString('utf8')));
+      const raw = JSON.parse(Buffer.concat(chunks).toString('utf8'));
       const role = getRoleFromHeaders(req);
+      if (raw && Array.isArray(raw.calls)) {
+        const batch = BatchInput.parse(raw);
+        const corr = (req.headers['x-correlation-id'] as string | undefined) || randomUUID();
+        const agentId = (req.headers['x-agent-id'] as string | undefined);
+        const results = await forwardBatch(route.url, batch, corr, role, agentId);
+        res.writeHead(200, { 'content-type': 'application/json', 'x-correlation-id': corr });
+        res.end(JSON.stringify({ results }));
+        requestCounter.inc({ method: req.method, path: '/call', status: '200' });
+        return;
+      }
+      const body = CallInput.parse(raw);
       if (!isToolAllowed(role, body.tool)) {
         res.writeHead(403, { 'content-type': 'application/json' });
         res.end(JSON.stringify({ error: 'forbidden', message: 'RBAC denied' }));
@@ -192,6 +258,14 @@ const server = http.createServer(async (req, res) => {
       }
       const corr = (req.headers['x-correlation-id'] as string | undefined) || randomUUID();
       const agentId = (req.headers['x-agent-id'] as string | undefined);
+      const accept = req.headers['accept'];
+      if (typeof accept === 'string' && accept.includes('application/x-swarm-columnar')) {
+        const raw = await forwardCallRaw(route.url, body.tool, body.input, corr, accept, role, agentId);
+        res.writeHead(200, { 'content-type': raw.contentType, 'x-correlation-id': corr });
+        res.end(raw.body);
+        requestCounter.inc({ method: req.method, path: '/call', status: '200' });
+        return;
+      }
       const data = await forwardCall(route.url, body.tool, body.input, corr, role, agentId);
       res.writeHead(200, { 'content-type': 'application/json', 'x-correlation-id': corr });
       res.end(JSON.stringify(data));
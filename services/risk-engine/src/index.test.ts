@@ -26,6 +26,33 @@ describe('risk-engine tools', () => {
     const out = await call('risk-engine.pretrade_check', { symbol: 'AAPL', side: 'BUY', qty: 1, price: 1, limits: { maxGross: 1000, maxSingle: 500 }, current: [] });
     expect(out.status).toBe('APPROVED');
   });
+
+  it('pretrade_check_batch checks each proposal against the current book and earlier approvals', async () => {
+    const limits = { maxGross: 1000, maxSingle: 500 };
+    const out = await call('risk-engine.pretrade_check_batch', {
+      current: [{ symbol: 'MSFT', qty: 2, price: 300 }],
+      proposals: [
+        { symbol: 'AAPL', side: 'BUY', qty: 1, price: 100, limits },
+        { symbol: 'AAPL', side: 'BUY', qty: 5, price: 100, limits },
+        { symbol: 'AAPL', side: 'SELL', qty: 6, price: 100, limits },
+      ],
+    });
+    expect(out.results.map((r: any) => r.status)).toEqual(['APPROVED', 'REJECTED', 'REJECTED']);
+    expect(out.results[1].breaches).toEqual(['max_gross']);
+    expect(out.results[2].breaches).toEqual(['max_gross', 'max_single']);
+  });
+
+  it('pretrade_check_batch counts approved proposals towards gross', async () => {
+    const limits = { maxGross: 1000, maxSingle: 500 };
+    const proposal = { symbol: 'AAPL', side: 'BUY', qty: 3, price: 100, limits };
+    const out = await call('risk-engine.pretrade_check_batch', {
+      current: [{ symbol: 'MSFT', qty: 1, price: 300 }],
+      proposals: [proposal, proposal, proposal],
+    });
+    // book 300 + two approved 300s = 900; the third would take gross to 1200
+    expect(out.results.map((r: any) => r.status)).toEqual(['APPROVED', 'APPROVED', 'REJECTED']);
+    expect(out.results[2].breaches).toEqual(['max_gross']);
+  });
 });
 
 
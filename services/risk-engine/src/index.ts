@@ -27,21 +27,50 @@ registerTool({
 });
 
 // pretrade_check: evaluates a single proposal against simple limits
-const PretradeInput = z.object({ symbol: z.string(), side: z.enum(['BUY','SELL']), qty: z.number().positive(), price: z.number().positive(), limits: z.object({ maxGross: z.number(), maxSingle: z.number() }), current: z.array(z.object({ symbol: z.string(), qty: z.number(), price: z.number() })).default([]) });
+const Position = z.object({ symbol: z.string(), qty: z.number(), price: z.number() });
+const Proposal = z.object({ symbol: z.string(), side: z.enum(['BUY','SELL']), qty: z.number().positive(), price: z.number().positive(), limits: z.object({ maxGross: z.number(), maxSingle: z.number() }) });
+const PretradeInput = Proposal.extend({ current: z.array(Position).default([]) });
 const PretradeOutput = z.object({ status: z.enum(['APPROVED','ADJUSTED','REJECTED']), breaches: z.array(z.string()), notes: z.string().optional() });
 
+function grossOf(current: Array<z.infer<typeof Position>>): number {
+  return current.reduce((s, p) => s + Math.abs(p.qty * p.price), 0);
+}
+
+function checkProposal(p: z.infer<typeof Proposal>, currentGross: number): z.infer<typeof PretradeOutput> {
+  const notional = Math.abs(p.qty * p.price);
+  const breaches: string[] = [];
+  if (currentGross + notional > p.limits.maxGross) breaches.push('max_gross');
+  if (notional > p.limits.maxSingle) breaches.push('max_single');
+  return { status: breaches.length ? 'REJECTED' : 'APPROVED', breaches };
+}
+
 registerTool({
   name: 'risk-engine.pretrade_check',
   input: PretradeInput,
   output: PretradeOutput,
   handler: (input) => {
-    const { symbol, qty, price, limits, current } = PretradeInput.parse(input);
-    const gross = current.reduce((s, p) => s + Math.abs(p.qty * p.price), 0) + Math.abs(qty * price);
-    const breaches: string[] = [];
-    if (gross > limits.maxGross) breaches.push('max_gross');
-    if (Math.abs(qty * price) > limits.maxSingle) breaches.push('max_single');
-    const status = breaches.length ? 'REJECTED' : 'APPROVED';
-    return { status, breaches };
+    const { current, ...proposal } = PretradeInput.parse(input);
+    return checkProposal(proposal, grossOf(current));
+  }
+});
+
+// pretrade_check_batch: proposals checked in order against the current book plus the ones approved before them
+const PretradeBatchInput = z.object({ current: z.array(Position).default([]), proposals: z.array(Proposal).max(10000) });
+const PretradeBatchOutput = z.object({ results: z.array(PretradeOutput) });
+
+registerTool({
+  name: 'risk-engine.pretrade_check_batch',
+  input: PretradeBatchInput,
+  output: PretradeBatchOutput,
+  handler: (input) => {
+    const { current, proposals } = PretradeBatchInput.parse(input);
+    let gross = grossOf(current);
+    const results = proposals.map((p) => {
+      const out = checkProposal(p, gross);
+      if (out.status === 'APPROVED') gross += Math.abs(p.qty * p.price);
+      return out;
+    });
+    return { results };
   }
 });
 